@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Amount conversion benchmark
+Compares the old per-value float coercion with the batch Decimal column conversion
+
+    python benchmarks/amounts.py --rows 200000 --nulls 0.0
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipeline import money
+
+
+# Coercion previously applied to every amount value
+def legacy_float(value):
+    if value is None:
+        return 0.0
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return 0.0
+
+
+# ibm_db returns DECIMAL(15,2) values as strings
+def make_column(rows, null_ratio, seed=42):
+    rng = random.Random(seed)
+    return [
+        None if rng.random() < null_ratio else f"{rng.randint(0, 10 ** 13)}.{rng.randint(0, 99):02d}"
+        for _ in range(rows)
+    ]
+
+
+def best_of(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark amount column conversion")
+    parser.add_argument("--rows", type=int, default=200000, help="values per column")
+    parser.add_argument("--nulls", type=float, default=0.0, help="share of NULL amounts")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    column = make_column(args.rows, args.nulls)
+    converted = money.amount_column(column)
+    assert converted == [money.MISSING_AMOUNT if v is None else Decimal(v) for v in column]
+    # Floats cannot hold every DECIMAL(15,2) value
+    lossy = sum(1 for v, f in zip(column, map(legacy_float, column))
+                if v is not None and Decimal(repr(f)) != Decimal(v))
+
+    legacy = best_of(args.repeat, lambda: [legacy_float(v) for v in column])
+    batched = best_of(args.repeat, lambda: money.amount_column(column))
+
+    print(f"{args.rows} values, {args.nulls:.0%} NULL")
+    print(f"  per-value float : {legacy:.3f}s  ({args.rows / legacy:,.0f} values/s), {lossy} values rounded")
+    print(f"  Decimal column  : {batched:.3f}s  ({args.rows / batched:,.0f} values/s), exact")
+    print(f"  relative speed  : {legacy / batched:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
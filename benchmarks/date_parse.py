@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+DDMMYYYYHHMM parsing benchmark
+Compares the old per-value parser with the shared memoized column parser
+
+    python benchmarks/date_parse.py --rows 200000 --distinct 2000
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipeline import dates
+
+
+# Parser previously duplicated in bot_poller and PostgreSQLLoader
+def legacy_convert(date_str):
+    if not date_str or len(date_str) != 12:
+        return None
+    try:
+        day = int(date_str[0:2])
+        month = int(date_str[2:4])
+        year = int(date_str[4:8])
+        hour = int(date_str[8:10])
+        minute = int(date_str[10:12])
+        return datetime(year, month, day, hour, minute)
+    except (ValueError, TypeError):
+        return None
+
+
+def make_column(rows, distinct, invalid_ratio, seed=42):
+    rng = random.Random(seed)
+    pool = [
+        f"{rng.randint(1, 28):02d}{rng.randint(1, 12):02d}{rng.randint(1950, 2025)}"
+        f"{rng.randint(0, 23):02d}{rng.randint(0, 59):02d}"
+        for _ in range(distinct)
+    ]
+    junk = ["", None, "N/A", "2025-01-01", "3102202512AB"]
+    return [
+        rng.choice(junk) if rng.random() < invalid_ratio else rng.choice(pool)
+        for _ in range(rows)
+    ]
+
+
+def best_of(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DDMMYYYYHHMM parsing")
+    parser.add_argument("--rows", type=int, default=200000, help="values per column")
+    parser.add_argument("--distinct", type=int, default=2000, help="distinct valid dates")
+    parser.add_argument("--invalid", type=float, default=0.05, help="share of malformed values")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    column = make_column(args.rows, args.distinct, args.invalid)
+    assert [legacy_convert(v) for v in column] == dates.parse_column(column)
+
+    legacy = best_of(args.repeat, lambda: [legacy_convert(v) for v in column])
+    batched = best_of(args.repeat, lambda: dates.parse_column(column))
+
+    print(f"{args.rows} values, {args.distinct} distinct, {args.invalid:.0%} malformed")
+    print(f"  per-value parser : {legacy:.3f}s  ({args.rows / legacy:,.0f} values/s)")
+    print(f"  memoized column  : {batched:.3f}s  ({args.rows / batched:,.0f} values/s)")
+    print(f"  speedup          : {legacy / batched:.1f}x")
+    print(f"  cache            : {dates.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
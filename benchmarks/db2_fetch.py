@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+DB2 row fetch benchmark
+Compares the old fetch_row + per-column ibm_db.result loop with fetch_tuple and a position index
+
+    DB2_HOST=localhost DB2_PORT=50000 DB2_DBNAME=cbs_db DB2_USER=... DB2_PASSWORD=... \\
+        python benchmarks/db2_fetch.py --rows 200000 --block-rows 1000
+
+Both paths read the same mapped columns of the same rows of each CBS_SCHEMA
+table into one dict per row. The tuple path also uses DB2 block fetch.
+Rows are only read, never changed.
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ibm_db
+
+from pipeline import db2_fetch, keyset, mappings
+
+
+def connect(block_rows=0):
+    return ibm_db.connect(
+        f"DATABASE={os.getenv('DB2_DBNAME')};HOSTNAME={os.getenv('DB2_HOST')};PORT={os.getenv('DB2_PORT')};"
+        f"PROTOCOL=TCPIP;UID={os.getenv('DB2_USER')};PWD={os.getenv('DB2_PASSWORD')};"
+        f"{db2_fetch.block_fetch_keywords(block_rows)}",
+        "", ""
+    )
+
+
+def query(table, columns, rows):
+    return (f"SELECT {db2_fetch.select_list(columns)} FROM {keyset.SCHEMA}.{table} T "
+            f"FETCH FIRST {rows} ROWS ONLY")
+
+
+def fetch_legacy(conn, table, columns, rows):
+    # bot_poller before the tuple path: fetch_row, then one guarded ibm_db.result per column
+    stmt = ibm_db.exec_immediate(conn, query(table, columns, rows))
+
+    def safe_result(col_name):
+        try:
+            return ibm_db.result(stmt, col_name)
+        except Exception:
+            return None
+
+    records = []
+    while ibm_db.fetch_row(stmt):
+        records.append({key: safe_result(col) for key, col in columns})
+    ibm_db.free_result(stmt)
+    return records
+
+
+def fetch_tuples(conn, table, columns, rows):
+    stmt = db2_fetch.prepare(conn, query(table, columns, rows))
+    ibm_db.execute(stmt)
+    read = db2_fetch.row_reader(db2_fetch.column_positions(stmt), columns)
+    records = [read(row) for row in db2_fetch.iter_tuples(stmt)]
+    ibm_db.free_result(stmt)
+    return records
+
+
+def timed(fetch, conn, table, columns, rows):
+    started = time.perf_counter()
+    count = len(fetch(conn, table, columns, rows))
+    return count, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DB2 row fetch paths")
+    parser.add_argument("--rows", type=int, default=200000, help="rows read per table and path")
+    parser.add_argument("--block-rows", type=int, default=db2_fetch.DEFAULT_BLOCK_FETCH_ROWS,
+                        help="BlockForNRows for the tuple path")
+    args = parser.parse_args()
+
+    legacy_conn = connect()
+    tuple_conn = connect(args.block_rows)
+    try:
+        for table, mapping in mappings.TABLES.items():
+            columns = mapping.source_columns()
+            # Warm up the buffer pool so neither path pays for the first disk reads
+            fetch_tuples(tuple_conn, table, columns, args.rows)
+
+            legacy_rows, legacy = timed(fetch_legacy, legacy_conn, table, columns, args.rows)
+            tuple_rows, tuples = timed(fetch_tuples, tuple_conn, table, columns, args.rows)
+            assert legacy_rows == tuple_rows, (legacy_rows, tuple_rows)
+            if not tuple_rows:
+                print(f"{table}: no rows")
+                continue
+            legacy_rate = legacy_rows / legacy
+            tuple_rate = tuple_rows / tuples
+            print(f"{table}: {tuple_rows} rows x {len(columns)} columns")
+            print(f"  fetch_row + result : {legacy_rate:12,.0f} rows/s")
+            print(f"  fetch_tuple        : {tuple_rate:12,.0f} rows/s  (BlockForNRows={args.block_rows})")
+            print(f"  speedup            : {tuple_rate / legacy_rate:.1f}x")
+    finally:
+        ibm_db.close(legacy_conn)
+        ibm_db.close(tuple_conn)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Transform stage scaling benchmark
+Rows/s of the in-process page transform vs the TransformPool at several worker counts
+
+    python benchmarks/parallel_transform.py --rows 200000 --workers 1,2,4
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipeline import mappings
+from pipeline.parallel import TransformPool
+from pipeline.validation import BatchValidator
+
+TABLE = "PERSONAL_DATA_INDIVIDUALS"
+MAPPING = mappings.TABLES[TABLE]
+KEYS = MAPPING.keys(exclude=("reportingDate",))
+COLUMNS = MAPPING.source_columns(KEYS)
+POSITIONS = {source: i for i, (_, source) in enumerate(COLUMNS)}
+
+
+def make_pages(rows, page_size, seed=42):
+    rng = random.Random(seed)
+    # Mostly distinct dates, so the work is parsing rather than cache hits
+    page, pages = [], []
+    for i in range(rows):
+        page.append(tuple(
+            f"{rng.randint(1, 28):02d}{rng.randint(1, 12):02d}{rng.randint(1900, 2025)}"
+            f"{rng.randint(0, 23):02d}{rng.randint(0, 59):02d}" if "DATE" in source
+            else ("N" if source == "SANCTIONSSTATUS" else f"{source[:6]}-{i}")
+            for _, source in COLUMNS
+        ))
+        if len(page) == page_size:
+            pages.append((POSITIONS, page, i))
+            page = []
+    if page:
+        pages.append((POSITIONS, page, rows))
+    return pages
+
+
+def run_serial(pages):
+    build = MAPPING.compile_batch(POSITIONS, KEYS, name=mappings.lower_key, extra=("reportingdate",))
+    validator = BatchValidator.from_mapping(MAPPING, KEYS, name=mappings.lower_key)
+    total = 0
+    for positions, rows, _ in pages:
+        batch = build(rows, datetime.now())
+        total += len(batch.where(validator.validate(batch).mask))
+    return total
+
+
+def run_pool(pages, workers, chunk_rows):
+    pool = TransformPool(workers, chunk_rows)
+    validator = BatchValidator.from_mapping(MAPPING, KEYS, name=mappings.lower_key)
+    try:
+        # Warm up: start the workers and compile the transform in each
+        list(pool.transform_pages(TABLE, KEYS, mappings.lower_key, pages[:workers * 2],
+                                  ("reportingdate",), lambda: (datetime.now(),)))
+        started = time.perf_counter()
+        # Validated in this process, after the merge, as the poller does
+        total = sum(len(batch.where(validator.validate(batch).mask)) for batch, _, _ in pool.transform_pages(
+            TABLE, KEYS, mappings.lower_key, pages, ("reportingdate",), lambda: (datetime.now(),)
+        ))
+        return total, time.perf_counter() - started
+    finally:
+        pool.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the process-pool transform stage")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--page-size", type=int, default=5000)
+    parser.add_argument("--chunk-rows", type=int, default=1000)
+    parser.add_argument("--workers", default="1,2,4")
+    args = parser.parse_args()
+
+    pages = make_pages(args.rows, args.page_size)
+    print(f"{args.rows} rows x {len(KEYS) + 1} columns, {os.cpu_count()} CPUs")
+
+    started = time.perf_counter()
+    expected = run_serial(pages)
+    elapsed = time.perf_counter() - started
+    serial_rate = args.rows / elapsed
+    print(f"  in-process  : {serial_rate:10,.0f} rows/s")
+
+    for workers in (int(w) for w in args.workers.split(",")):
+        total, elapsed = run_pool(pages, workers, args.chunk_rows)
+        assert total == expected, (total, expected)
+        rate = args.rows / elapsed
+        print(f"  {workers:2d} workers  : {rate:10,.0f} rows/s  ({rate / serial_rate:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
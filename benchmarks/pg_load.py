@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+PostgreSQL load benchmark
+Compares insert_to_pg's batched executemany with the COPY path on the two bot_* tables
+
+    PG_HOST=localhost PG_DBNAME=bot_db PG_USER=... PG_PASSWORD=... \\
+        python benchmarks/pg_load.py --rows 1000000
+
+Rows are shaped like the poller's transformed pages and loaded into a
+temporary table per bot_* table, so nothing outside the session changes.
+--encode-only measures the COPY encoding alone, without a database.
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+from datetime import datetime
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipeline import dates, mappings, money, pg_copy
+from pipeline.records import RecordBatch
+
+INSERT_BATCH = 100
+
+
+def make_batch(mapping, n, seed=42):
+    """n rows with the poller's column names and value types"""
+    rng = random.Random(seed)
+    keys = ["reportingdate"]
+    columns = [[datetime(2025, 1, 31)] * n]
+    for f in mapping.fields:
+        if f.key == "reportingDate":
+            continue
+        if f.convert is dates.parse_ddmmyyyyhhmm:
+            pool = [datetime(rng.randint(1950, 2025), rng.randint(1, 12), rng.randint(1, 28)) for _ in range(500)]
+            column = [rng.choice(pool) for _ in range(n)]
+        elif f.convert is money.to_amount:
+            column = [Decimal(rng.randint(0, 10 ** 9)) / 100 for _ in range(n)]
+        elif f.convert is mappings.yes_no:
+            column = [rng.random() < 0.01 for _ in range(n)]
+        elif f.key == "numberOfDependants":
+            column = [rng.randint(0, 6) for _ in range(n)]
+        else:
+            column = [f"{f.source[:6]}-{i % 997}" for i in range(n)]
+        keys.append(mappings.lower_key(f))
+        columns.append(column)
+    return RecordBatch(mapping.table, keys, columns)
+
+
+def column_type(values):
+    sample = values[0]
+    if isinstance(sample, datetime):
+        return "TIMESTAMP"
+    if isinstance(sample, bool):
+        return "BOOLEAN"
+    if isinstance(sample, int):
+        return "INTEGER"
+    if isinstance(sample, Decimal):
+        return "NUMERIC"
+    return "VARCHAR(255)"
+
+
+def load_insert(cursor, table, batch):
+    # insert_to_pg before the COPY path: executemany in batches of 100
+    query = f"INSERT INTO {table} ({', '.join(batch.keys)}) VALUES ({', '.join(['%s'] * len(batch.keys))})"
+    values = list(batch.rows())
+    for i in range(0, len(values), INSERT_BATCH):
+        cursor.executemany(query, values[i:i + INSERT_BATCH])
+
+
+def load_copy(cursor, table, batch):
+    pg_copy.copy_columns(cursor, table, batch.keys, batch.columns)
+
+
+def timed(conn, table, batch, load):
+    cursor = conn.cursor()
+    cursor.execute(f"TRUNCATE {table}")
+    conn.commit()
+    started = time.perf_counter()
+    load(cursor, table, batch)
+    conn.commit()
+    elapsed = time.perf_counter() - started
+    cursor.execute(f"SELECT COUNT(*) FROM {table}")
+    assert cursor.fetchone()[0] == len(batch)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PostgreSQL load paths")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--insert-rows", type=int, default=None,
+                        help="rows for the executemany path (default: --rows; it is slow)")
+    parser.add_argument("--encode-only", action="store_true", help="time COPY encoding only")
+    args = parser.parse_args()
+
+    conn = None
+    if not args.encode_only:
+        import psycopg2
+        conn = psycopg2.connect(
+            dbname=os.getenv("PG_DBNAME"), user=os.getenv("PG_USER"), password=os.getenv("PG_PASSWORD"),
+            host=os.getenv("PG_HOST"), port=os.getenv("PG_PORT"),
+        )
+
+    for mapping in (mappings.PERSONAL_DATA_INDIVIDUALS, mappings.ASSET_OWNED_OR_ACQUIRED):
+        batch = make_batch(mapping, args.rows)
+        print(f"{mapping.target_table}: {args.rows} rows x {len(batch.keys)} columns")
+
+        started = time.perf_counter()
+        encoded = sum(len(chunk) for chunk in pg_copy.encode_rows(batch.columns))
+        elapsed = time.perf_counter() - started
+        print(f"  COPY encoding : {args.rows / elapsed:12,.0f} rows/s  ({encoded / 2 ** 20:,.0f} MiB)")
+        if conn is None:
+            continue
+
+        table = f"bench_{mapping.target_table}"
+        cursor = conn.cursor()
+        definition = ", ".join(f"{key} {column_type(col)}" for key, col in zip(batch.keys, batch.columns))
+        cursor.execute(f"CREATE TEMP TABLE {table} ({definition})")
+        conn.commit()
+
+        insert_batch = batch.slice(0, args.insert_rows or args.rows)
+        insert = timed(conn, table, insert_batch, load_insert)
+        copy = timed(conn, table, batch, load_copy)
+        insert_rate = len(insert_batch) / insert
+        copy_rate = len(batch) / copy
+        print(f"  executemany   : {insert_rate:12,.0f} rows/s  ({len(insert_batch)} rows)")
+        print(f"  COPY          : {copy_rate:12,.0f} rows/s")
+        print(f"  speedup       : {copy_rate / insert_rate:.1f}x")
+
+    if conn is not None:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Connector interfaces for MCB Data Integration
+Endpoint configuration, row records and the source/loader base classes
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class EndpointConfig:
+    """One source endpoint: its id, connection parameters and page size"""
+    endpoint_id: str
+    connection_params: Dict[str, Any] = field(default_factory=dict)
+    batch_size: int = 1000
+
+
+@dataclass
+class DataRecord:
+    """One source row bound for a target table"""
+    table_name: str
+    endpoint_id: str
+    data: Dict[str, Any]
+    source_timestamp: Optional[datetime] = None
+
+
+class DataSourceConnector(ABC):
+    """Source side of the pipeline: connect to an endpoint and fetch new rows"""
+
+    def __init__(self, config: EndpointConfig):
+        self.config = config
+        self.is_connected = False
+
+    @abstractmethod
+    async def connect(self) -> bool:
+        ...
+
+    @abstractmethod
+    async def disconnect(self):
+        ...
+
+    @abstractmethod
+    async def test_connection(self) -> bool:
+        ...
+
+    @abstractmethod
+    async def fetch_data(self, table: str, last_timestamp: str) -> List[Dict[str, Any]]:
+        ...
+
+
+class DataLoader(ABC):
+    """Target side of the pipeline: load records and keep per-endpoint checkpoints"""
+
+    @abstractmethod
+    async def load(self, records: List[DataRecord]) -> bool:
+        ...
+
+    @abstractmethod
+    async def get_last_timestamp(self, endpoint_id: str, table: str) -> str:
+        ...
+
+    @abstractmethod
+    async def update_timestamp(self, endpoint_id: str, table: str, timestamp: str):
+        ...
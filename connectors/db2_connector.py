@@ -8,19 +8,38 @@ import ibm_db
 import logging
 import asyncio
 import time
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, AsyncIterator, Tuple
 from contextlib import asynccontextmanager
 
-from core.data_integration_engine import DataSourceConnector, EndpointConfig
+from connectors.base import DataSourceConnector, EndpointConfig
+from pipeline import db2_fetch, keyset, mappings, money
+from pipeline.db2_governor import LoadGovernor
+from pipeline.db2_pool import DB2ConnectionPool
+from pipeline.records import RecordBatch
 
 logger = logging.getLogger(__name__)
 
+# Record key and source column for each supported table
+RECORD_COLUMNS = {table: mapping.source_columns() for table, mapping in mappings.TABLES.items()}
+
+# Amount columns converted to exact Decimals on the way out; everything else stays as fetched
+AMOUNT_FIELDS = {
+    table: [f.key for f in mapping.fields if f.convert is money.to_amount]
+    for table, mapping in mappings.TABLES.items()
+}
+
 class DB2Connector(DataSourceConnector):
     """Connector for IBM DB2 databases"""
     
-    def __init__(self, config: EndpointConfig):
+    def __init__(self, config: EndpointConfig, metrics_collector=None):
         super().__init__(config)
         self.connection_string = None
+        self.pool: Optional[DB2ConnectionPool] = None
+        self.metrics_collector = metrics_collector
+        self.last_cursors: Dict[str, str] = {}
+        self.record_columns = dict(RECORD_COLUMNS)
+        self._transforms: Dict[Tuple[str, Tuple[str, ...], bool], Any] = {}
+        self.governor = LoadGovernor.from_env(self.config.batch_size, on_change=self._record_throttle_level)
         self._prepare_connection_string()
     
     def _prepare_connection_string(self):
@@ -33,19 +52,30 @@ class DB2Connector(DataSourceConnector):
             f"PROTOCOL=TCPIP;"
             f"UID={params['user']};"
             f"PWD={params['password']};"
+            f"{db2_fetch.block_fetch_keywords()}"
         )
     
     async def connect(self) -> bool:
-        """Establish connection to DB2"""
+        """Open the DB2 connection pool (same role as the asyncpg pool in PostgreSQLLoader)"""
         try:
+            params = self.config.connection_params
+            if self.pool is None:
+                self.pool = DB2ConnectionPool(
+                    lambda: ibm_db.connect(self.connection_string, "", ""),
+                    min_size=params.get('pool_min_size', 1),
+                    max_size=params.get('pool_max_size', 5),
+                    max_idle=params.get('pool_max_idle', 300),
+                    on_wait=self._record_pool_wait,
+                    on_statement=self._record_statement_lookup,
+                    name=self.config.endpoint_id,
+                )
+            
             # Run in thread pool since ibm_db is synchronous
             loop = asyncio.get_event_loop()
-            self.connection = await loop.run_in_executor(
-                None, 
-                lambda: ibm_db.connect(self.connection_string, "", "")
-            )
+            await loop.run_in_executor(None, self.pool.open)
             
-            if self.connection:
+            if self.pool.stats()["idle"] > 0:
+                await loop.run_in_executor(None, self._check_record_columns)
                 self.is_connected = True
                 logger.info(f"Connected to DB2 endpoint: {self.config.endpoint_id}")
                 return True
@@ -59,14 +89,12 @@ class DB2Connector(DataSourceConnector):
             return False
     
     async def disconnect(self):
-        """Close DB2 connection"""
+        """Close the DB2 connection pool"""
         try:
-            if self.connection and self.is_connected:
+            if self.pool and self.is_connected:
                 loop = asyncio.get_event_loop()
-                await loop.run_in_executor(
-                    None,
-                    lambda: ibm_db.close(self.connection)
-                )
+                await loop.run_in_executor(None, self.pool.close)
+                self.pool = None
                 self.is_connected = False
                 logger.info(f"Disconnected from DB2 endpoint: {self.config.endpoint_id}")
         except Exception as e:
@@ -75,15 +103,12 @@ class DB2Connector(DataSourceConnector):
     async def test_connection(self) -> bool:
         """Test if DB2 connection is healthy"""
         try:
-            if not self.is_connected or not self.connection:
+            if not self.is_connected or not self.pool:
                 return False
             
-            # Simple test query
+            # Simple test query on a pooled connection
             loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None,
-                lambda: ibm_db.exec_immediate(self.connection, "SELECT 1 FROM SYSIBM.SYSDUMMY1")
-            )
+            result = await loop.run_in_executor(None, self._test_connection_sync)
             
             return result is not False
             
@@ -91,48 +116,55 @@ class DB2Connector(DataSourceConnector):
             logger.error(f"DB2 connection test failed for {self.config.endpoint_id}: {e}")
             return False
     
+    def _test_connection_sync(self):
+        with self.pool.connection() as conn:
+            stmt = self.pool.statements(conn).execute("SELECT 1 FROM SYSIBM.SYSDUMMY1")
+            ibm_db.free_result(stmt)
+            return True
+    
+    def _check_record_columns(self):
+        """Restrict each table's projection to mapped columns present in the DB2 catalog"""
+        with self.pool.connection() as conn:
+            for table, mapping in RECORD_COLUMNS.items():
+                self.record_columns[table] = db2_fetch.check_mapping(conn, keyset.SCHEMA, table, mapping)
+    
+    def _record_throttle_level(self, level: float):
+        """Report the DB2 load governor's throttle level"""
+        if self.metrics_collector:
+            self.metrics_collector.record_db2_throttle_level(self.config.endpoint_id, level)
+    
+    def _record_statement_lookup(self, hit: bool):
+        """Report prepared statement cache hits and misses"""
+        if self.metrics_collector:
+            self.metrics_collector.record_db2_statement_lookup(self.config.endpoint_id, hit)
+    
+    def _record_pool_wait(self, seconds: float):
+        """Report checkout wait time and pool occupancy"""
+        if self.metrics_collector:
+            self.metrics_collector.record_db2_pool_wait(
+                self.config.endpoint_id, seconds, self.pool.stats()
+            )
+    
     async def fetch_data(self, table: str, last_timestamp: str) -> List[Dict[str, Any]]:
-        """Fetch data from DB2 table since last timestamp"""
+        """Fetch the next keyset page after a stored cursor token
+
+        last_timestamp is an encoded KeysetCursor (bare timestamps from older
+        checkpoints are accepted); the cursor after the returned page is left
+        in self.last_cursors[table] for the caller to persist.
+        """
         try:
             if not self.is_connected:
                 await self.connect()
             
-            # Prepare query based on table
-            query = self._build_query(table, last_timestamp)
+            cursor = keyset.KeysetCursor.decode(last_timestamp)
             
-            # Execute query in thread pool
+            # One executor hop covers prepare, execute and the full page fetch
             loop = asyncio.get_event_loop()
-            stmt = await loop.run_in_executor(
-                None,
-                lambda: ibm_db.prepare(self.connection, query)
-            )
-            
-            if not stmt:
-                logger.error(f"Failed to prepare query for {table}")
-                return []
-            
-            # Bind parameters
-            await loop.run_in_executor(
+            records, next_cursor, _ = await loop.run_in_executor(
                 None,
-                lambda: ibm_db.bind_param(stmt, 1, last_timestamp)
+                lambda: self._fetch_page_sync(table, cursor, self.config.batch_size)
             )
-            
-            # Execute query
-            success = await loop.run_in_executor(
-                None,
-                lambda: ibm_db.execute(stmt)
-            )
-            
-            if not success:
-                logger.error(f"Failed to execute query for {table}")
-                return []
-            
-            # Fetch results
-            records = []
-            while await loop.run_in_executor(None, lambda: ibm_db.fetch_row(stmt)):
-                record = await self._fetch_record(stmt, table)
-                if record:
-                    records.append(record)
+            self.last_cursors[table] = next_cursor.encode()
             
             logger.info(f"Fetched {len(records)} records from {table} for endpoint {self.config.endpoint_id}")
             return records
@@ -141,160 +173,87 @@ class DB2Connector(DataSourceConnector):
             logger.error(f"Error fetching data from {table} for {self.config.endpoint_id}: {e}")
             return []
     
-    def _build_query(self, table: str, last_timestamp: str) -> str:
-        """Build SQL query for specific table"""
-        schema = "CBS_SCHEMA"
-        
-        if table == "PERSONAL_DATA_INDIVIDUALS":
-            return f"""
-                SELECT 
-                    REPORTINGDATE, CUSTOMERIDENTIFICATIONNUMBER, FIRSTNAME, MIDDLENAMES, SURNAME,
-                    GENDER, DATEOFBIRTH, MARITALSTATUS, NUMBEROFDEPENDANTS, DISABILITYSTATUS,
-                    DISABILITYTYPE, CITIZENSHIP, NATIONALITY, RESIDENCE, RESIDENCESTATUS,
-                    EMPLOYMENTSTATUS, OCCUPATION, EMPLOYERNAME, EMPLOYERADDRESS, SECTOREMPLOYER,
-                    INCOMERANGE, EDUCATIONLEVEL, IDENTIFICATIONTYPE, IDENTIFICATIONNUMBER,
-                    ISSUINGCOUNTRY, ISSUINGAUTHORITY, ISSUEDATE, EXPIRYDATE, MOBILENUMBER,
-                    ALTMOBILENUMBER, EMAILADDRESS, ALTEMAILADDRESS, POSTALADDRESS,
-                    PHYSICALADDRESS, REGION, DISTRICT, WARD, STREET, HOUSENUMBER,
-                    POSTALCODE, COUNTRY, GPSCOORDINATES, NEXTOFKINNAME, NEXTOFKINRELATIONSHIP,
-                    NEXTOFKINMOBILENUMBER, NEXTOFKINEMAILADDRESS, NEXTOFKINADDRESS,
-                    NEXTOFKINREGION, NEXTOFKINDISTRICT, NEXTOFKINWARD, NEXTOFKINSTREET,
-                    NEXTOFKINHOUSENUMBER, NEXTOFKINPOSTALCODE, NEXTOFKINCOUNTRY,
-                    NEXTOFKINGPSCOORDINATES, KYCSTATUS, KYCDATE, KYCEXPIRYDATE,
-                    RISKRATING, RISKRATINGDATE, PEPSTATUS, PEPCLASSIFICATION,
-                    PEPPOSITION, PEPCOUNTRY, PEPRELATIONSHIP, SANCTIONSSTATUS,
-                    SANCTIONSLIST, SANCTIONSDATE, SANCTIONSCOUNTRY, VILLAGE
-                FROM {schema}.{table}
-                WHERE REPORTINGDATE > ?
-                ORDER BY REPORTINGDATE
-                FETCH FIRST {self.config.batch_size} ROWS ONLY
-            """
-        
-        elif table == "ASSET_OWNED_OR_ACQUIRED":
-            return f"""
-                SELECT 
-                    REPORTINGDATE, ASSETCATEGORY, ASSETTYPE, ACQUISITIONDATE,
-                    CURRENCY, ORGCOSTVALUE, USDCOSTVALUE, TZSCOSTVALUE,
-                    ALLOWANCEPROBABLELOSS, BOTPROVISION
-                FROM {schema}.{table}
-                WHERE REPORTINGDATE > ?
-                ORDER BY REPORTINGDATE
-                FETCH FIRST {self.config.batch_size} ROWS ONLY
-            """
-        
-        else:
-            # Generic query for other tables
-            return f"""
-                SELECT * FROM {schema}.{table}
-                WHERE REPORTINGDATE > ?
-                ORDER BY REPORTINGDATE
-                FETCH FIRST {self.config.batch_size} ROWS ONLY
-            """
-    
-    async def _fetch_record(self, stmt, table: str) -> Optional[Dict[str, Any]]:
-        """Fetch a single record from result set"""
-        try:
-            loop = asyncio.get_event_loop()
-            
-            if table == "PERSONAL_DATA_INDIVIDUALS":
-                record = {
-                    "reportingDate": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "REPORTINGDATE")),
-                    "customerIdentificationNumber": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "CUSTOMERIDENTIFICATIONNUMBER")),
-                    "firstName": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "FIRSTNAME")),
-                    "middleNames": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "MIDDLENAMES")),
-                    "surname": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "SURNAME")),
-                    "gender": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "GENDER")),
-                    "dateOfBirth": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "DATEOFBIRTH")),
-                    "maritalStatus": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "MARITALSTATUS")),
-                    "numberOfDependants": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "NUMBEROFDEPENDANTS")),
-                    "disabilityStatus": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "DISABILITYSTATUS")),
-                    "disabilityType": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "DISABILITYTYPE")),
-                    "citizenship": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "CITIZENSHIP")),
-                    "nationality": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "NATIONALITY")),
-                    "residence": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "RESIDENCE")),
-                    "residenceStatus": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "RESIDENCESTATUS")),
-                    "employmentStatus": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "EMPLOYMENTSTATUS")),
-                    "occupation": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "OCCUPATION")),
-                    "employerName": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "EMPLOYERNAME")),
-                    "employerAddress": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "EMPLOYERADDRESS")),
-                    "sectorEmployer": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "SECTOREMPLOYER")),
-                    "incomeRange": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "INCOMERANGE")),
-                    "educationLevel": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "EDUCATIONLEVEL")),
-                    "identificationType": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "IDENTIFICATIONTYPE")),
-                    "identificationNumber": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "IDENTIFICATIONNUMBER")),
-                    "issuingCountry": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "ISSUINGCOUNTRY")),
-                    "issuingAuthority": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "ISSUINGAUTHORITY")),
-                    "issueDate": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "ISSUEDATE")),
-                    "expiryDate": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "EXPIRYDATE")),
-                    "mobileNumber": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "MOBILENUMBER")),
-                    "altMobileNumber": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "ALTMOBILENUMBER")),
-                    "emailAddress": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "EMAILADDRESS")),
-                    "altEmailAddress": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "ALTEMAILADDRESS")),
-                    "postalAddress": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "POSTALADDRESS")),
-                    "physicalAddress": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "PHYSICALADDRESS")),
-                    "region": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "REGION")),
-                    "district": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "DISTRICT")),
-                    "ward": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "WARD")),
-                    "street": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "STREET")),
-                    "houseNumber": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "HOUSENUMBER")),
-                    "postalCode": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "POSTALCODE")),
-                    "country": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "COUNTRY")),
-                    "gpsCoordinates": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "GPSCOORDINATES")),
-                    "nextOfKinName": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "NEXTOFKINNAME")),
-                    "nextOfKinRelationship": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "NEXTOFKINRELATIONSHIP")),
-                    "nextOfKinMobileNumber": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "NEXTOFKINMOBILENUMBER")),
-                    "nextOfKinEmailAddress": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "NEXTOFKINEMAILADDRESS")),
-                    "nextOfKinAddress": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "NEXTOFKINADDRESS")),
-                    "nextOfKinRegion": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "NEXTOFKINREGION")),
-                    "nextOfKinDistrict": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "NEXTOFKINDISTRICT")),
-                    "nextOfKinWard": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "NEXTOFKINWARD")),
-                    "nextOfKinStreet": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "NEXTOFKINSTREET")),
-                    "nextOfKinHouseNumber": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "NEXTOFKINHOUSENUMBER")),
-                    "nextOfKinPostalCode": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "NEXTOFKINPOSTALCODE")),
-                    "nextOfKinCountry": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "NEXTOFKINCOUNTRY")),
-                    "nextOfKinGpsCoordinates": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "NEXTOFKINGPSCOORDINATES")),
-                    "kycStatus": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "KYCSTATUS")),
-                    "kycDate": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "KYCDATE")),
-                    "kycExpiryDate": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "KYCEXPIRYDATE")),
-                    "riskRating": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "RISKRATING")),
-                    "riskRatingDate": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "RISKRATINGDATE")),
-                    "pepStatus": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "PEPSTATUS")),
-                    "pepClassification": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "PEPCLASSIFICATION")),
-                    "pepPosition": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "PEPPOSITION")),
-                    "pepCountry": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "PEPCOUNTRY")),
-                    "pepRelationship": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "PEPRELATIONSHIP")),
-                    "sanctionsStatus": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "SANCTIONSSTATUS")),
-                    "sanctionsList": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "SANCTIONSLIST")),
-                    "sanctionsDate": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "SANCTIONSDATE")),
-                    "sanctionsCountry": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "SANCTIONSCOUNTRY")),
-                    "village": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "VILLAGE"))
-                }
-            
-            elif table == "ASSET_OWNED_OR_ACQUIRED":
-                record = {
-                    "reportingDate": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "REPORTINGDATE")),
-                    "assetCategory": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "ASSETCATEGORY")),
-                    "assetType": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "ASSETTYPE")),
-                    "acquisitionDate": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "ACQUISITIONDATE")),
-                    "currency": await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "CURRENCY")),
-                    "orgCostValue": self._safe_float(await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "ORGCOSTVALUE"))),
-                    "usdCostValue": self._safe_float(await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "USDCOSTVALUE"))),
-                    "tzsCostValue": self._safe_float(await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "TZSCOSTVALUE"))),
-                    "allowanceProbableLoss": self._safe_float(await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "ALLOWANCEPROBABLELOSS"))),
-                    "botProvision": self._safe_float(await loop.run_in_executor(None, lambda: ibm_db.result(stmt, "BOTPROVISION")))
-                }
-            
-            else:
-                # Generic record fetching for other tables
-                record = {}
-                # This would need to be implemented based on table structure
-            
-            return record
-            
-        except Exception as e:
-            logger.error(f"Error fetching record from {table}: {e}")
-            return None
+    async def fetch_pages(self, table: str, last_timestamp: str,
+                          page_size: Optional[int] = None) -> AsyncIterator[Tuple[List[Dict[str, Any]], str]]:
+        """Drain a backlog as (records, cursor token) pages, one executor hop per page"""
+        if not self.is_connected:
+            await self.connect()
+
+        page_size = page_size or self.config.batch_size
+        cursor = keyset.KeysetCursor.decode(last_timestamp)
+        loop = asyncio.get_event_loop()
+        while True:
+            records, cursor, more = await loop.run_in_executor(
+                None,
+                lambda: self._fetch_page_sync(table, cursor, page_size)
+            )
+            if records:
+                self.last_cursors[table] = cursor.encode()
+                yield records, cursor.encode()
+            if not more:
+                break
     
+    async def fetch_batch(self, table: str, last_timestamp: str) -> RecordBatch:
+        """Like fetch_data, but returns the page as a columnar RecordBatch"""
+        if not self.is_connected:
+            await self.connect()
+
+        cursor = keyset.KeysetCursor.decode(last_timestamp)
+        loop = asyncio.get_event_loop()
+        batch, next_cursor, _ = await loop.run_in_executor(
+            None,
+            lambda: self._fetch_page_sync(table, cursor, self.config.batch_size, columnar=True)
+        )
+        self.last_cursors[table] = next_cursor.encode()
+        batch.endpoint_id = self.config.endpoint_id
+        return batch
+
+    def _build_query(self, table: str, page_size: int) -> str:
+        """Build the keyset page query for a specific table"""
+        mapping = self.record_columns.get(table)
+        if mapping is None:
+            # Generic query for other tables
+            columns = "T.*"
+        else:
+            columns = db2_fetch.select_list(mapping)
+        return keyset.build_page_query(table, columns, page_size)
+
+    def _fetch_page_sync(self, table: str, cursor: keyset.KeysetCursor, page_size: int,
+                         columnar: bool = False) -> Tuple[Any, keyset.KeysetCursor, bool]:
+        """Prepare, execute and fetch one keyset page inside one worker thread
+
+        Returns the page as a list of record dicts, or as a RecordBatch when
+        columnar is set.
+        """
+        # The governor shrinks pages and limits concurrent queries while DB2 is slow
+        page_size = min(page_size, self.governor.page_size())
+        with self.pool.connection() as conn:
+            stmt = self.pool.statements(conn).prepare(self._build_query(table, page_size))
+            if not stmt:
+                raise RuntimeError(f"Failed to prepare query for {table}")
+
+            with self.governor.query():
+                positions, rows, next_cursor, more = keyset.fetch_page(stmt, cursor, page_size)
+
+        # Columns dropped by the catalog check still come back as None
+        mapping = mappings.TABLES.get(table)
+        if mapping is None:
+            # Generic tables keep their DB2 column names
+            names = [name for name in positions if name not in (keyset.CREATED_ALIAS, keyset.KEY_ALIAS)]
+            if columnar:
+                picked = [tuple(row[positions[name]] for name in names) for row in rows]
+                return RecordBatch.from_rows(table, names, picked), next_cursor, more
+            read_row = db2_fetch.row_reader(positions, [(name, name) for name in names])
+            return [read_row(row) for row in rows], next_cursor, more
+
+        key = (table, tuple(positions), columnar)
+        transform = self._transforms.get(key)
+        if transform is None:
+            compile_page = mapping.compile_batch if columnar else mapping.compile_transform
+            transform = compile_page(positions, convert=AMOUNT_FIELDS[table])
+            self._transforms[key] = transform
+        return transform(rows), next_cursor, more
+
     def _safe_float(self, value) -> float:
         """Safely convert value to float"""
         if value is None:
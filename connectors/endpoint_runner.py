@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Multi-endpoint runner for MCB Data Integration
+Polls every (endpoint, table) job from a jobs config through DB2Connector and PostgreSQLLoader
+
+    PG_HOST=... PG_DBNAME=bot_db PG_USER=... PG_PASSWORD=... \\
+        python -m connectors.endpoint_runner --config endpoints.json
+"""
+
+import os
+import time
+import signal
+import asyncio
+import logging
+import argparse
+from typing import Dict, Optional
+
+from connectors.base import EndpointConfig
+from connectors.db2_connector import DB2Connector
+from connectors.postgresql_connector import PostgreSQLLoader
+from monitoring.metrics_collector import MCBMetricsCollector
+from pipeline.endpoint_scheduler import EndpointScheduler, PollJob, load_jobs
+from pipeline.records import RecordBatch
+
+logger = logging.getLogger(__name__)
+
+
+class EndpointRunner:
+    """Drives one DB2Connector per endpoint and a shared loader from an EndpointScheduler"""
+
+    def __init__(self, settings: Dict, loader: PostgreSQLLoader,
+                 metrics_collector: Optional[MCBMetricsCollector] = None):
+        self.loader = loader
+        self.metrics_collector = metrics_collector
+        self.connectors: Dict[str, DB2Connector] = {
+            endpoint["endpoint_id"]: DB2Connector(
+                EndpointConfig(endpoint_id=endpoint["endpoint_id"], **endpoint.get("config", {})),
+                metrics_collector,
+            )
+            for endpoint in settings["endpoints"]
+        }
+        self.scheduler = EndpointScheduler(
+            self.run_job,
+            global_concurrency=settings["global_concurrency"],
+            per_host_concurrency=settings["per_host_concurrency"],
+            on_queue_wait=metrics_collector.record_endpoint_queue_wait if metrics_collector else None,
+        )
+        for job in settings["jobs"]:
+            self.scheduler.add_job(job)
+
+    async def run_job(self, job: PollJob) -> Optional[float]:
+        """Drain one table of one endpoint, checkpointing after every loaded page"""
+        connector = self.connectors[job.endpoint_id]
+        started = time.monotonic()
+        loaded = 0
+        token = await self.loader.get_last_timestamp(job.endpoint_id, job.table)
+        try:
+            async for records, token in connector.fetch_pages(job.table, token):
+                batch = RecordBatch.from_dicts(job.table, records, endpoint_id=job.endpoint_id)
+                if not await self.loader.load(batch):
+                    raise RuntimeError(f"Load of {len(batch)} rows failed")
+                await self.loader.update_timestamp(job.endpoint_id, job.table, token)
+                loaded += len(batch)
+        except Exception as e:
+            if self.metrics_collector:
+                self.metrics_collector.record_processing_failure(job.endpoint_id, job.table, type(e).__name__)
+            raise
+        if self.metrics_collector:
+            self.metrics_collector.record_processing_success(
+                job.endpoint_id, job.table, loaded, time.monotonic() - started
+            )
+        if loaded:
+            logger.info(f"Loaded {loaded} {job.table} rows for {job.endpoint_id}")
+        return None
+
+    async def run(self):
+        await self.loader.initialize()
+        try:
+            await self.scheduler.run()
+        finally:
+            for connector in self.connectors.values():
+                await connector.disconnect()
+            await self.loader.close()
+
+    def stop(self):
+        self.scheduler.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Poll many DB2 endpoints from a jobs config")
+    parser.add_argument("--config", required=True, help="jobs config (see pipeline.endpoint_scheduler.load_jobs)")
+    parser.add_argument("--metrics-port", type=int, default=int(os.getenv("METRICS_PORT", "8000")),
+                        help="Prometheus port; 0 disables metrics")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    settings = load_jobs(args.config)
+    loader = PostgreSQLLoader({
+        "host": os.getenv("PG_HOST"),
+        "port": int(os.getenv("PG_PORT", "5432")),
+        "database": os.getenv("PG_DBNAME"),
+        "user": os.getenv("PG_USER"),
+        "password": os.getenv("PG_PASSWORD"),
+    })
+    metrics_collector = MCBMetricsCollector(args.metrics_port) if args.metrics_port else None
+    if metrics_collector:
+        metrics_collector.update_system_metrics(len(settings["jobs"]), len(settings["endpoints"]))
+    runner = EndpointRunner(settings, loader, metrics_collector)
+    logger.info(f"Running {len(settings['jobs'])} jobs for {len(runner.connectors)} endpoints")
+
+    loop = asyncio.get_event_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, runner.stop)
+    loop.run_until_complete(runner.run())
+
+
+if __name__ == "__main__":
+    main()
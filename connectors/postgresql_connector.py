@@ -8,13 +8,49 @@ import asyncpg
 import logging
 import asyncio
 import json
-from typing import Dict, List, Any, Optional
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Any, Optional, Tuple, Union
 from datetime import datetime
 
-from core.data_integration_engine import DataLoader, DataRecord
+from connectors.base import DataLoader, DataRecord
+from pipeline import dates, dead_letter, isolation, mappings
+from pipeline.records import RecordBatch
 
 logger = logging.getLogger(__name__)
 
+# Per source table: conflict key, columns refreshed on conflict, and the
+# record keys converted before binding (DDMMYYYYHHMM to TIMESTAMP, Y/N to BOOLEAN)
+UPSERTS = {
+    "PERSONAL_DATA_INDIVIDUALS": (
+        ("endpoint_id", "customer_identification_number", "reporting_date"),
+        ("first_name", "middle_names", "surname"),
+        ("reportingDate", "sanctionsStatus"),
+    ),
+    "ASSET_OWNED_OR_ACQUIRED": (
+        ("endpoint_id", "asset_category", "reporting_date"),
+        ("org_cost_value",),
+        ("reportingDate", "acquisitionDate"),
+    ),
+}
+
+# Staging column holding each row's position in the batch
+STAGE_ROW = "stage_row"
+
+# Errors meaning the connection is gone, not that a row is bad
+FATAL_ERRORS = (asyncpg.PostgresConnectionError, asyncpg.InterfaceError, ConnectionError, OSError)
+
+
+@dataclass(frozen=True)
+class Upsert:
+    """Staging table, merge statement and parameter extractors for one mapped table"""
+    stage: str
+    create_stage: str
+    columns: Tuple[str, ...]
+    merge: str
+    params: Callable[[Dict[str, Any]], tuple]
+    batch_params: Callable[[RecordBatch], Iterator[tuple]]
+
+
 class PostgreSQLLoader(DataLoader):
     """PostgreSQL data loader for BOT consolidated database"""
     
@@ -22,6 +58,7 @@ class PostgreSQLLoader(DataLoader):
         self.connection_params = connection_params
         self.connection_pool = None
         self.table_schemas = self._get_table_schemas()
+        self.statements = self._compile_statements()
     
     async def initialize(self):
         """Initialize connection pool"""
@@ -53,19 +90,8 @@ class PostgreSQLLoader(DataLoader):
             logger.info("PostgreSQL connection pool closed")
     
     def _convert_ddmmyyyyhhmm_to_timestamp(self, date_str: Optional[str]) -> Optional[datetime]:
-        """Convert DDMMYYYYHHMM format to datetime object"""
-        if not date_str or len(date_str) != 12:
-            return None
-        try:
-            # Parse DDMMYYYYHHMM format
-            day = int(date_str[0:2])
-            month = int(date_str[2:4])
-            year = int(date_str[4:8])
-            hour = int(date_str[8:10])
-            minute = int(date_str[10:12])
-            return datetime(year, month, day, hour, minute)
-        except (ValueError, TypeError):
-            return None
+        """Convert DDMMYYYYHHMM format to datetime object (shared, memoized parser)"""
+        return dates.parse_ddmmyyyyhhmm(date_str)
     
     def _get_table_schemas(self) -> Dict[str, str]:
         """Define table schemas for BOT reporting"""
@@ -188,10 +214,14 @@ class PostgreSQLLoader(DataLoader):
                 CREATE TABLE IF NOT EXISTS bot_polling_timestamps (
                     endpoint_id VARCHAR(100) NOT NULL,
                     table_name VARCHAR(100) NOT NULL,
-                    last_timestamp VARCHAR(12) NOT NULL,
+                    last_timestamp VARCHAR(64) NOT NULL,
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     PRIMARY KEY(endpoint_id, table_name)
                 );
+                
+                -- Holds encoded keyset cursors ('<CREATEDDATE>|<row key>')
+                ALTER TABLE bot_polling_timestamps
+                ALTER COLUMN last_timestamp TYPE VARCHAR(64);
             """,
             
             "bot_processing_log": """
@@ -208,7 +238,9 @@ class PostgreSQLLoader(DataLoader):
                 
                 CREATE INDEX IF NOT EXISTS idx_processing_log_endpoint 
                 ON bot_processing_log(endpoint_id, created_at);
-            """
+            """,
+
+            dead_letter.TABLE: dead_letter.TABLE_DDL,
         }
     
     async def _create_tables(self):
@@ -222,157 +254,158 @@ class PostgreSQLLoader(DataLoader):
                     logger.error(f"Error creating table {table_name}: {e}")
                     raise
     
-    async def load(self, records: List[DataRecord]) -> bool:
-        """Load data records to PostgreSQL"""
+    async def load(self, records: Union[List[DataRecord], RecordBatch]) -> bool:
+        """Load data records, or one columnar RecordBatch, to PostgreSQL"""
         if not records:
             return True
+        if isinstance(records, RecordBatch):
+            return await self._load_batch(records)
         
+        # Consecutive records of the same table are merged together, in order
+        groups: List[Tuple[str, List[DataRecord]]] = []
+        for record in records:
+            if groups and groups[-1][0] == record.table_name:
+                groups[-1][1].append(record)
+            else:
+                groups.append((record.table_name, [record]))
+
+        loaded = 0
+        for table, group in groups:
+            upsert = self.statements.get(table)
+            if upsert is None:
+                logger.warning(f"Unknown table: {table}")
+                continue
+            rows = [
+                (n, record.endpoint_id, *upsert.params(record.data), record.source_timestamp)
+                for n, record in enumerate(group)
+            ]
+            if await self._merge(upsert, table, group[0].endpoint_id, rows):
+                loaded += len(rows)
+
+        logger.info(f"Successfully loaded {loaded}/{len(records)} records")
+        return loaded > 0
+    
+    async def _load_batch(self, batch: RecordBatch) -> bool:
+        """Load a columnar batch through the staging merge"""
+        upsert = self.statements.get(batch.table)
+        if upsert is None:
+            logger.warning(f"Unknown table: {batch.table}")
+            return False
+        rows = [
+            (n, batch.endpoint_id, *values, batch.source_timestamp)
+            for n, values in enumerate(upsert.batch_params(batch))
+        ]
+        if not await self._merge(upsert, batch.table, batch.endpoint_id, rows):
+            return False
+        logger.info(f"Successfully loaded {len(rows)}/{len(batch)} records")
+        return True
+    
+    async def _merge(self, upsert: Upsert, table: str, endpoint_id: str, rows: List[tuple]) -> bool:
+        """Copy rows into the session's staging table and upsert them in one statement
+
+        Round trips per batch: create the staging table (a no-op once it
+        exists on the connection), the binary COPY, the merge and the
+        processing log, all in one transaction. The staging table empties
+        itself on commit. If the batch fails, it is retried in a new
+        transaction, bisected under savepoints so that only the failing
+        rows are left out. Those rows are dead-lettered in the same
+        transaction under the target table's name, so the batch counts as
+        handled and the caller can move its checkpoint past them.
+        """
         try:
             async with self.connection_pool.acquire() as conn:
+                try:
+                    async with conn.transaction():
+                        await conn.execute(upsert.create_stage)
+                        await self._stage_and_merge(conn, upsert, rows)
+                        await self._log_processing(conn, endpoint_id, table, len(rows), 0)
+                    return True
+                except FATAL_ERRORS:
+                    raise
+                except Exception as e:
+                    logger.warning(f"Loading {len(rows)} {table} rows failed, isolating bad rows: {e}")
+
+                async def attempt(chunk: List[tuple]):
+                    await self._stage_and_merge(conn, upsert, chunk)
+                    # Only a commit empties the staging table; clear it for the next chunk
+                    await conn.execute(f"TRUNCATE {upsert.stage}")
+
                 async with conn.transaction():
-                    success_count = 0
-                    
-                    for record in records:
-                        try:
-                            if record.table_name == "PERSONAL_DATA_INDIVIDUALS":
-                                await self._insert_personal_data(conn, record)
-                            elif record.table_name == "ASSET_OWNED_OR_ACQUIRED":
-                                await self._insert_asset_data(conn, record)
-                            else:
-                                logger.warning(f"Unknown table: {record.table_name}")
-                                continue
-                            
-                            success_count += 1
-                            
-                        except Exception as e:
-                            logger.error(f"Error inserting record {record.record_id}: {e}")
-                            # Continue with other records
-                    
-                    # Log processing results
+                    await conn.execute(upsert.create_stage)
+                    result = await isolation.isolate_async(
+                        rows, attempt, conn.transaction, fatal=FATAL_ERRORS, known_bad=True
+                    )
+                    await dead_letter.write_async(
+                        conn, mappings.TABLES[table].target_table, "load", dead_letter.new_batch_id(),
+                        upsert.columns[1:], [row[1:] for row, _ in result.failed],
+                        [dead_letter.describe(error) for _, error in result.failed],
+                    )
                     await self._log_processing(
-                        conn, 
-                        records[0].endpoint_id, 
-                        records[0].table_name,
-                        success_count,
-                        len(records) - success_count
+                        conn, endpoint_id, table, result.loaded, len(result.failed),
+                        result.summary(table) if result.failed else None
                     )
-                    
-                    logger.info(f"Successfully loaded {success_count}/{len(records)} records")
-                    return success_count > 0
-                    
+            logger.error(result.summary(table))
+            return True
         except Exception as e:
-            logger.error(f"Error loading records to PostgreSQL: {e}")
+            logger.error(f"Error loading {table} batch to PostgreSQL: {e}")
             return False
     
-    async def _insert_personal_data(self, conn, record: DataRecord):
-        """Insert personal data record"""
-        data = record.data
-        
-        # Convert reportingDate from DDMMYYYYHHMM to TIMESTAMP
-        reporting_date = self._convert_ddmmyyyyhhmm_to_timestamp(data.get('reportingDate', ''))
-        
-        query = """
-            INSERT INTO bot_personal_data_individuals (
-                endpoint_id, reporting_date, customer_identification_number, first_name,
-                middle_names, surname, gender, date_of_birth, marital_status,
-                number_of_dependants, disability_status, disability_type, citizenship,
-                nationality, residence, residence_status, employment_status, occupation,
-                employer_name, employer_address, sector_employer, income_range,
-                education_level, identification_type, identification_number,
-                issuing_country, issuing_authority, issue_date, expiry_date,
-                mobile_number, alt_mobile_number, email_address, alt_email_address,
-                postal_address, physical_address, region, district, ward, street,
-                house_number, postal_code, country, gps_coordinates, next_of_kin_name,
-                next_of_kin_relationship, next_of_kin_mobile_number, next_of_kin_email_address,
-                next_of_kin_address, next_of_kin_region, next_of_kin_district,
-                next_of_kin_ward, next_of_kin_street, next_of_kin_house_number,
-                next_of_kin_postal_code, next_of_kin_country, next_of_kin_gps_coordinates,
-                kyc_status, kyc_date, kyc_expiry_date, risk_rating, risk_rating_date,
-                pep_status, pep_classification, pep_position, pep_country,
-                pep_relationship, sanctions_status, sanctions_list, sanctions_date,
-                sanctions_country, village, source_timestamp
-            ) VALUES (
-                $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16,
-                $17, $18, $19, $20, $21, $22, $23, $24, $25, $26, $27, $28, $29, $30,
-                $31, $32, $33, $34, $35, $36, $37, $38, $39, $40, $41, $42, $43, $44,
-                $45, $46, $47, $48, $49, $50, $51, $52, $53, $54, $55, $56, $57, $58,
-                $59, $60, $61, $62, $63, $64, $65, $66, $67, $68, $69
-            )
-            ON CONFLICT (endpoint_id, customer_identification_number, reporting_date)
-            DO UPDATE SET
-                updated_at = CURRENT_TIMESTAMP,
-                first_name = EXCLUDED.first_name,
-                middle_names = EXCLUDED.middle_names,
-                surname = EXCLUDED.surname
-        """
-        
-        await conn.execute(query,
-            record.endpoint_id, reporting_date, data.get('customerIdentificationNumber'),
-            data.get('firstName'), data.get('middleNames'), data.get('surname'),
-            data.get('gender'), data.get('dateOfBirth'), data.get('maritalStatus'),
-            data.get('numberOfDependants'), data.get('disabilityStatus'), data.get('disabilityType'),
-            data.get('citizenship'), data.get('nationality'), data.get('residence'),
-            data.get('residenceStatus'), data.get('employmentStatus'), data.get('occupation'),
-            data.get('employerName'), data.get('employerAddress'), data.get('sectorEmployer'),
-            data.get('incomeRange'), data.get('educationLevel'), data.get('identificationType'),
-            data.get('identificationNumber'), data.get('issuingCountry'), data.get('issuingAuthority'),
-            data.get('issueDate'), data.get('expiryDate'), data.get('mobileNumber'),
-            data.get('altMobileNumber'), data.get('emailAddress'), data.get('altEmailAddress'),
-            data.get('postalAddress'), data.get('physicalAddress'), data.get('region'),
-            data.get('district'), data.get('ward'), data.get('street'), data.get('houseNumber'),
-            data.get('postalCode'), data.get('country'), data.get('gpsCoordinates'),
-            data.get('nextOfKinName'), data.get('nextOfKinRelationship'), data.get('nextOfKinMobileNumber'),
-            data.get('nextOfKinEmailAddress'), data.get('nextOfKinAddress'), data.get('nextOfKinRegion'),
-            data.get('nextOfKinDistrict'), data.get('nextOfKinWard'), data.get('nextOfKinStreet'),
-            data.get('nextOfKinHouseNumber'), data.get('nextOfKinPostalCode'), data.get('nextOfKinCountry'),
-            data.get('nextOfKinGpsCoordinates'), data.get('kycStatus'), data.get('kycDate'),
-            data.get('kycExpiryDate'), data.get('riskRating'), data.get('riskRatingDate'),
-            data.get('pepStatus'), data.get('pepClassification'), data.get('pepPosition'),
-            data.get('pepCountry'), data.get('pepRelationship'), data.get('sanctionsStatus'),
-            data.get('sanctionsList'), data.get('sanctionsDate'), data.get('sanctionsCountry'),
-            data.get('village'), record.source_timestamp
-        )
+    async def _stage_and_merge(self, conn, upsert: Upsert, rows: List[tuple]):
+        await conn.copy_records_to_table(upsert.stage, records=rows, columns=upsert.columns)
+        await conn.execute(upsert.merge)
     
-    async def _insert_asset_data(self, conn, record: DataRecord):
-        """Insert asset data record"""
-        data = record.data
-        
-        # Convert reportingDate and acquisitionDate from DDMMYYYYHHMM to TIMESTAMP
-        reporting_date = self._convert_ddmmyyyyhhmm_to_timestamp(data.get('reportingDate', ''))
-        acquisition_date = self._convert_ddmmyyyyhhmm_to_timestamp(data.get('acquisitionDate', ''))
-        
-        query = """
-            INSERT INTO bot_asset_owned_or_acquired (
-                endpoint_id, reporting_date, asset_category, asset_type, acquisition_date,
-                currency, org_cost_value, usd_cost_value, tzs_cost_value, allowance_probable_loss,
-                bot_provision, source_timestamp
-            ) VALUES (
-                $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12
+    def _compile_statements(self) -> Dict[str, Upsert]:
+        """Staging merge and compiled record/batch parameter extractors per mapped source table"""
+        statements = {}
+        for table, (conflict, updates, converted) in UPSERTS.items():
+            mapping = mappings.TABLES[table]
+            columns = ["endpoint_id"] + mapping.target_columns() + ["source_timestamp"]
+            stage = f"stage_{mapping.target_table}"
+            update_set = ",\n                ".join(
+                ["updated_at = CURRENT_TIMESTAMP"] + [f"{col} = EXCLUDED.{col}" for col in updates]
+            )
+            # The last staged row per conflict key wins, as with row-by-row upserts;
+            # rows with a NULL key never conflict, so they stay distinct
+            null_key = " OR ".join(f"{col} IS NULL" for col in conflict)
+            distinct = ", ".join(conflict) + f", CASE WHEN {null_key} THEN {STAGE_ROW} END"
+            merge = f"""
+            INSERT INTO {mapping.target_table} (
+                {", ".join(columns)}
             )
-            ON CONFLICT (endpoint_id, asset_category, reporting_date)
+            SELECT DISTINCT ON ({distinct})
+                {", ".join(columns)}
+            FROM {stage}
+            ORDER BY {distinct}, {STAGE_ROW} DESC
+            ON CONFLICT ({", ".join(conflict)})
             DO UPDATE SET
-                updated_at = CURRENT_TIMESTAMP,
-                org_cost_value = EXCLUDED.org_cost_value
+                {update_set}
         """
-        
-        await conn.execute(query,
-            record.endpoint_id, reporting_date, data.get('assetCategory'),
-            data.get('assetType'), acquisition_date, data.get('currency'),
-            data.get('orgCostValue'), data.get('usdCostValue'), data.get('tzsCostValue'),
-            data.get('allowanceProbableLoss'), data.get('botProvision'),
-            record.source_timestamp
-        )
+            create_stage = f"""
+            CREATE TEMP TABLE IF NOT EXISTS {stage} ON COMMIT DELETE ROWS AS
+            SELECT 0::BIGINT AS {STAGE_ROW}, {", ".join(columns)}
+            FROM {mapping.target_table} WITH NO DATA
+        """
+            statements[table] = Upsert(
+                stage=stage,
+                create_stage=create_stage,
+                columns=(STAGE_ROW, *columns),
+                merge=merge,
+                params=mapping.compile_params(convert=converted),
+                batch_params=mapping.compile_batch_params(convert=converted),
+            )
+        return statements
     
     async def _log_processing(self, conn, endpoint_id: str, table_name: str, 
-                            success_count: int, failed_count: int):
+                            success_count: int, failed_count: int,
+                            error_message: Optional[str] = None):
         """Log processing results"""
         query = """
             INSERT INTO bot_processing_log (
-                endpoint_id, table_name, records_processed, records_failed
-            ) VALUES ($1, $2, $3, $4)
+                endpoint_id, table_name, records_processed, records_failed, error_message
+            ) VALUES ($1, $2, $3, $4, $5)
         """
         
-        await conn.execute(query, endpoint_id, table_name, success_count, failed_count)
+        await conn.execute(query, endpoint_id, table_name, success_count, failed_count, error_message)
     
     async def get_last_timestamp(self, endpoint_id: str, table: str) -> str:
         """Get last processed timestamp for incremental loading"""
@@ -0,0 +1,17 @@
+-- Optional change capture (POLL_MODE=cdc) for the CBS_SCHEMA source tables
+-- Triggers copy every inserted, updated or deleted row (mapped columns only)
+-- into <TABLE>_CJ; the poller reads it by CJ_SEQ and purges consumed entries.
+
+-- PERSONAL_DATA_INDIVIDUALS
+CREATE TABLE CBS_SCHEMA.PERSONAL_DATA_INDIVIDUALS_CJ AS (SELECT CUSTOMERIDENTIFICATIONNUMBER, FIRSTNAME, MIDDLENAMES, SURNAME, GENDER, DATEOFBIRTH, MARITALSTATUS, NUMBEROFDEPENDANTS, DISABILITYSTATUS, DISABILITYTYPE, CITIZENSHIP, NATIONALITY, RESIDENCE, RESIDENCESTATUS, EMPLOYMENTSTATUS, OCCUPATION, EMPLOYERNAME, EMPLOYERADDRESS, SECTOREMPLOYER, INCOMERANGE, EDUCATIONLEVEL, IDENTIFICATIONTYPE, IDENTIFICATIONNUMBER, ISSUINGCOUNTRY, ISSUINGAUTHORITY, ISSUEDATE, EXPIRYDATE, MOBILENUMBER, ALTMOBILENUMBER, EMAILADDRESS, ALTEMAILADDRESS, POSTALADDRESS, PHYSICALADDRESS, REGION, DISTRICT, WARD, STREET, HOUSENUMBER, POSTALCODE, COUNTRY, GPSCOORDINATES, NEXTOFKINNAME, NEXTOFKINRELATIONSHIP, NEXTOFKINMOBILENUMBER, NEXTOFKINEMAILADDRESS, NEXTOFKINADDRESS, NEXTOFKINREGION, NEXTOFKINDISTRICT, NEXTOFKINWARD, NEXTOFKINSTREET, NEXTOFKINHOUSENUMBER, NEXTOFKINPOSTALCODE, NEXTOFKINCOUNTRY, NEXTOFKINGPSCOORDINATES, KYCSTATUS, KYCDATE, KYCEXPIRYDATE, RISKRATING, RISKRATINGDATE, PEPSTATUS, PEPCLASSIFICATION, PEPPOSITION, PEPCOUNTRY, PEPRELATIONSHIP, SANCTIONSSTATUS, SANCTIONSLIST, SANCTIONSDATE, SANCTIONSCOUNTRY, VILLAGE FROM CBS_SCHEMA.PERSONAL_DATA_INDIVIDUALS) WITH NO DATA;
+ALTER TABLE CBS_SCHEMA.PERSONAL_DATA_INDIVIDUALS_CJ ADD COLUMN CJ_SEQ BIGINT NOT NULL GENERATED ALWAYS AS IDENTITY ADD COLUMN CJ_OP CHAR(1) NOT NULL ADD COLUMN CJ_AT TIMESTAMP NOT NULL WITH DEFAULT CURRENT TIMESTAMP ADD PRIMARY KEY (CJ_SEQ);
+CREATE TRIGGER CBS_SCHEMA.PERSONAL_DATA_INDIVIDUALS_CJ_I AFTER INSERT ON CBS_SCHEMA.PERSONAL_DATA_INDIVIDUALS REFERENCING NEW AS N FOR EACH ROW INSERT INTO CBS_SCHEMA.PERSONAL_DATA_INDIVIDUALS_CJ (CJ_OP, CUSTOMERIDENTIFICATIONNUMBER, FIRSTNAME, MIDDLENAMES, SURNAME, GENDER, DATEOFBIRTH, MARITALSTATUS, NUMBEROFDEPENDANTS, DISABILITYSTATUS, DISABILITYTYPE, CITIZENSHIP, NATIONALITY, RESIDENCE, RESIDENCESTATUS, EMPLOYMENTSTATUS, OCCUPATION, EMPLOYERNAME, EMPLOYERADDRESS, SECTOREMPLOYER, INCOMERANGE, EDUCATIONLEVEL, IDENTIFICATIONTYPE, IDENTIFICATIONNUMBER, ISSUINGCOUNTRY, ISSUINGAUTHORITY, ISSUEDATE, EXPIRYDATE, MOBILENUMBER, ALTMOBILENUMBER, EMAILADDRESS, ALTEMAILADDRESS, POSTALADDRESS, PHYSICALADDRESS, REGION, DISTRICT, WARD, STREET, HOUSENUMBER, POSTALCODE, COUNTRY, GPSCOORDINATES, NEXTOFKINNAME, NEXTOFKINRELATIONSHIP, NEXTOFKINMOBILENUMBER, NEXTOFKINEMAILADDRESS, NEXTOFKINADDRESS, NEXTOFKINREGION, NEXTOFKINDISTRICT, NEXTOFKINWARD, NEXTOFKINSTREET, NEXTOFKINHOUSENUMBER, NEXTOFKINPOSTALCODE, NEXTOFKINCOUNTRY, NEXTOFKINGPSCOORDINATES, KYCSTATUS, KYCDATE, KYCEXPIRYDATE, RISKRATING, RISKRATINGDATE, PEPSTATUS, PEPCLASSIFICATION, PEPPOSITION, PEPCOUNTRY, PEPRELATIONSHIP, SANCTIONSSTATUS, SANCTIONSLIST, SANCTIONSDATE, SANCTIONSCOUNTRY, VILLAGE) VALUES ('I', N.CUSTOMERIDENTIFICATIONNUMBER, N.FIRSTNAME, N.MIDDLENAMES, N.SURNAME, N.GENDER, N.DATEOFBIRTH, N.MARITALSTATUS, N.NUMBEROFDEPENDANTS, N.DISABILITYSTATUS, N.DISABILITYTYPE, N.CITIZENSHIP, N.NATIONALITY, N.RESIDENCE, N.RESIDENCESTATUS, N.EMPLOYMENTSTATUS, N.OCCUPATION, N.EMPLOYERNAME, N.EMPLOYERADDRESS, N.SECTOREMPLOYER, N.INCOMERANGE, N.EDUCATIONLEVEL, N.IDENTIFICATIONTYPE, N.IDENTIFICATIONNUMBER, N.ISSUINGCOUNTRY, N.ISSUINGAUTHORITY, N.ISSUEDATE, N.EXPIRYDATE, N.MOBILENUMBER, N.ALTMOBILENUMBER, N.EMAILADDRESS, N.ALTEMAILADDRESS, N.POSTALADDRESS, N.PHYSICALADDRESS, N.REGION, N.DISTRICT, N.WARD, N.STREET, N.HOUSENUMBER, N.POSTALCODE, N.COUNTRY, N.GPSCOORDINATES, N.NEXTOFKINNAME, N.NEXTOFKINRELATIONSHIP, N.NEXTOFKINMOBILENUMBER, N.NEXTOFKINEMAILADDRESS, N.NEXTOFKINADDRESS, N.NEXTOFKINREGION, N.NEXTOFKINDISTRICT, N.NEXTOFKINWARD, N.NEXTOFKINSTREET, N.NEXTOFKINHOUSENUMBER, N.NEXTOFKINPOSTALCODE, N.NEXTOFKINCOUNTRY, N.NEXTOFKINGPSCOORDINATES, N.KYCSTATUS, N.KYCDATE, N.KYCEXPIRYDATE, N.RISKRATING, N.RISKRATINGDATE, N.PEPSTATUS, N.PEPCLASSIFICATION, N.PEPPOSITION, N.PEPCOUNTRY, N.PEPRELATIONSHIP, N.SANCTIONSSTATUS, N.SANCTIONSLIST, N.SANCTIONSDATE, N.SANCTIONSCOUNTRY, N.VILLAGE);
+CREATE TRIGGER CBS_SCHEMA.PERSONAL_DATA_INDIVIDUALS_CJ_U AFTER UPDATE ON CBS_SCHEMA.PERSONAL_DATA_INDIVIDUALS REFERENCING NEW AS N FOR EACH ROW INSERT INTO CBS_SCHEMA.PERSONAL_DATA_INDIVIDUALS_CJ (CJ_OP, CUSTOMERIDENTIFICATIONNUMBER, FIRSTNAME, MIDDLENAMES, SURNAME, GENDER, DATEOFBIRTH, MARITALSTATUS, NUMBEROFDEPENDANTS, DISABILITYSTATUS, DISABILITYTYPE, CITIZENSHIP, NATIONALITY, RESIDENCE, RESIDENCESTATUS, EMPLOYMENTSTATUS, OCCUPATION, EMPLOYERNAME, EMPLOYERADDRESS, SECTOREMPLOYER, INCOMERANGE, EDUCATIONLEVEL, IDENTIFICATIONTYPE, IDENTIFICATIONNUMBER, ISSUINGCOUNTRY, ISSUINGAUTHORITY, ISSUEDATE, EXPIRYDATE, MOBILENUMBER, ALTMOBILENUMBER, EMAILADDRESS, ALTEMAILADDRESS, POSTALADDRESS, PHYSICALADDRESS, REGION, DISTRICT, WARD, STREET, HOUSENUMBER, POSTALCODE, COUNTRY, GPSCOORDINATES, NEXTOFKINNAME, NEXTOFKINRELATIONSHIP, NEXTOFKINMOBILENUMBER, NEXTOFKINEMAILADDRESS, NEXTOFKINADDRESS, NEXTOFKINREGION, NEXTOFKINDISTRICT, NEXTOFKINWARD, NEXTOFKINSTREET, NEXTOFKINHOUSENUMBER, NEXTOFKINPOSTALCODE, NEXTOFKINCOUNTRY, NEXTOFKINGPSCOORDINATES, KYCSTATUS, KYCDATE, KYCEXPIRYDATE, RISKRATING, RISKRATINGDATE, PEPSTATUS, PEPCLASSIFICATION, PEPPOSITION, PEPCOUNTRY, PEPRELATIONSHIP, SANCTIONSSTATUS, SANCTIONSLIST, SANCTIONSDATE, SANCTIONSCOUNTRY, VILLAGE) VALUES ('U', N.CUSTOMERIDENTIFICATIONNUMBER, N.FIRSTNAME, N.MIDDLENAMES, N.SURNAME, N.GENDER, N.DATEOFBIRTH, N.MARITALSTATUS, N.NUMBEROFDEPENDANTS, N.DISABILITYSTATUS, N.DISABILITYTYPE, N.CITIZENSHIP, N.NATIONALITY, N.RESIDENCE, N.RESIDENCESTATUS, N.EMPLOYMENTSTATUS, N.OCCUPATION, N.EMPLOYERNAME, N.EMPLOYERADDRESS, N.SECTOREMPLOYER, N.INCOMERANGE, N.EDUCATIONLEVEL, N.IDENTIFICATIONTYPE, N.IDENTIFICATIONNUMBER, N.ISSUINGCOUNTRY, N.ISSUINGAUTHORITY, N.ISSUEDATE, N.EXPIRYDATE, N.MOBILENUMBER, N.ALTMOBILENUMBER, N.EMAILADDRESS, N.ALTEMAILADDRESS, N.POSTALADDRESS, N.PHYSICALADDRESS, N.REGION, N.DISTRICT, N.WARD, N.STREET, N.HOUSENUMBER, N.POSTALCODE, N.COUNTRY, N.GPSCOORDINATES, N.NEXTOFKINNAME, N.NEXTOFKINRELATIONSHIP, N.NEXTOFKINMOBILENUMBER, N.NEXTOFKINEMAILADDRESS, N.NEXTOFKINADDRESS, N.NEXTOFKINREGION, N.NEXTOFKINDISTRICT, N.NEXTOFKINWARD, N.NEXTOFKINSTREET, N.NEXTOFKINHOUSENUMBER, N.NEXTOFKINPOSTALCODE, N.NEXTOFKINCOUNTRY, N.NEXTOFKINGPSCOORDINATES, N.KYCSTATUS, N.KYCDATE, N.KYCEXPIRYDATE, N.RISKRATING, N.RISKRATINGDATE, N.PEPSTATUS, N.PEPCLASSIFICATION, N.PEPPOSITION, N.PEPCOUNTRY, N.PEPRELATIONSHIP, N.SANCTIONSSTATUS, N.SANCTIONSLIST, N.SANCTIONSDATE, N.SANCTIONSCOUNTRY, N.VILLAGE);
+CREATE TRIGGER CBS_SCHEMA.PERSONAL_DATA_INDIVIDUALS_CJ_D AFTER DELETE ON CBS_SCHEMA.PERSONAL_DATA_INDIVIDUALS REFERENCING OLD AS O FOR EACH ROW INSERT INTO CBS_SCHEMA.PERSONAL_DATA_INDIVIDUALS_CJ (CJ_OP, CUSTOMERIDENTIFICATIONNUMBER, FIRSTNAME, MIDDLENAMES, SURNAME, GENDER, DATEOFBIRTH, MARITALSTATUS, NUMBEROFDEPENDANTS, DISABILITYSTATUS, DISABILITYTYPE, CITIZENSHIP, NATIONALITY, RESIDENCE, RESIDENCESTATUS, EMPLOYMENTSTATUS, OCCUPATION, EMPLOYERNAME, EMPLOYERADDRESS, SECTOREMPLOYER, INCOMERANGE, EDUCATIONLEVEL, IDENTIFICATIONTYPE, IDENTIFICATIONNUMBER, ISSUINGCOUNTRY, ISSUINGAUTHORITY, ISSUEDATE, EXPIRYDATE, MOBILENUMBER, ALTMOBILENUMBER, EMAILADDRESS, ALTEMAILADDRESS, POSTALADDRESS, PHYSICALADDRESS, REGION, DISTRICT, WARD, STREET, HOUSENUMBER, POSTALCODE, COUNTRY, GPSCOORDINATES, NEXTOFKINNAME, NEXTOFKINRELATIONSHIP, NEXTOFKINMOBILENUMBER, NEXTOFKINEMAILADDRESS, NEXTOFKINADDRESS, NEXTOFKINREGION, NEXTOFKINDISTRICT, NEXTOFKINWARD, NEXTOFKINSTREET, NEXTOFKINHOUSENUMBER, NEXTOFKINPOSTALCODE, NEXTOFKINCOUNTRY, NEXTOFKINGPSCOORDINATES, KYCSTATUS, KYCDATE, KYCEXPIRYDATE, RISKRATING, RISKRATINGDATE, PEPSTATUS, PEPCLASSIFICATION, PEPPOSITION, PEPCOUNTRY, PEPRELATIONSHIP, SANCTIONSSTATUS, SANCTIONSLIST, SANCTIONSDATE, SANCTIONSCOUNTRY, VILLAGE) VALUES ('D', O.CUSTOMERIDENTIFICATIONNUMBER, O.FIRSTNAME, O.MIDDLENAMES, O.SURNAME, O.GENDER, O.DATEOFBIRTH, O.MARITALSTATUS, O.NUMBEROFDEPENDANTS, O.DISABILITYSTATUS, O.DISABILITYTYPE, O.CITIZENSHIP, O.NATIONALITY, O.RESIDENCE, O.RESIDENCESTATUS, O.EMPLOYMENTSTATUS, O.OCCUPATION, O.EMPLOYERNAME, O.EMPLOYERADDRESS, O.SECTOREMPLOYER, O.INCOMERANGE, O.EDUCATIONLEVEL, O.IDENTIFICATIONTYPE, O.IDENTIFICATIONNUMBER, O.ISSUINGCOUNTRY, O.ISSUINGAUTHORITY, O.ISSUEDATE, O.EXPIRYDATE, O.MOBILENUMBER, O.ALTMOBILENUMBER, O.EMAILADDRESS, O.ALTEMAILADDRESS, O.POSTALADDRESS, O.PHYSICALADDRESS, O.REGION, O.DISTRICT, O.WARD, O.STREET, O.HOUSENUMBER, O.POSTALCODE, O.COUNTRY, O.GPSCOORDINATES, O.NEXTOFKINNAME, O.NEXTOFKINRELATIONSHIP, O.NEXTOFKINMOBILENUMBER, O.NEXTOFKINEMAILADDRESS, O.NEXTOFKINADDRESS, O.NEXTOFKINREGION, O.NEXTOFKINDISTRICT, O.NEXTOFKINWARD, O.NEXTOFKINSTREET, O.NEXTOFKINHOUSENUMBER, O.NEXTOFKINPOSTALCODE, O.NEXTOFKINCOUNTRY, O.NEXTOFKINGPSCOORDINATES, O.KYCSTATUS, O.KYCDATE, O.KYCEXPIRYDATE, O.RISKRATING, O.RISKRATINGDATE, O.PEPSTATUS, O.PEPCLASSIFICATION, O.PEPPOSITION, O.PEPCOUNTRY, O.PEPRELATIONSHIP, O.SANCTIONSSTATUS, O.SANCTIONSLIST, O.SANCTIONSDATE, O.SANCTIONSCOUNTRY, O.VILLAGE);
+
+-- ASSET_OWNED_OR_ACQUIRED
+CREATE TABLE CBS_SCHEMA.ASSET_OWNED_OR_ACQUIRED_CJ AS (SELECT ASSETCATEGORY, ASSETTYPE, ACQUISITIONDATE, CURRENCY, ORGCOSTVALUE, USDCOSTVALUE, TZSCOSTVALUE, ALLOWANCEPROBABLELOSS, BOTPROVISION FROM CBS_SCHEMA.ASSET_OWNED_OR_ACQUIRED) WITH NO DATA;
+ALTER TABLE CBS_SCHEMA.ASSET_OWNED_OR_ACQUIRED_CJ ADD COLUMN CJ_SEQ BIGINT NOT NULL GENERATED ALWAYS AS IDENTITY ADD COLUMN CJ_OP CHAR(1) NOT NULL ADD COLUMN CJ_AT TIMESTAMP NOT NULL WITH DEFAULT CURRENT TIMESTAMP ADD PRIMARY KEY (CJ_SEQ);
+CREATE TRIGGER CBS_SCHEMA.ASSET_OWNED_OR_ACQUIRED_CJ_I AFTER INSERT ON CBS_SCHEMA.ASSET_OWNED_OR_ACQUIRED REFERENCING NEW AS N FOR EACH ROW INSERT INTO CBS_SCHEMA.ASSET_OWNED_OR_ACQUIRED_CJ (CJ_OP, ASSETCATEGORY, ASSETTYPE, ACQUISITIONDATE, CURRENCY, ORGCOSTVALUE, USDCOSTVALUE, TZSCOSTVALUE, ALLOWANCEPROBABLELOSS, BOTPROVISION) VALUES ('I', N.ASSETCATEGORY, N.ASSETTYPE, N.ACQUISITIONDATE, N.CURRENCY, N.ORGCOSTVALUE, N.USDCOSTVALUE, N.TZSCOSTVALUE, N.ALLOWANCEPROBABLELOSS, N.BOTPROVISION);
+CREATE TRIGGER CBS_SCHEMA.ASSET_OWNED_OR_ACQUIRED_CJ_U AFTER UPDATE ON CBS_SCHEMA.ASSET_OWNED_OR_ACQUIRED REFERENCING NEW AS N FOR EACH ROW INSERT INTO CBS_SCHEMA.ASSET_OWNED_OR_ACQUIRED_CJ (CJ_OP, ASSETCATEGORY, ASSETTYPE, ACQUISITIONDATE, CURRENCY, ORGCOSTVALUE, USDCOSTVALUE, TZSCOSTVALUE, ALLOWANCEPROBABLELOSS, BOTPROVISION) VALUES ('U', N.ASSETCATEGORY, N.ASSETTYPE, N.ACQUISITIONDATE, N.CURRENCY, N.ORGCOSTVALUE, N.USDCOSTVALUE, N.TZSCOSTVALUE, N.ALLOWANCEPROBABLELOSS, N.BOTPROVISION);
+CREATE TRIGGER CBS_SCHEMA.ASSET_OWNED_OR_ACQUIRED_CJ_D AFTER DELETE ON CBS_SCHEMA.ASSET_OWNED_OR_ACQUIRED REFERENCING OLD AS O FOR EACH ROW INSERT INTO CBS_SCHEMA.ASSET_OWNED_OR_ACQUIRED_CJ (CJ_OP, ASSETCATEGORY, ASSETTYPE, ACQUISITIONDATE, CURRENCY, ORGCOSTVALUE, USDCOSTVALUE, TZSCOSTVALUE, ALLOWANCEPROBABLELOSS, BOTPROVISION) VALUES ('D', O.ASSETCATEGORY, O.ASSETTYPE, O.ACQUISITIONDATE, O.CURRENCY, O.ORGCOSTVALUE, O.USDCOSTVALUE, O.TZSCOSTVALUE, O.ALLOWANCEPROBABLELOSS, O.BOTPROVISION);
@@ -95,6 +95,10 @@ CREATE TABLE CBS_SCHEMA.ASSET_OWNED_OR_ACQUIRED (
 );
 
 
+-- Keyset pagination scans these in (CREATEDDATE, row id) order
+CREATE INDEX CBS_SCHEMA.IDX_PDI_CREATEDDATE ON CBS_SCHEMA.PERSONAL_DATA_INDIVIDUALS (CREATEDDATE);
+CREATE INDEX CBS_SCHEMA.IDX_AOA_CREATEDDATE ON CBS_SCHEMA.ASSET_OWNED_OR_ACQUIRED (CREATEDDATE);
+
 -- Insert sample data into ASSET_OWNED_OR_ACQUIRED table
 INSERT INTO CBS_SCHEMA.ASSET_OWNED_OR_ACQUIRED VALUES 
 ('290920251130', 'C001', 'Fixed Asset', '290920251130', 'TZS', 50000.00, 50000.00, 116000000.00, 0.00, 0.00, CURRENT_TIMESTAMP);
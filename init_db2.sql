@@ -94,6 +94,10 @@ CREATE TABLE
         CREATEDDATE TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
     );
 
+-- Keyset pagination scans these in (CREATEDDATE, row id) order
+CREATE INDEX CBS_SCHEMA.IDX_PDI_CREATEDDATE ON CBS_SCHEMA.PERSONAL_DATA_INDIVIDUALS (CREATEDDATE);
+CREATE INDEX CBS_SCHEMA.IDX_AOA_CREATEDDATE ON CBS_SCHEMA.ASSET_OWNED_OR_ACQUIRED (CREATEDDATE);
+
 -- Insert sample data into ASSET_OWNED_OR_ACQUIRED table
 INSERT INTO
     CBS_SCHEMA.ASSET_OWNED_OR_ACQUIRED
@@ -170,6 +170,52 @@ def get_polling_metrics():
             # Fallback to current time
             metrics["last_poll_time"] = datetime.now().isoformat()
 
+        # Adaptive poll schedule per table (interval, change rate, lag)
+        try:
+            cursor.execute(
+                """
+                SELECT COUNT(*) FROM information_schema.tables 
+                WHERE table_name = 'poller_schedule'
+            """
+            )
+            result = cursor.fetchone()
+            if result and result[0] > 0:
+                cursor.execute(
+                    "SELECT table_name, interval_seconds, change_rate, lag_seconds FROM poller_schedule"
+                )
+                metrics["schedule"] = {
+                    row[0]: {
+                        "interval_seconds": row[1],
+                        "change_rate": row[2],
+                        "lag_seconds": row[3],
+                    }
+                    for row in cursor.fetchall()
+                }
+        except Exception as e:
+            logger.error(f"Error getting poll schedule: {e}")
+
+        # Dead-lettered rows waiting for replay per table and stage
+        try:
+            cursor.execute(
+                """
+                SELECT COUNT(*) FROM information_schema.tables 
+                WHERE table_name = 'poller_dead_letters'
+            """
+            )
+            result = cursor.fetchone()
+            if result and result[0] > 0:
+                cursor.execute(
+                    """
+                    SELECT table_name, stage, COUNT(*) FROM poller_dead_letters
+                    WHERE replayed_at IS NULL GROUP BY table_name, stage
+                    """
+                )
+                metrics["dead_letters"] = {
+                    f"{row[0]}/{row[1]}": row[2] for row in cursor.fetchall()
+                }
+        except Exception as e:
+            logger.error(f"Error getting dead-letter depth: {e}")
+
         cursor.close()
         pg_conn.close()
     except Exception as e:
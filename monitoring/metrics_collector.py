@@ -92,6 +92,69 @@ class MCBMetricsCollector:
             buckets=[0.01, 0.05, 0.1, 0.5, 1.0, 2.0, 5.0]
         )
         
+        self.db2_pool_wait_duration = Histogram(
+            'mcb_db2_pool_wait_seconds',
+            'Time spent waiting to check out a pooled DB2 connection',
+            ['endpoint_id'],
+            buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0]
+        )
+        
+        self.db2_pool_connections = Gauge(
+            'mcb_db2_pool_connections',
+            'Pooled DB2 connections by state',
+            ['endpoint_id', 'state']
+        )
+        
+        self.db2_throttle_level = Gauge(
+            'mcb_db2_throttle_level',
+            'DB2 load governor level (1=full throughput)',
+            ['endpoint_id']
+        )
+        
+        self.db2_statement_cache_total = Counter(
+            'mcb_db2_statement_cache_total',
+            'Prepared DB2 statement cache lookups',
+            ['endpoint_id', 'result']
+        )
+        
+        # Poll scheduler metrics
+        self.poll_interval = Gauge(
+            'mcb_poll_interval_seconds',
+            'Interval the poll scheduler chose for a source table',
+            ['table_name']
+        )
+        
+        self.poll_lag = Gauge(
+            'mcb_poll_lag_seconds',
+            'Age of the newest committed row of a source table',
+            ['table_name']
+        )
+        
+        self.poll_change_rate = Gauge(
+            'mcb_poll_change_rate',
+            'Estimated new rows per second of a source table',
+            ['table_name']
+        )
+        
+        # Reference-data cache metrics
+        self.reference_lookups_total = Counter(
+            'mcb_reference_lookups_total',
+            'Reference-data cache lookups of non-empty codes',
+            ['domain', 'result']
+        )
+        
+        self.reference_reload_duration = Histogram(
+            'mcb_reference_reload_seconds',
+            'Time spent reloading reference data',
+            ['source'],
+            buckets=[0.001, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0]
+        )
+        
+        self.reference_entries = Gauge(
+            'mcb_reference_entries',
+            'Entries held by the reference-data cache'
+        )
+        
         # Data quality metrics
         self.validation_errors_total = Counter(
             'mcb_validation_errors_total',
@@ -105,6 +168,12 @@ class MCBMetricsCollector:
             ['endpoint_id', 'table_name', 'transformation_type']
         )
         
+        self.dead_letter_depth = Gauge(
+            'mcb_dead_letter_depth',
+            'Dead-lettered rows waiting for replay',
+            ['table_name', 'stage']
+        )
+        
         # Endpoint status metrics
         self.endpoint_last_success_timestamp = Gauge(
             'mcb_endpoint_last_success_timestamp',
@@ -124,6 +193,13 @@ class MCBMetricsCollector:
             'Number of items in processing queue'
         )
         
+        self.endpoint_queue_wait = Histogram(
+            'mcb_endpoint_queue_wait_seconds',
+            'Time a due poll job waited for a concurrency slot',
+            ['endpoint_id'],
+            buckets=[0.01, 0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 300.0]
+        )
+        
         # BOT submission metrics
         self.bot_submissions_total = Counter(
             'mcb_bot_submissions_total',
@@ -234,14 +310,66 @@ class MCBMetricsCollector:
             
             self.endpoint_metrics[endpoint_id].connection_failures += 1
     
+    def record_db2_pool_wait(self, endpoint_id: str, wait: float,
+                             pool_stats: Optional[Dict[str, Any]] = None):
+        """Record DB2 pool checkout wait time and pool occupancy"""
+        self.db2_pool_wait_duration.labels(endpoint_id=endpoint_id).observe(wait)
+        
+        if pool_stats:
+            for state in ('in_use', 'idle'):
+                self.db2_pool_connections.labels(
+                    endpoint_id=endpoint_id,
+                    state=state
+                ).set(pool_stats[state])
+    
+    def record_db2_throttle_level(self, endpoint_id: str, level: float):
+        """Record the current DB2 load governor throttle level"""
+        self.db2_throttle_level.labels(endpoint_id=endpoint_id).set(level)
+    
+    def record_db2_statement_lookup(self, endpoint_id: str, hit: bool):
+        """Record a prepared statement cache hit or miss"""
+        self.db2_statement_cache_total.labels(
+            endpoint_id=endpoint_id,
+            result='hit' if hit else 'miss'
+        ).inc()
+    
+    def record_poll_schedule(self, schedule: Dict[str, Dict[str, float]]):
+        """Record the poll scheduler's per-table interval, lag and change rate"""
+        for table_name, state in schedule.items():
+            self.poll_interval.labels(table_name=table_name).set(state['interval_seconds'])
+            self.poll_lag.labels(table_name=table_name).set(state['lag_seconds'])
+            self.poll_change_rate.labels(table_name=table_name).set(state['change_rate'])
+    
+    def record_reference_lookups(self, domain: str, hits: int, misses: int):
+        """Record reference-data cache hits and misses for one batch column"""
+        self.reference_lookups_total.labels(domain=domain, result='hit').inc(hits)
+        self.reference_lookups_total.labels(domain=domain, result='miss').inc(misses)
+    
+    def record_reference_reload(self, source: str, duration: float, entries: int):
+        """Record a reference-data reload from the database or a shared snapshot"""
+        self.reference_reload_duration.labels(source=source).observe(duration)
+        self.reference_entries.set(entries)
+    
+    def record_endpoint_queue_wait(self, endpoint_id: str, wait: float):
+        """Record how long an endpoint's poll job waited in the scheduler queue"""
+        self.endpoint_queue_wait.labels(endpoint_id=endpoint_id).observe(wait)
+    
     def record_validation_error(self, endpoint_id: str, table_name: str, 
-                              validation_type: str):
-        """Record data validation error"""
+                              validation_type: str, count: int = 1):
+        """Record data validation errors (count rows failing one rule)"""
         self.validation_errors_total.labels(
             endpoint_id=endpoint_id,
             table_name=table_name,
             validation_type=validation_type
-        ).inc()
+        ).inc(count)
+    
+    def record_dead_letter_depth(self, depth: Dict[str, int]):
+        """Record rows waiting for replay, keyed "table/stage" as in poll_metrics"""
+        # Replaced as a whole so a drained table/stage drops back out
+        self.dead_letter_depth.clear()
+        for key, count in depth.items():
+            table_name, _, stage = key.partition('/')
+            self.dead_letter_depth.labels(table_name=table_name, stage=stage).set(count)
     
     def record_transformation_error(self, endpoint_id: str, table_name: str,
                                   transformation_type: str):
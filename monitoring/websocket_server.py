@@ -136,6 +136,30 @@ def get_polling_metrics():
                 if result:
                     metrics["records_processed"]["asset_owned_or_acquired"] = result[0]
 
+            # Adaptive poll schedule per table (interval, change rate, lag)
+            try:
+                cursor.execute(
+                    """
+                    SELECT COUNT(*) FROM information_schema.tables 
+                    WHERE table_name = 'poller_schedule'
+                """
+                )
+                result = cursor.fetchone()
+                if result and result[0] > 0:
+                    cursor.execute(
+                        "SELECT table_name, interval_seconds, change_rate, lag_seconds FROM poller_schedule"
+                    )
+                    metrics["schedule"] = {
+                        row[0]: {
+                            "interval_seconds": row[1],
+                            "change_rate": row[2],
+                            "lag_seconds": row[3],
+                        }
+                        for row in cursor.fetchall()
+                    }
+            except Exception as e:
+                logger.error(f"Error getting poll schedule: {e}")
+
             cursor.close()
             pg_conn.close()
     except Exception as e:
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Trigger-based change capture for MCB Data Integration
+Reads per-table change journals by sequence number and purges consumed changes
+"""
+
+import sqlite3
+import logging
+from contextlib import nullcontext
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from pipeline import db2_fetch, keyset
+
+logger = logging.getLogger(__name__)
+
+# Journal table per source table, filled by AFTER INSERT/UPDATE/DELETE triggers
+JOURNAL_SUFFIX = "_CJ"
+SEQ_COLUMN = "CJ_SEQ"
+OP_COLUMN = "CJ_OP"
+AT_COLUMN = "CJ_AT"
+
+OPERATIONS = {"INSERT": ("I", "NEW"), "UPDATE": ("U", "NEW"), "DELETE": ("D", "OLD")}
+
+# sqlite default producing DB2 timestamps (YYYY-MM-DD-HH.MM.SS.FFFFFF); %f is SS.SSS
+SQLITE_DB2_NOW = "(strftime('%Y-%m-%d-%H.%M.%f', 'now') || '000')"
+
+
+def journal_table(table: str) -> str:
+    """Journal table name for a source table"""
+    return f"{table}{JOURNAL_SUFFIX}"
+
+
+def build_read_query(table: str, columns: str, page_size: int, schema: str = keyset.SCHEMA,
+                     limit: str = "FETCH FIRST {n} ROWS ONLY") -> str:
+    """Next page of journal entries after a sequence number; columns may reference T"""
+    prefix = f"{schema}." if schema else ""
+    return f"""
+        SELECT T.{SEQ_COLUMN}, T.{OP_COLUMN}, T.{AT_COLUMN}, {columns}
+        FROM {prefix}{journal_table(table)} T
+        WHERE T.{SEQ_COLUMN} > ?
+        ORDER BY T.{SEQ_COLUMN}
+        {limit.format(n=page_size)}
+    """
+
+
+def build_purge_query(table: str, schema: str = keyset.SCHEMA) -> str:
+    """Delete journal entries up to and including a sequence number"""
+    prefix = f"{schema}." if schema else ""
+    return f"DELETE FROM {prefix}{journal_table(table)} WHERE {SEQ_COLUMN} <= ?"
+
+
+def journal_ddl(table: str, columns: Sequence[str], schema: str = keyset.SCHEMA) -> List[str]:
+    """DB2 statements creating the journal table and its capture triggers"""
+    source = f"{schema}.{table}"
+    journal = f"{schema}.{journal_table(table)}"
+    column_list = ", ".join(columns)
+    statements = [
+        f"CREATE TABLE {journal} AS (SELECT {column_list} FROM {source}) WITH NO DATA",
+        f"ALTER TABLE {journal}"
+        f" ADD COLUMN {SEQ_COLUMN} BIGINT NOT NULL GENERATED ALWAYS AS IDENTITY"
+        f" ADD COLUMN {OP_COLUMN} CHAR(1) NOT NULL"
+        f" ADD COLUMN {AT_COLUMN} TIMESTAMP NOT NULL WITH DEFAULT CURRENT TIMESTAMP"
+        f" ADD PRIMARY KEY ({SEQ_COLUMN})",
+    ]
+    for event, (op, image) in OPERATIONS.items():
+        values = ", ".join(f"{image[0]}.{col}" for col in columns)
+        statements.append(
+            f"CREATE TRIGGER {schema}.{journal_table(table)}_{op} AFTER {event} ON {source}"
+            f" REFERENCING {image} AS {image[0]} FOR EACH ROW"
+            f" INSERT INTO {journal} ({OP_COLUMN}, {column_list}) VALUES ('{op}', {values})"
+        )
+    return statements
+
+
+class DB2ChangeJournal:
+    """Change journal tables in DB2, read through a pooled connection"""
+
+    def __init__(self, conn, statements=None):
+        self.conn = conn
+        self.statements = statements
+
+    def _prepare(self, query: str):
+        stmt = self.statements.prepare(query) if self.statements else db2_fetch.prepare(self.conn, query)
+        if not stmt:
+            raise RuntimeError(f"Failed to prepare change journal query: {query.split()[0]}")
+        return stmt
+
+    def read(self, table: str, columns: str, after_seq: int, page_size: int,
+             max_bytes: int = 0) -> Tuple[Dict[str, int], List[tuple]]:
+        """Journal entries after after_seq, oldest first"""
+        import ibm_db
+        stmt = self._prepare(build_read_query(table, columns, page_size))
+        if ibm_db.execute(stmt, (after_seq,)) is False:
+            raise RuntimeError(f"Change journal read failed for {table}")
+        try:
+            positions = db2_fetch.column_positions(stmt)
+            rows = next(db2_fetch.iter_chunks(stmt, page_size, max_bytes), [])
+        finally:
+            ibm_db.free_result(stmt)
+        return positions, rows
+
+    def purge(self, table: str, upto_seq: int) -> int:
+        """Delete consumed journal entries (autocommit)"""
+        import ibm_db
+        stmt = self._prepare(build_purge_query(table))
+        if ibm_db.execute(stmt, (upto_seq,)) is False:
+            raise RuntimeError(f"Change journal purge failed for {table}")
+        return ibm_db.num_rows(stmt)
+
+
+class SQLiteChangeJournal:
+    """Local stand-in for DB2 change journals backed by sqlite3
+
+    install() creates a source table and a journal filled by sqlite triggers
+    that mirror the DB2 ones, so the read/purge cycle can be exercised without
+    a DB2 instance.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.conn = sqlite3.connect(path)
+
+    def install(self, table: str, columns: Sequence[str]):
+        column_list = ", ".join(columns)
+        journal = journal_table(table)
+        self.conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ({column_list}, "
+            f"CREATEDDATE TEXT DEFAULT {SQLITE_DB2_NOW})"
+        )
+        self.conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {journal} ("
+            f"{SEQ_COLUMN} INTEGER PRIMARY KEY AUTOINCREMENT, {OP_COLUMN} TEXT NOT NULL, "
+            f"{AT_COLUMN} TEXT DEFAULT {SQLITE_DB2_NOW}, {column_list})"
+        )
+        for event, (op, image) in OPERATIONS.items():
+            values = ", ".join(f"{image}.{col}" for col in columns)
+            self.conn.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {journal}_{op} AFTER {event} ON {table} "
+                f"BEGIN INSERT INTO {journal} ({OP_COLUMN}, {column_list}) "
+                f"VALUES ('{op}', {values}); END"
+            )
+        self.conn.commit()
+
+    def read(self, table: str, columns: str, after_seq: int, page_size: int,
+             max_bytes: int = 0) -> Tuple[Dict[str, int], List[tuple]]:
+        cur = self.conn.execute(
+            build_read_query(table, columns, page_size, schema="", limit="LIMIT {n}"), (after_seq,)
+        )
+        positions = {d[0].upper(): i for i, d in enumerate(cur.description)}
+        return positions, cur.fetchall()
+
+    def purge(self, table: str, upto_seq: int) -> int:
+        cur = self.conn.execute(build_purge_query(table, schema=""), (upto_seq,))
+        self.conn.commit()
+        return cur.rowcount
+
+
+def iter_changes(journal, table: str, columns: str, cursor: keyset.KeysetCursor, page_size: int,
+                 max_bytes: int = 0, governor=None
+                 ) -> Iterator[Tuple[Dict[str, int], List[tuple], keyset.KeysetCursor]]:
+    """Yield (positions, rows, cursor) pages of journal entries after cursor.key
+
+    The cursor key is the journal sequence number. A page is purged from the
+    journal only when the consumer asks for the next one, i.e. after it has
+    committed the page and its checkpoint; entries are never purged unread.
+    An optional LoadGovernor sizes and times each journal read.
+    """
+    while True:
+        size = governor.page_size() if governor else page_size
+        with governor.query() if governor else nullcontext():
+            positions, rows = journal.read(table, columns, cursor.key, size, max_bytes)
+        if not rows:
+            return
+        last = rows[-1]
+        cursor = keyset.KeysetCursor.from_row(last[positions[AT_COLUMN]], last[positions[SEQ_COLUMN]])
+        yield positions, rows, cursor
+        purged = journal.purge(table, cursor.key)
+        logger.debug(f"Purged {purged} consumed {journal_table(table)} entries")
+        if len(rows) < size:
+            return
+
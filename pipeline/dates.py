@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+DDMMYYYYHHMM date parsing for MCB Data Integration
+Memoized, column-at-a-time conversion of BOT source date strings
+"""
+
+import os
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+# Distinct date strings kept parsed; reporting and KYC dates repeat heavily
+CACHE_SIZE = int(os.getenv("DATE_PARSE_CACHE_SIZE", "4096"))
+
+DATE_LENGTH = 12
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse(value: str) -> Optional[datetime]:
+    try:
+        return datetime(
+            int(value[4:8]), int(value[2:4]), int(value[0:2]),
+            int(value[8:10]), int(value[10:12])
+        )
+    except ValueError:
+        # Well-formed digits but not a real date, e.g. 31022025...
+        return None
+
+
+def parse_ddmmyyyyhhmm(value: Any) -> Optional[datetime]:
+    """Convert a DDMMYYYYHHMM string to a datetime, or None if malformed
+
+    Wrong-length and non-digit values are rejected before the cache so junk
+    input neither costs a parse attempt nor evicts real dates.
+    """
+    if value.__class__ is not str or len(value) != DATE_LENGTH or not value.isdigit():
+        return None
+    return _parse(value)
+
+
+def parse_column(values: Iterable[Any]) -> List[Optional[datetime]]:
+    """Parse a whole column of a batch, one result per input value
+
+    Each distinct value in the batch is looked up once; the shared cache
+    then only sees the batch's distinct values.
+    """
+    seen: Dict[Any, Optional[datetime]] = {}
+    parse = parse_ddmmyyyyhhmm
+    result = []
+    append = result.append
+    for value in values:
+        try:
+            append(seen[value])
+        except KeyError:
+            parsed = seen[value] = parse(value)
+            append(parsed)
+    return result
+
+
+def parse_columns(rows: Sequence[Dict[str, Any]], keys: Sequence[str]):
+    """Replace the DDMMYYYYHHMM values under keys in a batch of dict rows, in place"""
+    for key in keys:
+        for row, parsed in zip(rows, parse_column([row.get(key) for row in rows])):
+            row[key] = parsed
+
+
+def cache_info():
+    """Hit/miss counters of the shared parse cache"""
+    return _parse.cache_info()
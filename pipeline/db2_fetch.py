@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+DB2 bulk fetch helpers for MCB Data Integration
+Tuple-based row fetching with precomputed column positions
+
+ibm_db is imported by the functions that talk to DB2, so the query builders
+and row readers also work where the driver is not installed.
+"""
+
+import os
+import logging
+from typing import Dict, Any, Callable, Iterator, List, Optional, Sequence, Set, Tuple
+logger = logging.getLogger(__name__)
+
+# Rows DB2 ships to the client per network block (CLI BlockForNRows), so
+# fetch_tuple is served from the local block instead of a round trip per row
+DEFAULT_BLOCK_FETCH_ROWS = int(os.getenv("DB2_BLOCK_FETCH_ROWS", "1000"))
+
+
+def block_fetch_keywords(block_rows: int = DEFAULT_BLOCK_FETCH_ROWS) -> str:
+    """CLI connection string keywords enabling DB2 block fetch"""
+    if block_rows <= 0:
+        return ""
+    return f"BlockForNRows={block_rows};"
+
+
+def statement_options() -> Dict[int, Any]:
+    """Statement options for forward-only bulk cursors (block fetch eligible)"""
+    import ibm_db
+    return {ibm_db.SQL_ATTR_CURSOR_TYPE: ibm_db.SQL_CURSOR_FORWARD_ONLY}
+
+
+def prepare(conn, query: str):
+    """Prepare a bulk fetch statement, falling back to driver defaults"""
+    import ibm_db
+    try:
+        return ibm_db.prepare(conn, query, statement_options())
+    except Exception as e:
+        # Older drivers reject some statement attributes; plain prepare still works
+        logger.warning(f"Bulk fetch statement options rejected, using defaults: {e}")
+        return ibm_db.prepare(conn, query)
+
+
+def column_positions(stmt) -> Dict[str, int]:
+    """Map upper-cased result column names to their tuple positions"""
+    import ibm_db
+    positions = {}
+    for i in range(ibm_db.num_fields(stmt)):
+        name = ibm_db.field_name(stmt, i)
+        if name:
+            positions[name.upper()] = i
+    return positions
+
+
+def row_reader(positions: Dict[str, int],
+               mapping: Sequence[Tuple[str, str]]) -> Callable[[tuple], Dict[str, Any]]:
+    """Build a tuple -> dict reader for (key, SOURCE_COLUMN) pairs
+
+    Columns missing from the result set read as None, matching the old
+    per-column ``ibm_db.result`` behaviour.
+    """
+    present = [(key, positions[col]) for key, col in mapping if col in positions]
+    missing = [key for key, col in mapping if col not in positions]
+    if missing:
+        logger.warning(f"Result set is missing columns for: {', '.join(missing)}")
+
+    def read(row: tuple) -> Dict[str, Any]:
+        record = {key: row[pos] for key, pos in present}
+        for key in missing:
+            record[key] = None
+        return record
+
+    return read
+
+
+def select_list(mapping: Sequence[Tuple[str, str]], alias: str = "T") -> str:
+    """SELECT column list holding exactly the mapped source columns"""
+    return ", ".join(f"{alias}.{col}" for _, col in mapping)
+
+
+def catalog_columns(conn, schema: str, table: str) -> Optional[Set[str]]:
+    """Column names of a table from SYSCAT.COLUMNS, or None if the catalog is unreadable"""
+    import ibm_db
+    try:
+        stmt = prepare(conn, "SELECT COLNAME FROM SYSCAT.COLUMNS WHERE TABSCHEMA = ? AND TABNAME = ?")
+        if not stmt or ibm_db.execute(stmt, (schema.upper(), table.upper())) is False:
+            return None
+        try:
+            return {row[0].upper() for row in iter_tuples(stmt)}
+        finally:
+            ibm_db.free_result(stmt)
+    except Exception as e:
+        logger.warning(f"Could not read catalog columns for {schema}.{table}: {e}")
+        return None
+
+
+def check_mapping(conn, schema: str, table: str,
+                  mapping: Sequence[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """Mapping entries whose source column exists in the DB2 catalog
+
+    Missing columns are logged and left out of the projection (they read as
+    None); an unreadable catalog leaves the mapping unchanged.
+    """
+    columns = catalog_columns(conn, schema, table)
+    if columns is None:
+        return list(mapping)
+    if not columns:
+        logger.error(f"{schema}.{table} not found in the DB2 catalog")
+        return list(mapping)
+    missing = [col for _, col in mapping if col.upper() not in columns]
+    if missing:
+        logger.error(f"{schema}.{table} mapping references unknown columns: {', '.join(missing)}")
+    present = [(key, col) for key, col in mapping if col.upper() in columns]
+    # An empty projection is not valid SQL; keep the mapping and let the query fail loudly
+    return present or list(mapping)
+
+
+def iter_tuples(stmt) -> Iterator[tuple]:
+    """Yield result rows as tuples until the cursor is exhausted"""
+    import ibm_db
+    fetch = ibm_db.fetch_tuple
+    while True:
+        row = fetch(stmt)
+        if not row:
+            return
+        yield row
+
+
+def fetch_tuples(stmt, max_rows: Optional[int] = None) -> List[tuple]:
+    """Fetch up to max_rows tuples (all remaining rows when None)"""
+    import ibm_db
+    fetch = ibm_db.fetch_tuple
+    rows = []
+    while max_rows is None or len(rows) < max_rows:
+        row = fetch(stmt)
+        if not row:
+            break
+        rows.append(row)
+    return rows
+
+
+def estimate_row_bytes(row: tuple) -> int:
+    """Rough in-memory footprint of a fetched row tuple"""
+    size = 56 + 8 * len(row)
+    for value in row:
+        if value.__class__ is str:
+            size += 49 + len(value)
+        else:
+            size += 32
+    return size
+
+
+def iter_chunks(stmt, max_rows: int, max_bytes: int = 0) -> Iterator[List[tuple]]:
+    """Yield lists of row tuples capped by a row budget and an optional byte budget"""
+    import ibm_db
+    fetch = ibm_db.fetch_tuple
+    while True:
+        chunk = []
+        chunk_bytes = 0
+        while len(chunk) < max_rows:
+            row = fetch(stmt)
+            if not row:
+                break
+            chunk.append(row)
+            if max_bytes > 0:
+                chunk_bytes += estimate_row_bytes(row)
+                if chunk_bytes >= max_bytes:
+                    break
+        if not chunk:
+            return
+        yield chunk
+        if len(chunk) < max_rows and (max_bytes <= 0 or chunk_bytes < max_bytes):
+            # Short chunk without hitting the byte budget means the cursor is drained
+            return
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+DB2 load governor for MCB Data Integration
+AIMD control of page size and fetch concurrency from observed query latency
+"""
+
+import os
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, time as dtime
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+DAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+# Page sizes are quantised to this many steps so the prepared statement
+# cache holds a handful of page queries rather than one per size
+PAGE_SIZE_STEPS = 8
+
+
+@dataclass(frozen=True)
+class RateWindow:
+    """Ceiling on the throttle level during a daily time window"""
+    start: dtime
+    end: dtime
+    max_level: float
+    days: Sequence[int] = tuple(range(7))
+
+    def contains(self, moment: datetime) -> bool:
+        if moment.weekday() not in self.days:
+            return False
+        now = moment.time()
+        if self.start <= self.end:
+            return self.start <= now < self.end
+        # Window wrapping midnight, e.g. 22:00-06:00
+        return now >= self.start or now < self.end
+
+
+@dataclass
+class SharedThrottle:
+    """Throttle state shared by the governors of several processes
+
+    One level and one count of page queries in flight per process slot, so
+    processes back off together and share the concurrency limit. A slot is
+    released when its process dies mid-query.
+    """
+    lock: Any
+    level: Any
+    active: Any
+
+    @classmethod
+    def create(cls, context, slots: int) -> "SharedThrottle":
+        """State for slots processes, from a multiprocessing context; pass it to them at start"""
+        return cls(context.Condition(), context.Value("d", -1.0, lock=False),
+                   context.Array("i", slots, lock=False))
+
+    def release(self, slot: int):
+        with self.lock:
+            self.active[slot] = 0
+            self.lock.notify_all()
+
+
+def parse_windows(spec: str) -> List[RateWindow]:
+    """Parse "mon-fri 08:00-17:00=0.3, 17:00-20:00=0.6" into RateWindows"""
+    windows = []
+    for part in filter(None, (p.strip() for p in (spec or "").split(","))):
+        try:
+            span, level = part.rsplit("=", 1)
+            fields = span.split()
+            days = tuple(range(7))
+            if len(fields) == 2:
+                first, _, last = fields[0].lower().partition("-")
+                start_day = DAYS.index(first[:3])
+                end_day = DAYS.index((last or first)[:3])
+                days = tuple(d % 7 for d in range(start_day, start_day + (end_day - start_day) % 7 + 1))
+            start, end = fields[-1].split("-")
+            windows.append(RateWindow(
+                dtime.fromisoformat(start), dtime.fromisoformat(end), float(level), days
+            ))
+        except (ValueError, IndexError) as e:
+            logger.error(f"Ignoring invalid governor window '{part}': {e}")
+    return windows
+
+
+class LoadGovernor:
+    """Throttle for DB2 extract queries
+
+    A single throttle level in (0, 1] sets both the page size and the number
+    of concurrent page queries. A page query slower than target_latency
+    halves the level (multiplicative decrease); a fast one adds `increase`
+    (additive increase). The level never exceeds the ceiling of the current
+    time-of-day window, so off-peak it climbs to full throughput and in
+    business hours it stays within the configured share. With a
+    SharedThrottle, governors in several processes share the level and the
+    concurrency limit, each counting its queries in its own slot.
+    """
+
+    def __init__(self, min_page_size: int = 100, max_page_size: int = 5000,
+                 max_concurrency: int = 4, target_latency: float = 2.0,
+                 increase: float = 0.05, decrease: float = 0.5, min_level: float = 0.05,
+                 windows: Optional[List[RateWindow]] = None,
+                 on_change: Optional[Callable[[float], None]] = None,
+                 clock: Callable[[], datetime] = datetime.now,
+                 shared: Optional[SharedThrottle] = None, slot: int = 0):
+        self.min_page_size = min_page_size
+        self.max_page_size = max(max_page_size, min_page_size)
+        self.max_concurrency = max(max_concurrency, 1)
+        self.target_latency = target_latency
+        self.increase = increase
+        self.decrease = decrease
+        self.min_level = min_level
+        self.windows = windows or []
+        self.on_change = on_change
+        self.clock = clock
+        self.shared = shared
+        self.slot = slot if shared is not None else 0
+
+        self._lock = shared.lock if shared is not None else threading.Condition()
+        self._active = shared.active if shared is not None else [0]
+        self._level = 0.0
+        with self._lock:
+            if shared is None or shared.level.value < 0:
+                self.level = self.ceiling() / 2
+        self.last_latency = 0.0
+        self.slow_queries = 0
+
+    @classmethod
+    def from_env(cls, max_page_size: int, **kwargs) -> "LoadGovernor":
+        """Governor configured from DB2_GOVERNOR_* environment variables"""
+        return cls(
+            min_page_size=int(os.getenv("DB2_GOVERNOR_MIN_PAGE", str(min(100, max_page_size)))),
+            max_page_size=max_page_size,
+            max_concurrency=int(os.getenv("DB2_GOVERNOR_MAX_CONCURRENCY", "4")),
+            target_latency=float(os.getenv("DB2_GOVERNOR_TARGET_LATENCY", "2.0")),
+            windows=parse_windows(os.getenv("DB2_GOVERNOR_WINDOWS", "")),
+            **kwargs,
+        )
+
+    @property
+    def level(self) -> float:
+        return self.shared.level.value if self.shared is not None else self._level
+
+    @level.setter
+    def level(self, value: float):
+        if self.shared is not None:
+            self.shared.level.value = value
+        else:
+            self._level = value
+
+    def ceiling(self) -> float:
+        """Highest level allowed right now (lowest matching window wins)"""
+        moment = self.clock()
+        limits = [w.max_level for w in self.windows if w.contains(moment)]
+        return max(min(limits + [1.0]), self.min_level)
+
+    def page_size(self) -> int:
+        """Rows per page query at the current level"""
+        level = min(self.level, self.ceiling())
+        step = max(1, round(level * PAGE_SIZE_STEPS))
+        span = self.max_page_size - self.min_page_size
+        return self.min_page_size + span * step // PAGE_SIZE_STEPS
+
+    def concurrency(self) -> int:
+        """Page queries allowed in flight at the current level"""
+        return max(1, round(min(self.level, self.ceiling()) * self.max_concurrency))
+
+    @contextmanager
+    def query(self):
+        """Wrap one page query: wait for a slot, time it and adjust the level"""
+        with self._lock:
+            while sum(self._active) >= self.concurrency():
+                self._lock.wait(1.0)
+            self._active[self.slot] += 1
+        started = time.monotonic()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            latency = time.monotonic() - started
+            with self._lock:
+                self._active[self.slot] -= 1
+                self._lock.notify_all()
+            self.record(latency, ok)
+
+    def record(self, latency: float, ok: bool = True):
+        """Additive increase on fast queries, multiplicative decrease on slow or failed ones"""
+        with self._lock:
+            before = self.level
+            self.last_latency = latency
+            if ok and latency <= self.target_latency:
+                self.level = self.level + self.increase
+            else:
+                self.slow_queries += 1
+                self.level = self.level * self.decrease
+            self.level = min(max(self.level, self.min_level), self.ceiling())
+            changed = self.level != before
+        if changed:
+            logger.debug(f"DB2 throttle level {before:.2f} -> {self.level:.2f} (latency {latency:.2f}s)")
+            if self.on_change:
+                try:
+                    self.on_change(self.level)
+                except Exception as e:
+                    logger.debug(f"Governor callback failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "level": round(self.level, 3),
+            "ceiling": round(self.ceiling(), 3),
+            "page_size": self.page_size(),
+            "concurrency": self.concurrency(),
+            "last_latency": round(self.last_latency, 3),
+            "slow_queries": self.slow_queries,
+        }
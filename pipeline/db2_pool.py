@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+DB2 connection pool for MCB Data Integration
+Thread-safe pool with checkout validation, idle eviction, warm spares
+and a prepared statement cache per connection
+"""
+
+import time
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import ibm_db
+
+from pipeline import db2_fetch
+
+logger = logging.getLogger(__name__)
+
+VALIDATION_QUERY = "SELECT 1 FROM SYSIBM.SYSDUMMY1"
+
+
+class PoolError(Exception):
+    """Raised when the pool cannot hand out a connection"""
+
+
+class PoolTimeoutError(PoolError):
+    """Raised when no connection becomes available within the acquire timeout"""
+
+
+class StatementCache:
+    """Prepared statements of one connection, keyed by SQL text (LRU bounded)
+
+    Statements are prepared once and re-executed with new parameters; callers
+    must free_result after consuming a result set so the statement can be
+    executed again.
+    """
+
+    def __init__(self, conn, max_size: int = 32,
+                 on_lookup: Optional[Callable[[bool], None]] = None):
+        self.conn = conn
+        self.max_size = max_size
+        self.on_lookup = on_lookup
+        self._statements: "OrderedDict[str, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def prepare(self, query: str):
+        """Cached statement for query, preparing it on first use"""
+        stmt = self._statements.get(query)
+        hit = stmt is not None
+        if hit:
+            self._statements.move_to_end(query)
+            self.hits += 1
+        else:
+            self.misses += 1
+            stmt = db2_fetch.prepare(self.conn, query)
+            if stmt:
+                self._statements[query] = stmt
+                if len(self._statements) > self.max_size:
+                    self._free(self._statements.popitem(last=False)[1])
+        if self.on_lookup:
+            self.on_lookup(hit)
+        return stmt
+
+    def execute(self, query: str, params: Tuple = ()):
+        """Execute a cached statement; returns it positioned on its result set"""
+        stmt = self.prepare(query)
+        if not stmt or ibm_db.execute(stmt, params) is False:
+            raise RuntimeError(f"DB2 statement failed to execute: {query.split()[0]}")
+        return stmt
+
+    def clear(self):
+        for stmt in self._statements.values():
+            self._free(stmt)
+        self._statements.clear()
+
+    def _free(self, stmt):
+        try:
+            ibm_db.free_stmt(stmt)
+        except Exception:
+            pass
+
+
+class DB2ConnectionPool:
+    """Pool of ibm_db connections shared by threads of one process
+
+    - min_size connections are opened up front and kept as warm spares
+    - connections idle longer than validate_after are validated on checkout
+    - idle connections above min_size are closed after max_idle seconds
+    - on_wait(seconds) is called with the time every acquire spent waiting
+    - every connection carries a StatementCache, dropped with the connection
+      so a reconnect starts with a fresh one
+    """
+
+    def __init__(self, connect: Callable[[], Any], min_size: int = 1, max_size: int = 5,
+                 max_idle: float = 300.0, validate_after: float = 30.0,
+                 acquire_timeout: float = 30.0, maintenance_interval: float = 10.0,
+                 on_wait: Optional[Callable[[float], None]] = None,
+                 statement_cache_size: int = 32,
+                 on_statement: Optional[Callable[[bool], None]] = None, name: str = "db2"):
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max(max_size, min_size, 1)
+        self.max_idle = max_idle
+        self.validate_after = validate_after
+        self.acquire_timeout = acquire_timeout
+        self.maintenance_interval = maintenance_interval
+        self.on_wait = on_wait
+        self.statement_cache_size = statement_cache_size
+        self.on_statement = on_statement
+        self.name = name
+
+        self._lock = threading.Condition()
+        self._idle: List[Tuple[Any, float]] = []  # (connection, returned_at), most recent last
+        self._in_use = 0
+        self._opening = 0
+        self._closed = False
+        self._maintenance: Optional[threading.Thread] = None
+        self._statements: Dict[int, StatementCache] = {}
+
+        # Counters exposed through stats()
+        self.acquires = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self.connections_opened = 0
+        self.connections_discarded = 0
+        self._retired_hits = 0
+        self._retired_misses = 0
+
+    def open(self):
+        """Open warm spares and start the maintenance thread"""
+        self._top_up()
+        if self._maintenance is None:
+            self._maintenance = threading.Thread(
+                target=self._maintain, name=f"{self.name}-pool-maintenance", daemon=True
+            )
+            self._maintenance.start()
+        logger.info(f"DB2 pool '{self.name}' open ({len(self._idle)} warm connections)")
+
+    def close(self):
+        """Close every idle connection; in-use connections close when released"""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._lock.notify_all()
+        for conn, _ in idle:
+            self._close_connection(conn)
+
+    def reset(self):
+        """Drop all idle connections, e.g. after the server went away"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self.connections_discarded += len(idle)
+        for conn, _ in idle:
+            self._close_connection(conn)
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None):
+        """Check out a connection for the duration of the block
+
+        A connection whose block raises is validated before it is returned
+        to the pool and discarded if it no longer works.
+        """
+        conn = self.acquire(timeout)
+        discard = False
+        try:
+            yield conn
+        except Exception:
+            discard = not self._is_usable(conn)
+            raise
+        finally:
+            self.release(conn, discard=discard)
+
+    def acquire(self, timeout: Optional[float] = None):
+        """Check out a validated connection, opening a new one if allowed"""
+        timeout = self.acquire_timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+
+        while True:
+            with self._lock:
+                while True:
+                    if self._closed:
+                        raise PoolError(f"DB2 pool '{self.name}' is closed")
+                    if self._idle:
+                        conn, returned_at = self._idle.pop()
+                        self._in_use += 1
+                        open_new = False
+                        break
+                    if self._in_use + self._opening + len(self._idle) < self.max_size:
+                        self._opening += 1
+                        conn, returned_at = None, None
+                        open_new = True
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolTimeoutError(
+                            f"No DB2 connection available in pool '{self.name}' after {timeout}s"
+                        )
+                    self._lock.wait(remaining)
+
+            if open_new:
+                try:
+                    conn = self._open_connection()
+                finally:
+                    with self._lock:
+                        self._opening -= 1
+                        if conn is not None:
+                            self._in_use += 1
+                        self._lock.notify()
+                if conn is None:
+                    raise PoolError(f"Could not open a DB2 connection for pool '{self.name}'")
+            elif time.monotonic() - returned_at > self.validate_after and not self._is_usable(conn):
+                logger.warning(f"Discarding stale connection from DB2 pool '{self.name}'")
+                self.release(conn, discard=True)
+                continue
+
+            self._record_wait(time.monotonic() - started)
+            return conn
+
+    def release(self, conn, discard: bool = False):
+        """Return a connection to the pool (or close it when discard is set)"""
+        with self._lock:
+            self._in_use -= 1
+            if discard or self._closed:
+                self.connections_discarded += 1
+                keep = False
+            else:
+                self._idle.append((conn, time.monotonic()))
+                keep = True
+            self._lock.notify()
+        if not keep:
+            self._close_connection(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of pool size and wait-time counters"""
+        with self._lock:
+            caches = list(self._statements.values())
+            return {
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "max_size": self.max_size,
+                "acquires": self.acquires,
+                "wait_time_total": round(self.wait_time_total, 6),
+                "wait_time_max": round(self.wait_time_max, 6),
+                "connections_opened": self.connections_opened,
+                "connections_discarded": self.connections_discarded,
+                "statement_hits": self._retired_hits + sum(c.hits for c in caches),
+                "statement_misses": self._retired_misses + sum(c.misses for c in caches),
+            }
+
+    def statements(self, conn) -> StatementCache:
+        """Statement cache of a checked-out connection"""
+        with self._lock:
+            cache = self._statements.get(id(conn))
+            if cache is None:
+                cache = StatementCache(conn, self.statement_cache_size, self.on_statement)
+                self._statements[id(conn)] = cache
+            return cache
+
+    def _record_wait(self, waited: float):
+        with self._lock:
+            self.acquires += 1
+            self.wait_time_total += waited
+            self.wait_time_max = max(self.wait_time_max, waited)
+        if self.on_wait:
+            try:
+                self.on_wait(waited)
+            except Exception as e:
+                logger.debug(f"DB2 pool wait callback failed: {e}")
+
+    def _open_connection(self):
+        try:
+            conn = self._connect()
+        except Exception as e:
+            logger.error(f"DB2 pool '{self.name}' failed to open a connection: {e}")
+            return None
+        if not conn:
+            return None
+        self.connections_opened += 1
+        return conn
+
+    def _is_usable(self, conn) -> bool:
+        try:
+            if not ibm_db.active(conn):
+                return False
+            ibm_db.free_result(self.statements(conn).execute(VALIDATION_QUERY))
+            return True
+        except Exception:
+            return False
+
+    def _close_connection(self, conn):
+        with self._lock:
+            cache = self._statements.pop(id(conn), None)
+            if cache is not None:
+                self._retired_hits += cache.hits
+                self._retired_misses += cache.misses
+                cache.clear()
+        try:
+            ibm_db.close(conn)
+        except Exception as e:
+            logger.debug(f"Error closing pooled DB2 connection: {e}")
+
+    def _top_up(self):
+        # Keep min_size connections open so checkouts skip the connect handshake
+        while True:
+            with self._lock:
+                total = self._in_use + self._opening + len(self._idle)
+                if self._closed or total >= self.min_size or total >= self.max_size:
+                    return
+                self._opening += 1
+            conn = self._open_connection()
+            with self._lock:
+                self._opening -= 1
+                if conn is not None:
+                    self._idle.insert(0, (conn, time.monotonic()))
+                    self._lock.notify()
+            if conn is None:
+                return
+
+    def _evict_idle(self):
+        # Oldest idle connections sit at the front of the list
+        now = time.monotonic()
+        evicted = []
+        with self._lock:
+            while (self._idle and self._in_use + len(self._idle) > self.min_size
+                   and now - self._idle[0][1] > self.max_idle):
+                evicted.append(self._idle.pop(0)[0])
+            self.connections_discarded += len(evicted)
+        for conn in evicted:
+            self._close_connection(conn)
+        if evicted:
+            logger.info(f"Evicted {len(evicted)} idle connections from DB2 pool '{self.name}'")
+
+    def _maintain(self):
+        while True:
+            with self._lock:
+                self._lock.wait(self.maintenance_interval)
+                if self._closed:
+                    return
+            try:
+                self._evict_idle()
+                self._top_up()
+            except Exception as e:
+                logger.error(f"DB2 pool '{self.name}' maintenance failed: {e}")
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Dead-letter queue for MCB Data Integration
+Rows that fail transform, validation or load are kept in bulk with their payload for replay
+"""
+
+import json
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from pipeline import pg_copy
+from pipeline.records import RecordBatch
+
+TABLE = "poller_dead_letters"
+
+STAGES = ("transform", "validate", "load")
+
+TABLE_DDL = f"""
+CREATE TABLE IF NOT EXISTS {TABLE} (
+    id BIGSERIAL PRIMARY KEY,
+    batch_id VARCHAR(200) NOT NULL,
+    table_name VARCHAR(100) NOT NULL,
+    stage VARCHAR(20) NOT NULL,
+    error_class VARCHAR(100),
+    error_message TEXT,
+    payload JSONB NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    replayed_at TIMESTAMP,
+    replay_batch_id VARCHAR(200)
+);
+CREATE INDEX IF NOT EXISTS idx_{TABLE}_pending
+ON {TABLE} (table_name, stage, id) WHERE replayed_at IS NULL;
+"""
+
+COLUMNS = ("batch_id", "table_name", "stage", "error_class", "error_message", "payload")
+
+# Rows waiting for replay, per table and stage
+DEPTH_QUERY = f"""
+SELECT table_name, stage, COUNT(*) FROM {TABLE}
+WHERE replayed_at IS NULL
+GROUP BY table_name, stage
+"""
+
+
+def new_batch_id() -> str:
+    return uuid.uuid4().hex
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat(" ") if isinstance(value, datetime) else value.isoformat()
+    if isinstance(value, Decimal):
+        # Kept as text so the amount round-trips exactly
+        return str(value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).hex()
+    return str(value)
+
+
+def payload(keys: Sequence[str], row: Sequence[Any]) -> str:
+    return json.dumps(dict(zip(keys, row)), default=_json_default)
+
+
+def describe(error: BaseException) -> Tuple[str, str]:
+    """(error class, message) of an exception"""
+    return type(error).__name__, str(error).strip()
+
+
+def write(cursor, table: str, stage: str, batch_id: str, keys: Sequence[str],
+          rows: Sequence[Sequence[Any]], errors: Sequence[Tuple[Optional[str], Optional[str]]]) -> int:
+    """Dead-letter rows with one COPY on a psycopg2 cursor, in the caller's transaction
+
+    errors holds one (error class, message) pair per row.
+    """
+    if not rows:
+        return 0
+    n = len(rows)
+    columns = [
+        [batch_id] * n,
+        [table] * n,
+        [stage] * n,
+        [error_class for error_class, _ in errors],
+        [message for _, message in errors],
+        [payload(keys, row) for row in rows],
+    ]
+    pg_copy.copy_columns(cursor, TABLE, COLUMNS, columns)
+    return n
+
+
+async def write_async(conn, table: str, stage: str, batch_id: str, keys: Sequence[str],
+                      rows: Sequence[Sequence[Any]], errors: Sequence[Tuple[Optional[str], Optional[str]]]) -> int:
+    """Same as write, on an asyncpg connection"""
+    if not rows:
+        return 0
+    await conn.copy_records_to_table(TABLE, columns=COLUMNS, records=[
+        (batch_id, table, stage, error_class, message, payload(keys, row))
+        for row, (error_class, message) in zip(rows, errors)
+    ])
+    return len(rows)
+
+
+def depth(cursor) -> Dict[Tuple[str, str], int]:
+    """{(table, stage): rows not yet replayed}"""
+    cursor.execute(DEPTH_QUERY)
+    return {(table, stage): count for table, stage, count in cursor.fetchall()}
+
+
+def select_pending(cursor, table: str, stage: Optional[str] = None, batch_id: Optional[str] = None,
+                   error_class: Optional[str] = None, after_id: int = 0, limit: int = 5000
+                   ) -> List[Tuple[int, Dict[str, Any]]]:
+    """(id, payload) of rows not yet replayed, in id order, one keyset page at a time"""
+    filters = ["replayed_at IS NULL", "table_name = %s", "id > %s"]
+    params: List[Any] = [table, after_id]
+    for column, value in (("stage", stage), ("batch_id", batch_id), ("error_class", error_class)):
+        if value is not None:
+            filters.append(f"{column} = %s")
+            params.append(value)
+    cursor.execute(
+        f"SELECT id, payload FROM {TABLE} WHERE {' AND '.join(filters)} ORDER BY id LIMIT %s",
+        params + [limit],
+    )
+    return [(row_id, data if isinstance(data, dict) else json.loads(data))
+            for row_id, data in cursor.fetchall()]
+
+
+def to_batch(table: str, payloads: Sequence[Dict[str, Any]], keys: Optional[Sequence[str]] = None
+             ) -> RecordBatch:
+    """Columnar batch of payloads; keys default to the union in first-seen order"""
+    if keys is None:
+        keys = list(dict.fromkeys(key for data in payloads for key in data))
+    return RecordBatch.from_dicts(table, payloads, keys)
+
+
+def mark_replayed(cursor, ids: Sequence[int], replay_batch_id: str):
+    cursor.execute(
+        f"UPDATE {TABLE} SET replayed_at = CURRENT_TIMESTAMP, replay_batch_id = %s WHERE id = ANY(%s)",
+        (replay_batch_id, list(ids)),
+    )
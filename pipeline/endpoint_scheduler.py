@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Multi-endpoint poll scheduler for MCB Data Integration
+Runs (endpoint, table) jobs under per-host and global concurrency caps
+"""
+
+import json
+import time
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PollJob:
+    """One (endpoint, table) poll; lower priority values run first"""
+    endpoint_id: str
+    table: str
+    host: str
+    priority: int = 0
+    interval: float = 30.0
+    due_at: float = 0.0
+    queued_at: Optional[float] = None
+    running: bool = False
+
+    @property
+    def key(self) -> str:
+        return f"{self.endpoint_id}/{self.table}"
+
+
+def load_jobs(path: str) -> Dict[str, Any]:
+    """Read scheduler settings and jobs from a JSON config file
+
+    {"global_concurrency": 8, "per_host_concurrency": 2,
+     "endpoints": [{"endpoint_id": "branch-01", "priority": 0, "interval": 30,
+                    "tables": ["PERSONAL_DATA_INDIVIDUALS"],
+                    "config": {"connection_params": {"host": "db2-01", ...}, ...}}]}
+
+    "config" holds the endpoint's EndpointConfig fields. A job's host is
+    "host" when given, else the connection host, so endpoints on one DB2
+    server share its cap.
+    """
+    with open(path) as f:
+        config = json.load(f)
+    jobs = []
+    for endpoint in config.get("endpoints", []):
+        host = endpoint.get("host") or endpoint.get("config", {}).get("connection_params", {}).get("host")
+        for table in endpoint["tables"]:
+            jobs.append(PollJob(
+                endpoint_id=endpoint["endpoint_id"],
+                table=table,
+                host=host or endpoint["endpoint_id"],
+                priority=endpoint.get("priority", 0),
+                interval=endpoint.get("interval", 30.0),
+            ))
+    return {
+        "endpoints": config.get("endpoints", []),
+        "jobs": jobs,
+        "global_concurrency": config.get("global_concurrency", 8),
+        "per_host_concurrency": config.get("per_host_concurrency", 2),
+    }
+
+
+class EndpointScheduler:
+    """Fair scheduler for many endpoint/table poll jobs
+
+    Due jobs wait in a queue ordered by priority, then by how many jobs
+    their endpoint has already had run, then by arrival. Jobs gain one
+    priority level per `aging` seconds queued, so low priority endpoints
+    are never starved. A job whose host is at its cap is skipped rather
+    than blocking jobs for other hosts.
+
+    run_job(job) may return the delay before the job's next run; otherwise
+    job.interval is used. on_queue_wait(endpoint_id, seconds) is called for
+    every dispatched job.
+    """
+
+    def __init__(self, run_job: Callable[[PollJob], Awaitable[Optional[float]]],
+                 global_concurrency: int = 8, per_host_concurrency: int = 2,
+                 aging: float = 30.0,
+                 on_queue_wait: Optional[Callable[[str, float], None]] = None):
+        self.run_job = run_job
+        self.global_concurrency = global_concurrency
+        self.per_host_concurrency = per_host_concurrency
+        self.aging = aging
+        self.on_queue_wait = on_queue_wait
+
+        self.jobs: Dict[str, PollJob] = {}
+        self._queue: List[PollJob] = []
+        self._running_per_host: Dict[str, int] = {}
+        self._running = 0
+        self._served: Dict[str, int] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+        self.queue_wait_total: Dict[str, float] = {}
+
+    def add_job(self, job: PollJob):
+        self.jobs[job.key] = job
+        if self._wakeup:
+            self._wakeup.set()
+
+    async def run(self):
+        """Dispatch jobs until stop() is called"""
+        self._wakeup = asyncio.Event()
+        while not self._stopping:
+            now = time.monotonic()
+            self._enqueue_due(now)
+            self._dispatch(now)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self._time_until_next_due(now))
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+        if self._tasks:
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    def stop(self):
+        self._stopping = True
+        if self._wakeup:
+            self._wakeup.set()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": len(self._queue),
+            "running": self._running,
+            "running_per_host": dict(self._running_per_host),
+            "served": dict(self._served),
+            "queue_wait_total": {k: round(v, 3) for k, v in self.queue_wait_total.items()},
+        }
+
+    def _enqueue_due(self, now: float):
+        for job in self.jobs.values():
+            if not job.running and job.queued_at is None and job.due_at <= now:
+                job.queued_at = now
+                self._queue.append(job)
+
+    def _sort_key(self, job: PollJob, now: float):
+        aged = int((now - job.queued_at) // self.aging) if self.aging > 0 else 0
+        return (job.priority - aged, self._served.get(job.endpoint_id, 0), job.queued_at)
+
+    def _dispatch(self, now: float):
+        if not self._queue:
+            return
+        self._queue.sort(key=lambda job: self._sort_key(job, now))
+        waiting = []
+        for job in self._queue:
+            if (self._running >= self.global_concurrency
+                    or self._running_per_host.get(job.host, 0) >= self.per_host_concurrency):
+                waiting.append(job)
+                continue
+            self._start(job, now)
+        self._queue = waiting
+
+    def _start(self, job: PollJob, now: float):
+        waited = now - job.queued_at
+        job.queued_at = None
+        job.running = True
+        self._running += 1
+        self._running_per_host[job.host] = self._running_per_host.get(job.host, 0) + 1
+        self._served[job.endpoint_id] = self._served.get(job.endpoint_id, 0) + 1
+        self.queue_wait_total[job.endpoint_id] = self.queue_wait_total.get(job.endpoint_id, 0.0) + waited
+        if self.on_queue_wait:
+            try:
+                self.on_queue_wait(job.endpoint_id, waited)
+            except Exception as e:
+                logger.debug(f"Queue wait callback failed: {e}")
+        self._tasks[job.key] = asyncio.ensure_future(self._run(job))
+
+    async def _run(self, job: PollJob):
+        delay = None
+        try:
+            delay = await self.run_job(job)
+        except Exception as e:
+            logger.error(f"Poll job {job.key} failed: {e}")
+        finally:
+            job.running = False
+            job.due_at = time.monotonic() + (job.interval if delay is None else delay)
+            self._running -= 1
+            self._running_per_host[job.host] -= 1
+            self._tasks.pop(job.key, None)
+            if self._wakeup:
+                self._wakeup.set()
+
+    def _time_until_next_due(self, now: float) -> Optional[float]:
+        pending = [job.due_at for job in self.jobs.values() if not job.running and job.queued_at is None]
+        if not pending:
+            # Only running or queued jobs; a completion wakes the dispatcher
+            return None
+        return max(min(pending) - now, 0.0)
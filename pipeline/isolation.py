@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Failure isolation for MCB Data Integration batch loads
+Splits a failed batch in halves under savepoints until only the offending rows are left
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, ContextManager, AsyncContextManager, List, Sequence, Tuple, Type
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Isolation:
+    """Outcome of loading a batch with failure isolation"""
+    loaded: int = 0
+    failed: List[Tuple[Any, BaseException]] = field(default_factory=list)
+    attempts: int = 0
+
+    def summary(self, table: str) -> str:
+        errors = {}
+        for _, error in self.failed:
+            errors.setdefault(type(error).__name__, str(error).strip().splitlines()[0] if str(error) else "")
+        detail = "; ".join(f"{name}: {message}" for name, message in errors.items())
+        return (f"Isolated {len(self.failed)} failing {table} rows in {self.attempts} attempts, "
+                f"loaded {self.loaded} ({detail})")
+
+
+def _halves(rows: Sequence[Any]) -> List[Sequence[Any]]:
+    mid = len(rows) // 2
+    # Pushed right half first so the left half is tried first, keeping row order
+    return [rows[mid:], rows[:mid]]
+
+
+def isolate(rows: Sequence[Any], attempt: Callable[[Sequence[Any]], None],
+            savepoint: Callable[[], ContextManager], fatal: Tuple[Type[BaseException], ...] = (),
+            known_bad: bool = False) -> Isolation:
+    """Load rows with attempt(chunk), bisecting any chunk that fails
+
+    Each attempt runs under savepoint(), which must roll back to the
+    savepoint when the block raises, so a failed chunk leaves the
+    transaction usable. A batch with b bad rows costs O(b log n) attempts
+    instead of one per row. Exceptions of the fatal types (e.g. a lost
+    connection) are not row failures and propagate. known_bad skips the
+    attempt on the whole batch, for callers that already tried it.
+    """
+    result = Isolation()
+    stack = _halves(rows) if known_bad and len(rows) > 1 else [rows]
+    while stack:
+        chunk = stack.pop()
+        if not chunk:
+            continue
+        result.attempts += 1
+        try:
+            with savepoint():
+                attempt(chunk)
+        except fatal:
+            raise
+        except Exception as e:
+            if len(chunk) == 1:
+                result.failed.append((chunk[0], e))
+            else:
+                stack.extend(_halves(chunk))
+            continue
+        result.loaded += len(chunk)
+    return result
+
+
+async def isolate_async(rows: Sequence[Any], attempt: Callable[[Sequence[Any]], Awaitable[None]],
+                        savepoint: Callable[[], AsyncContextManager],
+                        fatal: Tuple[Type[BaseException], ...] = (),
+                        known_bad: bool = False) -> Isolation:
+    """isolate() for async drivers, e.g. with asyncpg's nested conn.transaction() as savepoint"""
+    result = Isolation()
+    stack = _halves(rows) if known_bad and len(rows) > 1 else [rows]
+    while stack:
+        chunk = stack.pop()
+        if not chunk:
+            continue
+        result.attempts += 1
+        try:
+            async with savepoint():
+                await attempt(chunk)
+        except fatal:
+            raise
+        except Exception as e:
+            if len(chunk) == 1:
+                result.failed.append((chunk[0], e))
+            else:
+                stack.extend(_halves(chunk))
+            continue
+        result.loaded += len(chunk)
+    return result
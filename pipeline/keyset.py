@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Keyset pagination for MCB Data Integration
+Pages CBS_SCHEMA tables on (CREATEDDATE, row key) for incremental polling
+"""
+
+import logging
+from contextlib import nullcontext
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from pipeline import db2_fetch
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = "CBS_SCHEMA"
+
+# DB2 timestamp literal format: 'YYYY-MM-DD-HH.MM.SS.FFFFFF'
+DB2_TIMESTAMP_FORMAT = "%Y-%m-%d-%H.%M.%S.%f"
+EPOCH = "1900-01-01-00.00.00.000000"
+
+# Tiebreaker for rows sharing a CREATEDDATE. The CBS tables carry no primary
+# key, so the DB2 row id is used unless a table declares a unique key column.
+DEFAULT_KEY_EXPR = "RID(T)"
+KEY_EXPRESSIONS: Dict[str, str] = {}
+
+# Largest BIGINT; a cursor with this key has consumed every row at its timestamp
+MAX_KEY = 2 ** 63 - 1
+
+# Aliases of the cursor columns appended to every page query
+CREATED_ALIAS = "KS_CREATED"
+KEY_ALIAS = "KS_KEY"
+
+
+@dataclass(frozen=True)
+class KeysetCursor:
+    """Position after the last consumed row: (CREATEDDATE, row key)"""
+    created: str = EPOCH
+    key: int = -1
+
+    def encode(self) -> str:
+        """Serialise for checkpoint storage"""
+        return f"{self.created}|{self.key}"
+
+    @classmethod
+    def decode(cls, token: Optional[str]) -> "KeysetCursor":
+        """Parse a stored checkpoint; bare timestamps from older pollers resume after that instant"""
+        if not token or token.strip("0") == "":
+            return cls()
+        if "|" in token:
+            created, key = token.rsplit("|", 1)
+            return cls(created, int(key))
+        return cls(token, MAX_KEY)
+
+    @classmethod
+    def from_row(cls, created, key) -> "KeysetCursor":
+        """Cursor positioned on a fetched row"""
+        if isinstance(created, datetime):
+            created = created.strftime(DB2_TIMESTAMP_FORMAT)
+        return cls(str(created), int(key))
+
+    def params(self) -> List:
+        """Bind parameters for build_page_query, in placeholder order"""
+        return [self.created, self.created, self.key]
+
+
+@dataclass(frozen=True)
+class RangeBounds:
+    """Extra predicates restricting a scan to one backfill partition
+
+    The lower edge of a range is expressed by the starting cursor; these
+    bound the top by CREATEDDATE and/or select one key-hash bucket.
+    """
+    upper: Optional[str] = None
+    upper_inclusive: bool = False
+    buckets: int = 0
+    bucket: int = 0
+
+    def clauses(self, key_expr: str) -> str:
+        """SQL predicates appended to the page query WHERE clause"""
+        sql = ""
+        if self.upper is not None:
+            sql += f" AND T.CREATEDDATE {'<=' if self.upper_inclusive else '<'} ?"
+        if self.buckets > 1:
+            sql += f" AND MOD({key_expr}, {self.buckets}) = {self.bucket}"
+        return sql
+
+    def params(self) -> List:
+        """Bind parameters for clauses(), in placeholder order"""
+        return [self.upper] if self.upper is not None else []
+
+
+def key_expression(table: str) -> str:
+    """Tiebreaker expression for a table (aliased as T in page queries)"""
+    return KEY_EXPRESSIONS.get(table, DEFAULT_KEY_EXPR)
+
+
+def build_page_query(table: str, columns: str, page_size: int,
+                     bounds: Optional[RangeBounds] = None) -> str:
+    """Build the keyset page query; columns may reference the table as T"""
+    key_expr = key_expression(table)
+    extra = bounds.clauses(key_expr) if bounds else ""
+    return f"""
+        SELECT {columns}, T.CREATEDDATE AS {CREATED_ALIAS}, {key_expr} AS {KEY_ALIAS}
+        FROM {SCHEMA}.{table} T
+        WHERE T.CREATEDDATE >= ?
+          AND (T.CREATEDDATE > ? OR {key_expr} > ?){extra}
+        ORDER BY T.CREATEDDATE, {key_expr}
+        FETCH FIRST {page_size} ROWS ONLY
+    """
+
+
+def fetch_page(stmt, cursor: KeysetCursor, page_size: int, max_bytes: int = 0,
+               bounds: Optional[RangeBounds] = None) -> Tuple[Dict[str, int], List[tuple], KeysetCursor, bool]:
+    """Execute one page; returns (positions, rows, next cursor, more pages pending)"""
+    import ibm_db
+    params = cursor.params() + (bounds.params() if bounds else [])
+    for position, value in enumerate(params, start=1):
+        ibm_db.bind_param(stmt, position, value)
+    if ibm_db.execute(stmt) is False:
+        raise RuntimeError("keyset page query failed to execute")
+
+    try:
+        positions = db2_fetch.column_positions(stmt)
+        rows = next(db2_fetch.iter_chunks(stmt, page_size, max_bytes), [])
+    finally:
+        ibm_db.free_result(stmt)
+
+    if not rows:
+        return positions, rows, cursor, False
+
+    last = rows[-1]
+    next_cursor = KeysetCursor.from_row(last[positions[CREATED_ALIAS]], last[positions[KEY_ALIAS]])
+    # A page cut short by the byte budget still has rows waiting behind it
+    more = len(rows) == page_size or (
+        max_bytes > 0 and sum(map(db2_fetch.estimate_row_bytes, rows)) >= max_bytes
+    )
+    return positions, rows, next_cursor, more
+
+
+def iter_pages(conn, table: str, columns: str, cursor: KeysetCursor, page_size: int,
+               max_bytes: int = 0, bounds: Optional[RangeBounds] = None, statements=None,
+               governor=None) -> Iterator[Tuple[Dict[str, int], List[tuple], KeysetCursor]]:
+    """Drain a table (or one bounded range of it) from cursor in consecutive keyset pages
+
+    statements is an optional per-connection StatementCache; with it the page
+    query is prepared once per connection instead of once per call. With a
+    LoadGovernor each page takes its size from the governor and is timed by it.
+    """
+    prepared = {}
+    while True:
+        size = governor.page_size() if governor else page_size
+        stmt = prepared.get(size)
+        if stmt is None:
+            query = build_page_query(table, columns, size, bounds)
+            stmt = statements.prepare(query) if statements else db2_fetch.prepare(conn, query)
+            if not stmt:
+                raise RuntimeError(f"Failed to prepare keyset page query for {table}")
+            prepared[size] = stmt
+
+        with governor.query() if governor else nullcontext():
+            positions, rows, cursor, more = fetch_page(stmt, cursor, size, max_bytes, bounds)
+        if rows:
+            yield positions, rows, cursor
+        if not more:
+            return
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Declarative table mappings for MCB Data Integration
+One definition per source table, compiled into row transforms and parameter extractors
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Collection, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from pipeline import dates, money
+from pipeline.records import RecordBatch
+
+logger = logging.getLogger(__name__)
+
+Converter = Callable[[Any], Any]
+
+
+def lower_key(field: "Field") -> str:
+    """Output name for the poller's bot_* tables (unquoted camelCase, folded to lower case)"""
+    return field.key.lower()
+
+
+def yes_no(value: Any) -> bool:
+    """'Y' flag to bool"""
+    return value == "Y"
+
+
+def required(value: Any) -> bool:
+    """Value is present and non-empty"""
+    return bool(value)
+
+
+# Column-at-a-time forms of per-value converters, used when a whole page is transformed
+COLUMN_CONVERTERS: Dict[Converter, Callable[[List[Any]], List[Any]]] = {
+    dates.parse_ddmmyyyyhhmm: dates.parse_column,
+    money.to_amount: money.amount_column,
+}
+
+
+@dataclass(frozen=True)
+class Field:
+    """One mapped column: record key, DB2 source column, bot_* target column
+
+    lookup names the reference-data domain (pipeline.reference) the value
+    is normalised through, if any.
+    """
+    key: str
+    source: str
+    target: str
+    convert: Optional[Converter] = None
+    validate: Optional[Callable[[Any], bool]] = None
+    lookup: Optional[str] = None
+
+
+def _compile(name: str, source: str, namespace: Dict[str, Any]) -> Callable:
+    exec(compile(source, f"<mapping {name}>", "exec"), namespace)
+    return namespace[name]
+
+
+@dataclass(frozen=True)
+class TableMapping:
+    """Mapping of a source table onto its bot_* target table
+
+    converted names the amount whose USD/TZS equivalents are derived from
+    FX rates when the source leaves them empty.
+    """
+    table: str
+    target_table: str
+    fields: Tuple[Field, ...]
+    converted: Optional[money.ConvertedAmounts] = None
+
+    def keys(self, exclude: Collection[str] = ()) -> List[str]:
+        return [f.key for f in self.fields if f.key not in exclude]
+
+    def select(self, keys: Optional[Sequence[str]] = None) -> List[Field]:
+        if keys is None:
+            return list(self.fields)
+        by_key = {f.key: f for f in self.fields}
+        return [by_key[key] for key in keys]
+
+    def source_columns(self, keys: Optional[Sequence[str]] = None) -> List[Tuple[str, str]]:
+        """(key, SOURCE_COLUMN) pairs, as used for projections and row readers"""
+        return [(f.key, f.source) for f in self.select(keys)]
+
+    def target_columns(self, keys: Optional[Sequence[str]] = None) -> List[str]:
+        return [f.target for f in self.select(keys)]
+
+    def converted_columns(self, name: Callable[[Field], str] = lambda f: f.key
+                          ) -> Optional[money.ConvertedAmounts]:
+        """converted with each key replaced by its output column name"""
+        if self.converted is None:
+            return None
+        spec = self.converted
+        fields = self.select([spec.amount, spec.currency, spec.usd, spec.tzs])
+        return money.ConvertedAmounts(*(name(f) for f in fields))
+
+    def lookups(self, keys: Optional[Sequence[str]] = None,
+                name: Callable[[Field], str] = lambda f: f.key) -> Dict[str, str]:
+        """{output column: reference domain} for the fields that have a lookup"""
+        return {name(f): f.lookup for f in self.select(keys) if f.lookup is not None}
+
+    def compile_transform(self, positions: Dict[str, int], keys: Optional[Sequence[str]] = None,
+                          name: Callable[[Field], str] = lambda f: f.key,
+                          convert: Union[bool, Collection[str]] = True,
+                          extra: Sequence[str] = ()) -> Callable[..., List[Dict[str, Any]]]:
+        """Compile a page transform: transform(rows, *extra) -> list of dicts
+
+        Each output dict holds the extra values first, then one entry per
+        field named by name(field). convert is True (apply every converter),
+        False, or the keys whose converters apply. Converters with a column
+        form run once per page column. Fields missing from positions read
+        as None, matching db2_fetch.row_reader.
+        """
+        namespace: Dict[str, Any] = {}
+        columns = []
+        entries = [f"{value!r}: {value}" for value in extra]
+        missing = []
+        for n, f in enumerate(self.select(keys)):
+            out = repr(name(f))
+            if f.source not in positions:
+                missing.append(f.key)
+                entries.append(f"{out}: None")
+                continue
+            value = f"r[{positions[f.source]}]"
+            applies = convert is True or (convert is not False and f.key in convert)
+            if f.convert is not None and applies:
+                column_form = COLUMN_CONVERTERS.get(f.convert)
+                if column_form is not None:
+                    namespace[f"col_{n}"] = column_form
+                    columns.append(f"    c{n} = col_{n}([r[{positions[f.source]}] for r in rows])")
+                    value = f"c{n}[i]"
+                else:
+                    namespace[f"conv_{n}"] = f.convert
+                    value = f"conv_{n}({value})"
+            entries.append(f"{out}: {value}")
+        if missing:
+            logger.warning(f"Result set for {self.table} is missing columns for: {', '.join(missing)}")
+
+        row = "{" + ", ".join(entries) + "}"
+        loop = "for i, r in enumerate(rows)" if columns else "for r in rows"
+        source = "\n".join(
+            [f"def transform(rows{''.join(', ' + value for value in extra)}):"]
+            + columns
+            + [f"    return [{row} {loop}]"]
+        )
+        return _compile("transform", source, namespace)
+
+    def compile_batch(self, positions: Dict[str, int], keys: Optional[Sequence[str]] = None,
+                      name: Callable[[Field], str] = lambda f: f.key,
+                      convert: Union[bool, Collection[str]] = True,
+                      extra: Sequence[str] = (),
+                      columnar_input: bool = False) -> Callable[..., RecordBatch]:
+        """Compile a columnar page transform: build(rows, *extra) -> RecordBatch
+
+        Same naming and conversion rules as compile_transform, but the page
+        is transposed once and every converter runs over a whole column, so
+        no per-row dict is built. extra values become constant columns. With
+        columnar_input the page is passed already transposed, one sequence
+        per result set column.
+        """
+        plan = []
+        missing = []
+        for f in self.select(keys):
+            pos = positions.get(f.source)
+            if pos is None:
+                missing.append(f.key)
+            applies = convert is True or (convert is not False and f.key in convert)
+            conv = f.convert if applies else None
+            plan.append((pos, conv, COLUMN_CONVERTERS.get(conv)))
+        if missing:
+            logger.warning(f"Result set for {self.table} is missing columns for: {', '.join(missing)}")
+        names = tuple(extra) + tuple(name(f) for f in self.select(keys))
+        table = self.table
+
+        def build(rows: Sequence[Sequence[Any]], *values) -> RecordBatch:
+            if columnar_input:
+                source = rows
+                n = len(rows[0]) if rows else 0
+            else:
+                n = len(rows)
+                source = list(zip(*rows)) if n else []
+            if not n:
+                return RecordBatch(table, names, [[] for _ in names])
+            columns = [[value] * n for value in values]
+            for pos, conv, column_form in plan:
+                if pos is None:
+                    columns.append([None] * n)
+                elif column_form is not None:
+                    columns.append(column_form(source[pos]))
+                elif conv is not None:
+                    columns.append(list(map(conv, source[pos])))
+                else:
+                    columns.append(list(source[pos]))
+            return RecordBatch(table, names, columns)
+
+        return build
+
+    def compile_params(self, keys: Optional[Sequence[str]] = None,
+                       convert: Collection[str] = ()) -> Callable[[Dict[str, Any]], tuple]:
+        """Compile record dict -> statement parameter tuple in field order
+
+        The generated function indexes the record directly; a record missing
+        a key falls back to .get() so partial records bind NULL as before.
+        Keys in convert have their field converter applied.
+        """
+        namespace: Dict[str, Any] = {}
+        direct, lenient = [], []
+        for n, f in enumerate(self.select(keys)):
+            wrap = "{}"
+            if f.key in convert and f.convert is not None:
+                namespace[f"conv_{n}"] = f.convert
+                wrap = f"conv_{n}({{}})"
+            direct.append(wrap.format(f"record[{f.key!r}]"))
+            lenient.append(wrap.format(f"record.get({f.key!r})"))
+        source = (
+            "def params(record):\n"
+            "    try:\n"
+            f"        return ({', '.join(direct)},)\n"
+            "    except KeyError:\n"
+            f"        return ({', '.join(lenient)},)"
+        )
+        return _compile("params", source, namespace)
+
+    def compile_batch_params(self, keys: Optional[Sequence[str]] = None,
+                             convert: Collection[str] = ()) -> Callable[[RecordBatch], Iterator[tuple]]:
+        """Compile batch -> iterator of statement parameter tuples in field order
+
+        Columns absent from the batch bind NULL; keys in convert have their
+        field converter applied a column at a time.
+        """
+        fields = self.select(keys)
+
+        def params(batch: RecordBatch) -> Iterator[tuple]:
+            n = len(batch)
+            columns = []
+            for f in fields:
+                column = batch.column(f.key) if f.key in batch.keys else [None] * n
+                if f.key in convert and f.convert is not None:
+                    column_form = COLUMN_CONVERTERS.get(f.convert)
+                    column = column_form(column) if column_form else list(map(f.convert, column))
+                columns.append(column)
+            return zip(*columns)
+
+        return params
+
+
+def _date(key: str, source: str, target: str) -> Field:
+    return Field(key, source, target, convert=dates.parse_ddmmyyyyhhmm)
+
+
+def _amount(key: str, source: str, target: str) -> Field:
+    return Field(key, source, target, convert=money.to_amount)
+
+
+PERSONAL_DATA_INDIVIDUALS = TableMapping(
+    table="PERSONAL_DATA_INDIVIDUALS",
+    target_table="bot_personal_data_individuals",
+    fields=(
+        _date("reportingDate", "REPORTINGDATE", "reporting_date"),
+        Field("customerIdentificationNumber", "CUSTOMERIDENTIFICATIONNUMBER",
+              "customer_identification_number", validate=required),
+        Field("firstName", "FIRSTNAME", "first_name"),
+        Field("middleNames", "MIDDLENAMES", "middle_names"),
+        Field("surname", "SURNAME", "surname"),
+        Field("gender", "GENDER", "gender"),
+        _date("dateOfBirth", "DATEOFBIRTH", "date_of_birth"),
+        Field("maritalStatus", "MARITALSTATUS", "marital_status"),
+        Field("numberOfDependants", "NUMBEROFDEPENDANTS", "number_of_dependants"),
+        Field("disabilityStatus", "DISABILITYSTATUS", "disability_status"),
+        Field("disabilityType", "DISABILITYTYPE", "disability_type"),
+        Field("citizenship", "CITIZENSHIP", "citizenship"),
+        Field("nationality", "NATIONALITY", "nationality"),
+        Field("residence", "RESIDENCE", "residence"),
+        Field("residenceStatus", "RESIDENCESTATUS", "residence_status"),
+        Field("employmentStatus", "EMPLOYMENTSTATUS", "employment_status"),
+        Field("occupation", "OCCUPATION", "occupation"),
+        Field("employerName", "EMPLOYERNAME", "employer_name"),
+        Field("employerAddress", "EMPLOYERADDRESS", "employer_address"),
+        Field("sectorEmployer", "SECTOREMPLOYER", "sector_employer"),
+        Field("incomeRange", "INCOMERANGE", "income_range"),
+        Field("educationLevel", "EDUCATIONLEVEL", "education_level"),
+        Field("identificationType", "IDENTIFICATIONTYPE", "identification_type"),
+        Field("identificationNumber", "IDENTIFICATIONNUMBER", "identification_number"),
+        Field("issuingCountry", "ISSUINGCOUNTRY", "issuing_country", lookup="country"),
+        Field("issuingAuthority", "ISSUINGAUTHORITY", "issuing_authority"),
+        _date("issueDate", "ISSUEDATE", "issue_date"),
+        _date("expiryDate", "EXPIRYDATE", "expiry_date"),
+        Field("mobileNumber", "MOBILENUMBER", "mobile_number"),
+        Field("altMobileNumber", "ALTMOBILENUMBER", "alt_mobile_number"),
+        Field("emailAddress", "EMAILADDRESS", "email_address"),
+        Field("altEmailAddress", "ALTEMAILADDRESS", "alt_email_address"),
+        Field("postalAddress", "POSTALADDRESS", "postal_address"),
+        Field("physicalAddress", "PHYSICALADDRESS", "physical_address"),
+        Field("region", "REGION", "region", lookup="region"),
+        Field("district", "DISTRICT", "district"),
+        Field("ward", "WARD", "ward"),
+        Field("street", "STREET", "street"),
+        Field("houseNumber", "HOUSENUMBER", "house_number"),
+        Field("postalCode", "POSTALCODE", "postal_code"),
+        Field("country", "COUNTRY", "country", lookup="country"),
+        Field("gpsCoordinates", "GPSCOORDINATES", "gps_coordinates"),
+        Field("nextOfKinName", "NEXTOFKINNAME", "next_of_kin_name"),
+        Field("nextOfKinRelationship", "NEXTOFKINRELATIONSHIP", "next_of_kin_relationship"),
+        Field("nextOfKinMobileNumber", "NEXTOFKINMOBILENUMBER", "next_of_kin_mobile_number"),
+        Field("nextOfKinEmailAddress", "NEXTOFKINEMAILADDRESS", "next_of_kin_email_address"),
+        Field("nextOfKinAddress", "NEXTOFKINADDRESS", "next_of_kin_address"),
+        Field("nextOfKinRegion", "NEXTOFKINREGION", "next_of_kin_region", lookup="region"),
+        Field("nextOfKinDistrict", "NEXTOFKINDISTRICT", "next_of_kin_district"),
+        Field("nextOfKinWard", "NEXTOFKINWARD", "next_of_kin_ward"),
+        Field("nextOfKinStreet", "NEXTOFKINSTREET", "next_of_kin_street"),
+        Field("nextOfKinHouseNumber", "NEXTOFKINHOUSENUMBER", "next_of_kin_house_number"),
+        Field("nextOfKinPostalCode", "NEXTOFKINPOSTALCODE", "next_of_kin_postal_code"),
+        Field("nextOfKinCountry", "NEXTOFKINCOUNTRY", "next_of_kin_country", lookup="country"),
+        Field("nextOfKinGpsCoordinates", "NEXTOFKINGPSCOORDINATES", "next_of_kin_gps_coordinates"),
+        Field("kycStatus", "KYCSTATUS", "kyc_status"),
+        _date("kycDate", "KYCDATE", "kyc_date"),
+        _date("kycExpiryDate", "KYCEXPIRYDATE", "kyc_expiry_date"),
+        Field("riskRating", "RISKRATING", "risk_rating"),
+        _date("riskRatingDate", "RISKRATINGDATE", "risk_rating_date"),
+        Field("pepStatus", "PEPSTATUS", "pep_status"),
+        Field("pepClassification", "PEPCLASSIFICATION", "pep_classification"),
+        Field("pepPosition", "PEPPOSITION", "pep_position"),
+        Field("pepCountry", "PEPCOUNTRY", "pep_country", lookup="country"),
+        Field("pepRelationship", "PEPRELATIONSHIP", "pep_relationship"),
+        Field("sanctionsStatus", "SANCTIONSSTATUS", "sanctions_status", convert=yes_no),
+        Field("sanctionsList", "SANCTIONSLIST", "sanctions_list"),
+        _date("sanctionsDate", "SANCTIONSDATE", "sanctions_date"),
+        Field("sanctionsCountry", "SANCTIONSCOUNTRY", "sanctions_country", lookup="country"),
+        Field("village", "VILLAGE", "village"),
+    ),
+)
+
+ASSET_OWNED_OR_ACQUIRED = TableMapping(
+    table="ASSET_OWNED_OR_ACQUIRED",
+    target_table="bot_asset_owned_or_acquired",
+    fields=(
+        _date("reportingDate", "REPORTINGDATE", "reporting_date"),
+        Field("assetCategory", "ASSETCATEGORY", "asset_category", validate=required,
+              lookup="category"),
+        Field("assetType", "ASSETTYPE", "asset_type"),
+        _date("acquisitionDate", "ACQUISITIONDATE", "acquisition_date"),
+        Field("currency", "CURRENCY", "currency", lookup="currency"),
+        _amount("orgCostValue", "ORGCOSTVALUE", "org_cost_value"),
+        _amount("usdCostValue", "USDCOSTVALUE", "usd_cost_value"),
+        _amount("tzsCostValue", "TZSCOSTVALUE", "tzs_cost_value"),
+        _amount("allowanceProbableLoss", "ALLOWANCEPROBABLELOSS", "allowance_probable_loss"),
+        _amount("botProvision", "BOTPROVISION", "bot_provision"),
+    ),
+    converted=money.ConvertedAmounts("orgCostValue", "currency", "usdCostValue", "tzsCostValue"),
+)
+
+# Every mapped source table by name
+TABLES: Dict[str, TableMapping] = {
+    mapping.table: mapping for mapping in (PERSONAL_DATA_INDIVIDUALS, ASSET_OWNED_OR_ACQUIRED)
+}
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Fixed-point amounts for MCB Data Integration
+Exact Decimal conversion of DB2 DECIMAL columns and FX derivation of USD/TZS values
+"""
+
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from typing import Any, Dict, Iterable, List, Optional
+
+from pipeline.records import RecordBatch
+
+# Scale of the DECIMAL(15,2) amount columns
+CENT = Decimal("0.01")
+
+# Value of a missing or unparsable amount, as before amounts became Decimals.
+# The bot_* amount columns are NOT NULL, and reports sum them without COALESCE.
+MISSING_AMOUNT = Decimal("0.00")
+
+# Currency the FX rates are quoted in: one unit of a currency costs rate TZS
+BASE_CURRENCY = "TZS"
+
+
+def to_amount(value: Any) -> Decimal:
+    """Exact amount; MISSING_AMOUNT for missing or unparsable values
+
+    ibm_db returns DECIMAL columns as strings, which convert exactly. Floats
+    go through their shortest repr, so 0.1 stays 0.1.
+    """
+    if value is None or value == "":
+        return MISSING_AMOUNT
+    if value.__class__ is Decimal:
+        return value
+    try:
+        amount = Decimal(str(value))
+    except InvalidOperation:
+        return MISSING_AMOUNT
+    return amount if amount.is_finite() else MISSING_AMOUNT
+
+
+def amount_column(values: Iterable[Any]) -> List[Decimal]:
+    """Convert a whole amount column of a batch
+
+    A column of well-formed values converts in one pass with no per-value
+    exception handling; only a column holding a NULL or junk value takes the
+    per-value path.
+    """
+    values = list(values)
+    try:
+        amounts = list(map(Decimal, map(str, values)))
+    except InvalidOperation:
+        return list(map(to_amount, values))
+    if all(map(Decimal.is_finite, amounts)):
+        return amounts
+    return list(map(to_amount, values))
+
+
+@dataclass(frozen=True)
+class ConvertedAmounts:
+    """Batch columns of an amount, its currency, and its USD and TZS equivalents"""
+    amount: str
+    currency: str
+    usd: str
+    tzs: str
+
+
+def parse_rates(rates: Dict[str, Any]) -> Dict[str, Decimal]:
+    """{currency: TZS per unit} as Decimals, dropping unparsable or non-positive rates"""
+    parsed = {BASE_CURRENCY: Decimal(1)}
+    for currency, rate in rates.items():
+        value = to_amount(rate)
+        if value > 0:
+            parsed[currency] = value
+    return parsed
+
+
+def derive_converted(batch: RecordBatch, columns: ConvertedAmounts, rates: Dict[str, Decimal]) -> int:
+    """Fill zero USD/TZS values from a non-zero amount and its currency, in place
+
+    A missing source value loads as zero, so zero counts as empty. Rows
+    whose currency has no rate keep their zero values. Derived
+    values are rounded half-up to cents. Returns the number of values filled.
+    """
+    if columns.amount not in batch.keys or columns.currency not in batch.keys:
+        return 0
+    usd_rate = rates.get("USD")
+    amounts = batch.column(columns.amount)
+    currencies = batch.column(columns.currency)
+    filled = 0
+    for key, divisor in ((columns.tzs, Decimal(1)), (columns.usd, usd_rate)):
+        if key not in batch.keys or divisor is None:
+            continue
+        target = batch.column(key)
+        if all(target):
+            continue
+        # One factor per currency in the batch, not per row
+        factors: Dict[Any, Optional[Decimal]] = {}
+        for i, value in enumerate(target):
+            if value or not amounts[i]:
+                continue
+            currency = currencies[i]
+            if currency not in factors:
+                rate = rates.get(currency)
+                factors[currency] = None if rate is None else rate / divisor
+            factor = factors[currency]
+            if factor is not None:
+                target[i] = (amounts[i] * factor).quantize(CENT, rounding=ROUND_HALF_UP)
+                filled += 1
+    return filled
+
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Single round-trip multi-table fetch for MCB Data Integration
+One stored procedure call returns the next keyset page of every polled table
+"""
+
+import logging
+from typing import Dict, List, Sequence, Tuple
+
+import ibm_db
+
+from pipeline import db2_fetch, keyset
+
+logger = logging.getLogger(__name__)
+
+PROCEDURE = "POLL_CHANGES"
+
+Page = Tuple[Dict[str, int], List[tuple], keyset.KeysetCursor, bool]
+
+
+def _bind_markers(query: str, names: Sequence[str]) -> str:
+    """Replace ? parameter markers, in order, with procedure parameter names"""
+    parts = query.split("?")
+    if len(parts) != len(names) + 1:
+        raise ValueError(f"Expected {len(names)} parameter markers, found {len(parts) - 1}")
+    bound = parts[0]
+    for name, part in zip(names, parts[1:]):
+        bound += name + part
+    return bound
+
+
+def procedure_ddl(tables: Sequence[Tuple[str, str]], page_size: int,
+                  name: str = PROCEDURE, schema: str = keyset.SCHEMA) -> str:
+    """CREATE PROCEDURE returning one keyset page result set per (table, columns)
+
+    The procedure takes (created, key) cursor parameters per table, in order,
+    and opens the same page query the poller runs, so result sets decode
+    exactly like single-table pages.
+    """
+    params = []
+    cursors = []
+    for n, (table, columns) in enumerate(tables, start=1):
+        created, key = f"P{n}_CREATED", f"P{n}_KEY"
+        params += [f"IN {created} TIMESTAMP", f"IN {key} BIGINT"]
+        query = _bind_markers(keyset.build_page_query(table, columns, page_size), [created, created, key])
+        cursors.append((f"C{n}", query.strip()))
+
+    declare = "\n".join(
+        f"    DECLARE {cur} CURSOR WITH RETURN TO CLIENT FOR\n        {query};" for cur, query in cursors
+    )
+    open_all = "\n".join(f"    OPEN {cur};" for cur, _ in cursors)
+    return (
+        f"CREATE OR REPLACE PROCEDURE {schema}.{name} ({', '.join(params)})\n"
+        f"    LANGUAGE SQL\n"
+        f"    READS SQL DATA\n"
+        f"    DYNAMIC RESULT SETS {len(cursors)}\n"
+        f"BEGIN\n{declare}\n{open_all}\nEND"
+    )
+
+
+def install_procedure(conn, tables: Sequence[Tuple[str, str]], page_size: int,
+                      name: str = PROCEDURE, schema: str = keyset.SCHEMA) -> bool:
+    """Create or replace the poll procedure; False if DB2 rejects it"""
+    try:
+        if ibm_db.exec_immediate(conn, procedure_ddl(tables, page_size, name, schema)) is False:
+            return False
+    except Exception as e:
+        logger.error(f"Could not create {schema}.{name}: {e}")
+        return False
+    logger.info(f"Installed {schema}.{name} for {', '.join(t for t, _ in tables)}")
+    return True
+
+
+def _read_page(stmt, cursor: keyset.KeysetCursor, page_size: int, max_bytes: int) -> Page:
+    positions = db2_fetch.column_positions(stmt)
+    rows = next(db2_fetch.iter_chunks(stmt, page_size, max_bytes), [])
+    if not rows:
+        return positions, rows, cursor, False
+    last = rows[-1]
+    next_cursor = keyset.KeysetCursor.from_row(
+        last[positions[keyset.CREATED_ALIAS]], last[positions[keyset.KEY_ALIAS]]
+    )
+    more = len(rows) == page_size or (
+        max_bytes > 0 and sum(map(db2_fetch.estimate_row_bytes, rows)) >= max_bytes
+    )
+    return positions, rows, next_cursor, more
+
+
+def fetch_first_pages(conn, tables: Sequence[str], cursors: Dict[str, keyset.KeysetCursor],
+                      page_size: int, max_bytes: int = 0, name: str = PROCEDURE,
+                      schema: str = keyset.SCHEMA) -> Dict[str, Page]:
+    """Call the poll procedure once and decode its result sets into per-table pages
+
+    tables must be in the order the procedure was generated with; page_size
+    must match the size it was generated with. Returns
+    {table: (positions, rows, next cursor, more pages pending)}.
+    """
+    params = []
+    for table in tables:
+        cursor = cursors[table]
+        params += [cursor.created, cursor.key]
+
+    result = ibm_db.callproc(conn, f"{schema}.{name}", tuple(params))
+    stmt = result[0] if isinstance(result, tuple) else result
+    if not stmt:
+        raise RuntimeError(f"Call to {schema}.{name} failed")
+
+    pages = {}
+    current = stmt
+    try:
+        for n, table in enumerate(tables):
+            if n > 0:
+                current = ibm_db.next_result(stmt)
+                if not current:
+                    raise RuntimeError(f"{schema}.{name} returned {n} result sets, expected {len(tables)}")
+            pages[table] = _read_page(current, cursors[table], page_size, max_bytes)
+            if current is not stmt:
+                ibm_db.free_result(current)
+    finally:
+        ibm_db.free_result(stmt)
+    return pages
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Process-pool transform stage for MCB Data Integration
+Ships page chunks to worker processes as deduplicated columns and merges results in order
+"""
+
+import logging
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from pipeline import dead_letter, mappings
+from pipeline.records import RecordBatch, concat
+
+logger = logging.getLogger(__name__)
+
+# Compiled transforms in each worker process
+_compiled: Dict[tuple, Callable] = {}
+
+
+def dedupe(column: Sequence[Any]) -> Sequence[Any]:
+    """Share one object per distinct value so pickle sends each value once"""
+    seen: Dict[Any, Any] = {}
+    try:
+        return tuple([seen.setdefault(value, value) for value in column])
+    except TypeError:
+        # Unhashable values (e.g. LOB buffers) are sent as they are
+        return tuple(column)
+
+
+def pack(rows: Sequence[tuple], chunk_rows: int) -> List[Tuple[Sequence[Any], ...]]:
+    """Split a page into chunks of transposed, deduplicated columns"""
+    return [
+        tuple(dedupe(column) for column in zip(*rows[start:start + chunk_rows]))
+        for start in range(0, len(rows), chunk_rows)
+    ]
+
+
+def transform_chunk(table: str, positions: Dict[str, int], keys: Sequence[str],
+                    name: Callable[[mappings.Field], str], extra: Sequence[str],
+                    columns: Tuple[Sequence[Any], ...], values: Tuple[Any, ...]
+                    ) -> Tuple[Tuple[str, ...], List[list], List[Tuple[int, Tuple[str, str]]]]:
+    """Worker side: transform one chunk, return its keys and columns
+
+    A chunk that fails to transform is retried row by row; the positions of
+    the rows that still fail come back with their (error class, message).
+    """
+    key = (table, tuple(sorted(positions.items())), tuple(keys), name, tuple(extra))
+    build = _compiled.get(key)
+    if build is None:
+        build = mappings.TABLES[table].compile_batch(positions, keys, name=name, extra=extra, columnar_input=True)
+        _compiled[key] = build
+    errors: List[Tuple[int, Tuple[str, str]]] = []
+    try:
+        batch = build(columns, *values)
+    except Exception:
+        parts = []
+        for i in range(len(columns[0]) if columns else 0):
+            try:
+                parts.append(build(tuple(column[i:i + 1] for column in columns), *values))
+            except Exception as e:
+                errors.append((i, dead_letter.describe(e)))
+        batch = concat(parts) or build((), *values)
+    return batch.keys, batch.columns, errors
+
+
+class TransformPool:
+    """Parallel page transform over a pool of spawned worker processes
+
+    Each page is split into chunks of chunk_rows rows. Up to max_pages pages
+    are in flight at once, so the next page is fetched while earlier ones are
+    transformed. Pages come back in the order they went in, so checkpoints
+    stay ordered. Enrichment and validation are left to the caller, so they
+    run in the same order as the in-process transform.
+    """
+
+    def __init__(self, workers: int, chunk_rows: int = 1000, max_pages: int = 2):
+        self.workers = max(workers, 1)
+        self.chunk_rows = max(chunk_rows, 1)
+        self.max_pages = max(max_pages, 1)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Spawned so workers never inherit DB2 or PostgreSQL sockets
+            self._executor = ProcessPoolExecutor(
+                self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            logger.info(f"Started transform pool with {self.workers} workers")
+        return self._executor
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def transform_pages(self, table: str, keys: Sequence[str], name: Callable[[mappings.Field], str],
+                        pages: Iterable[Tuple[Dict[str, int], List[tuple], Any]],
+                        extra: Sequence[str] = (), values: Callable[[], Tuple[Any, ...]] = tuple,
+                        max_pages: Optional[int] = None) -> Iterator[Tuple[RecordBatch, List[Tuple[tuple, Tuple[str, str]]], Any]]:
+        """Yield (batch, untransformed, cursor) per page, in page order
+
+        untransformed holds (raw row, (error class, message)) for each row
+        that failed to transform. name must be a module-level function so it
+        can be sent to workers. values() supplies the extra column values for
+        each page. max_pages overrides the pool's read-ahead for this stream;
+        1 reads the next page only after the caller has consumed the last one.
+        """
+        pool = self._pool()
+        max_pages = max(max_pages or self.max_pages, 1)
+        pending: Deque[Tuple[List[Future], List[tuple], Any]] = deque()
+        for positions, rows, cursor in pages:
+            page_values = values()
+            futures = [
+                pool.submit(transform_chunk, table, positions, keys, name, extra, chunk, page_values)
+                for chunk in pack(rows, self.chunk_rows)
+            ]
+            pending.append((futures, rows, cursor))
+            if len(pending) >= max_pages:
+                yield self._collect(table, pending.popleft())
+        while pending:
+            yield self._collect(table, pending.popleft())
+
+    def _collect(self, table: str, page: Tuple[List[Future], List[tuple], Any]
+                 ) -> Tuple[RecordBatch, List[Tuple[tuple, Tuple[str, str]]], Any]:
+        futures, rows, cursor = page
+        parts, untransformed = [], []
+        for n, future in enumerate(futures):
+            names, columns, errors = future.result()
+            parts.append(RecordBatch(table, names, columns))
+            start = n * self.chunk_rows
+            untransformed.extend((rows[start + i], error) for i, error in errors)
+        return concat(parts) or RecordBatch(table, (), []), untransformed, cursor
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Compact record and batch types for MCB Data Integration
+Tuple-backed records and column-per-key batches instead of per-row dicts
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+
+class CompactRecord(tuple):
+    """Immutable row stored as a plain tuple, readable by key like a dict
+
+    Subclasses made by record_type() carry the field names once per class,
+    so a record costs one tuple instead of a dict with a key per column.
+    """
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+    _index: Dict[str, int] = {}
+
+    def __getitem__(self, key):
+        if key.__class__ is str:
+            return tuple.__getitem__(self, self._index[key])
+        return tuple.__getitem__(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        i = self._index.get(key)
+        return default if i is None else tuple.__getitem__(self, i)
+
+    def keys(self) -> Tuple[str, ...]:
+        return self._fields
+
+    def as_dict(self) -> Dict[str, Any]:
+        return dict(zip(self._fields, self))
+
+
+_record_types: Dict[Tuple[str, ...], type] = {}
+
+
+def record_type(keys: Sequence[str]) -> type:
+    """CompactRecord subclass for a field list (one class per distinct list)"""
+    keys = tuple(keys)
+    cls = _record_types.get(keys)
+    if cls is None:
+        cls = type("Record", (CompactRecord,), {
+            "__slots__": (), "_fields": keys, "_index": {k: i for i, k in enumerate(keys)},
+        })
+        _record_types[keys] = cls
+    return cls
+
+
+@dataclass
+class RecordBatch:
+    """Rows of one table held as one list per column"""
+    table: str
+    keys: Tuple[str, ...]
+    columns: List[list]
+    endpoint_id: Optional[str] = None
+    source_timestamp: Optional[str] = None
+    _index: Dict[str, int] = field(default_factory=dict, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.keys = tuple(self.keys)
+        self._index = {k: i for i, k in enumerate(self.keys)}
+
+    @classmethod
+    def from_rows(cls, table: str, keys: Sequence[str], rows: Sequence[Sequence[Any]],
+                  **kwargs) -> "RecordBatch":
+        """Batch from row tuples in key order"""
+        columns = [list(col) for col in zip(*rows)] if rows else [[] for _ in keys]
+        return cls(table, tuple(keys), columns, **kwargs)
+
+    @classmethod
+    def from_dicts(cls, table: str, rows: Sequence[Mapping[str, Any]],
+                   keys: Optional[Sequence[str]] = None, **kwargs) -> "RecordBatch":
+        """Batch from dict rows; keys default to the first row's"""
+        keys = tuple(keys if keys is not None else (rows[0].keys() if rows else ()))
+        return cls(table, keys, [[row.get(k) for row in rows] for k in keys], **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.columns[0]) if self.columns else 0
+
+    def __iter__(self) -> Iterator[CompactRecord]:
+        return self.records()
+
+    def column(self, key: str) -> list:
+        return self.columns[self._index[key]]
+
+    def set_column(self, key: str, values: list):
+        if key in self._index:
+            self.columns[self._index[key]] = values
+        else:
+            self.keys += (key,)
+            self._index[key] = len(self.columns)
+            self.columns.append(values)
+
+    def rows(self) -> Iterator[tuple]:
+        """Row tuples in key order"""
+        return zip(*self.columns)
+
+    def records(self) -> Iterator[CompactRecord]:
+        return map(record_type(self.keys), self.rows())
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        keys = self.keys
+        return [dict(zip(keys, row)) for row in self.rows()]
+
+    def where(self, mask: Sequence[bool]) -> "RecordBatch":
+        """Rows whose mask entry is true, as a new batch"""
+        if all(mask):
+            return self
+        keep = [i for i, ok in enumerate(mask) if ok]
+        return RecordBatch(
+            self.table, self.keys, [[col[i] for i in keep] for col in self.columns],
+            self.endpoint_id, self.source_timestamp,
+        )
+
+    def slice(self, start: int, stop: int) -> "RecordBatch":
+        return RecordBatch(
+            self.table, self.keys, [col[start:stop] for col in self.columns],
+            self.endpoint_id, self.source_timestamp,
+        )
+
+
+def concat(batches: Iterable[RecordBatch]) -> Optional[RecordBatch]:
+    """Join batches of the same table and keys, in order"""
+    merged = None
+    for batch in batches:
+        if merged is None:
+            merged = RecordBatch(batch.table, batch.keys, [list(col) for col in batch.columns],
+                                 batch.endpoint_id, batch.source_timestamp)
+        else:
+            for col, extra in zip(merged.columns, batch.columns):
+                col.extend(extra)
+    return merged
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Reference-data cache for MCB Data Integration
+Bulk-loaded lookup tables (currency, country, region, category, FX rates) with TTL and version invalidation
+"""
+
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from pipeline import money
+from pipeline.records import RecordBatch
+
+logger = logging.getLogger(__name__)
+
+# fx_rate maps a currency code to its rate in money.BASE_CURRENCY
+DOMAINS = ("currency", "country", "region", "category", "fx_rate")
+
+# One row per (domain, code); value is what the code is normalised to, or the FX rate
+TABLE_DDL = """
+CREATE TABLE IF NOT EXISTS bot_reference_data (
+    domain VARCHAR(50) NOT NULL,
+    code VARCHAR(100) NOT NULL,
+    value VARCHAR(255),
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (domain, code)
+)
+"""
+LOAD_QUERY = "SELECT domain, code, value FROM bot_reference_data"
+# Changes on any insert, update or delete that touches updated_at
+VERSION_QUERY = "SELECT COUNT(*), MAX(updated_at) FROM bot_reference_data"
+
+Tables = Dict[str, Dict[Any, Any]]
+
+
+class ReferenceCache:
+    """In-process lookup tables, loaded in bulk and never queried per row
+
+    load() returns every (domain, code, value) row; version() returns a
+    cheap token that changes whenever the data does. refresh() checks the
+    version at most every check_interval seconds and reloads on a change,
+    or unconditionally once the data is older than ttl.
+
+    With a snapshot_path, a reload is first served from the JSON snapshot
+    written by whichever process last loaded the same version, so worker
+    processes share one bulk query. The file is replaced atomically, so
+    readers never see a partial snapshot, and is only read from a directory
+    and file owned by this user that nobody else can write.
+    """
+
+    def __init__(self, load: Callable[[], Iterable[Tuple[str, Any, Any]]],
+                 version: Callable[[], Any], ttl: float = 3600.0, check_interval: float = 60.0,
+                 snapshot_path: Optional[str] = None,
+                 on_reload: Optional[Callable[[str, float, int], None]] = None,
+                 on_lookup: Optional[Callable[[str, int, int], None]] = None,
+                 clock: Callable[[], float] = time.time):
+        self.load = load
+        self.version = version
+        self.ttl = ttl
+        self.check_interval = check_interval
+        self.snapshot_path = snapshot_path
+        self.on_reload = on_reload
+        self.on_lookup = on_lookup
+        self.clock = clock
+        self.tables: Tables = {}
+        self.loaded_version: Any = None
+        self.loaded_at: Optional[float] = None
+        self.checked_at: Optional[float] = None
+        self.reloads = 0
+        self.last_reload_seconds = 0.0
+        self.hits = 0
+        self.misses = 0
+        self._rates: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_env(cls, load: Callable[[], Iterable[Tuple[str, Any, Any]]],
+                 version: Callable[[], Any], **kwargs) -> "ReferenceCache":
+        """Cache configured from REFERENCE_CACHE_* environment variables"""
+        return cls(
+            load, version,
+            ttl=float(os.getenv("REFERENCE_CACHE_TTL", "3600")),
+            check_interval=float(os.getenv("REFERENCE_CACHE_CHECK_INTERVAL", "60")),
+            snapshot_path=os.getenv(
+                "REFERENCE_CACHE_PATH",
+                os.path.join(tempfile.gettempdir(), f"mcb-{os.getuid()}", "reference.json"),
+            ) or None,
+            **kwargs,
+        )
+
+    def refresh(self, force: bool = False) -> bool:
+        """Reload if the data changed or expired; True if a reload happened
+
+        Cheap between checks: one clock read. Expiry is noticed at the next
+        check. A failed version check or load keeps serving the current tables.
+        """
+        now = self.clock()
+        if not force and self.checked_at is not None and now - self.checked_at < self.check_interval:
+            return False
+        self.checked_at = now
+        expired = self.loaded_at is None or now - self.loaded_at >= self.ttl
+        try:
+            version = self.version()
+        except Exception as e:
+            logger.error(f"Reference data version check failed: {e}")
+            return False
+        if not (force or expired) and version == self.loaded_version:
+            return False
+
+        started = time.perf_counter()
+        source = "snapshot"
+        tables = None if force else self._read_snapshot(version, now)
+        if tables is None:
+            source = "database"
+            try:
+                tables = self._load_tables()
+            except Exception as e:
+                logger.error(f"Reference data load failed: {e}")
+                return False
+            self._write_snapshot(version, now, tables)
+            self.loaded_at = now
+        self.tables = tables
+        self.loaded_version = version
+        self._rates = None
+        self.reloads += 1
+        self.last_reload_seconds = time.perf_counter() - started
+        entries = sum(len(t) for t in tables.values())
+        logger.info(
+            f"Loaded {entries} reference entries from {source} in {self.last_reload_seconds:.3f}s"
+        )
+        if self.on_reload:
+            self.on_reload(source, self.last_reload_seconds, entries)
+        return True
+
+    def _load_tables(self) -> Tables:
+        tables: Tables = {domain: {} for domain in DOMAINS}
+        for domain, code, value in self.load():
+            tables.setdefault(domain, {})[code] = value
+        return tables
+
+    def _read_snapshot(self, version: Any, now: float) -> Optional[Tables]:
+        """Tables from a snapshot of this version younger than ttl, else None"""
+        if not self.snapshot_path:
+            return None
+        try:
+            if not (_private(os.path.dirname(self.snapshot_path) or ".") and _private(self.snapshot_path)):
+                logger.warning(f"Ignoring reference snapshot {self.snapshot_path}: writable by another user")
+                return None
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            # Missing, empty or torn snapshot: load from the database instead
+            return None
+        if snapshot.get("version") != str(version) or now - snapshot.get("loaded_at", 0) >= self.ttl:
+            return None
+        self.loaded_at = snapshot["loaded_at"]
+        return snapshot["tables"]
+
+    def _write_snapshot(self, version: Any, now: float, tables: Tables):
+        if not self.snapshot_path:
+            return
+        directory = os.path.dirname(self.snapshot_path) or "."
+        try:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            if not _private(directory):
+                logger.warning(f"Not writing reference snapshot: {directory} is writable by another user")
+                return
+            # mkstemp creates the file with mode 0600
+            fd, tmp = tempfile.mkstemp(dir=directory, prefix=".reference-")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"version": str(version), "loaded_at": now, "tables": tables}, f)
+            os.replace(tmp, self.snapshot_path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not write reference snapshot {self.snapshot_path}: {e}")
+
+    def lookup(self, domain: str, code: Any, default: Any = None) -> Any:
+        return self.tables.get(domain, {}).get(code, default)
+
+    def fx_rates(self) -> Dict[str, Any]:
+        """FX rates as Decimals, parsed once per reload"""
+        if self._rates is None:
+            self._rates = money.parse_rates(self.tables.get("fx_rate", {}))
+        return self._rates
+
+    def map_column(self, domain: str, values: Sequence[Any]) -> List[Any]:
+        """Normalise a column through a lookup table; unknown codes pass through"""
+        table = self.tables.get(domain)
+        if not table:
+            return list(values)
+        get = table.get
+        mapped = [get(value, value) for value in values]
+        hits = sum(map(table.__contains__, values))
+        misses = sum(map(bool, values)) - hits
+        self.hits += hits
+        self.misses += misses
+        if self.on_lookup:
+            self.on_lookup(domain, hits, misses)
+        return mapped
+
+    def enrich(self, batch: RecordBatch, lookups: Dict[str, str]) -> RecordBatch:
+        """Map each batch column named in lookups ({column: domain}) in place"""
+        for column, domain in lookups.items():
+            if column in batch.keys:
+                batch.set_column(column, self.map_column(domain, batch.column(column)))
+        return batch
+
+    def stats(self) -> Dict[str, Any]:
+        looked_up = self.hits + self.misses
+        return {
+            "version": str(self.loaded_version),
+            "entries": {domain: len(table) for domain, table in self.tables.items()},
+            "reloads": self.reloads,
+            "last_reload_seconds": round(self.last_reload_seconds, 4),
+            "hit_rate": round(self.hits / looked_up, 4) if looked_up else None,
+        }
+
+
+def _private(path: str) -> bool:
+    """Owned by this user and not writable by group or others"""
+    st = os.stat(path)
+    return st.st_uid == os.getuid() and not st.st_mode & 0o022
+
+
+def metrics_callbacks(metrics_collector) -> Dict[str, Callable]:
+    """on_reload/on_lookup keyword arguments recording into MCBMetricsCollector"""
+    return {
+        "on_reload": metrics_collector.record_reference_reload,
+        "on_lookup": metrics_collector.record_reference_lookups,
+    }
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Adaptive poll scheduling for MCB Data Integration
+Per-table intervals learned from each table's change rate
+"""
+
+import time
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TableSchedule:
+    """Polling state of one source table
+
+    The interval aims to collect about target_rows changes per poll, using an
+    exponentially weighted moving average of the observed change rate. A poll
+    whose last page came back full is repeated immediately, since more rows
+    are waiting; quiet polls stretch the interval by at most `backoff` per
+    step; errors back off exponentially.
+    """
+    min_interval: float = 1.0
+    max_interval: float = 300.0
+    target_rows: int = 1000
+    alpha: float = 0.3
+    backoff: float = 1.5
+    interval: float = 30.0
+    rate: float = 0.0
+    lag: float = 0.0
+    errors: int = 0
+    last_poll: float = 0.0
+    due_at: float = 0.0
+
+    def record_success(self, rows: int, lag: float = 0.0, now: Optional[float] = None,
+                       full: bool = False) -> float:
+        """Update the rate estimate after a poll; returns the delay until the next one
+
+        full tells whether the poll's last page came back full.
+        """
+        now = time.monotonic() if now is None else now
+        if self.last_poll:
+            elapsed = max(now - self.last_poll, 1e-3)
+            self.rate = self.alpha * (rows / elapsed) + (1 - self.alpha) * self.rate
+        self.last_poll = now
+        self.lag = lag
+        self.errors = 0
+
+        if full:
+            # Rows are still waiting past the last page
+            delay = 0.0
+        else:
+            desired = self.target_rows / self.rate if self.rate > 0 else self.max_interval
+            if desired > self.interval:
+                desired = min(desired, max(self.interval, self.min_interval) * self.backoff)
+            delay = desired
+        self.interval = min(max(delay, self.min_interval), self.max_interval)
+        if delay > 0:
+            delay = self.interval
+        self.due_at = now + delay
+        return delay
+
+    def record_error(self, now: Optional[float] = None) -> float:
+        """Back off exponentially after a failed poll; returns the delay"""
+        now = time.monotonic() if now is None else now
+        self.errors += 1
+        delay = min(max(self.interval, self.min_interval) * 2 ** self.errors, self.max_interval)
+        self.due_at = now + delay
+        return delay
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "interval_seconds": round(self.interval, 3),
+            "change_rate": round(self.rate, 3),
+            "lag_seconds": round(self.lag, 3),
+            "errors": self.errors,
+        }
+
+
+@dataclass
+class PollScheduler:
+    """Decides which tables are due and how long to sleep until the next one"""
+    tables: Dict[str, TableSchedule] = field(default_factory=dict)
+
+    @classmethod
+    def for_tables(cls, names: Iterable[str], **settings) -> "PollScheduler":
+        return cls({name: TableSchedule(**settings) for name in names})
+
+    def due(self, now: Optional[float] = None) -> List[str]:
+        """Tables whose next poll time has passed, most overdue first"""
+        now = time.monotonic() if now is None else now
+        ready = [name for name, sched in self.tables.items() if sched.due_at <= now]
+        return sorted(ready, key=lambda name: self.tables[name].due_at)
+
+    def time_until_next(self, now: Optional[float] = None) -> float:
+        now = time.monotonic() if now is None else now
+        if not self.tables:
+            return 0.0
+        return max(min(s.due_at for s in self.tables.values()) - now, 0.0)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        return {name: sched.snapshot() for name, sched in self.tables.items()}
@@ -0,0 +1,273 @@
+"""
+Parallel range-partitioned backfill for CBS_SCHEMA tables.
+
+Splits a source table into CREATEDDATE ranges (or key-hash buckets) and
+extracts them concurrently, one worker process per DB2/PostgreSQL
+connection pair. Every page is checkpointed per range, so re-running with
+the same --backfill-id resumes a crashed backfill where each range stopped.
+
+    python poller/backfill.py --table PERSONAL_DATA_INDIVIDUALS --workers 8 --ranges 32
+"""
+
+import argparse
+import logging
+import multiprocessing
+import sys
+import time
+from datetime import datetime
+
+import ibm_db
+
+import bot_poller
+from pipeline import keyset
+
+logger = logging.getLogger('backfill')
+
+
+def ensure_backfill_table(cursor):
+    # One row per range: its bounds, keyset cursor and progress
+    cursor.execute(
+        """
+    CREATE TABLE IF NOT EXISTS poller_backfill_ranges (
+        backfill_id VARCHAR(100) NOT NULL,
+        table_name VARCHAR(100) NOT NULL,
+        range_no INTEGER NOT NULL,
+        lower_bound TIMESTAMP,
+        upper_bound TIMESTAMP,
+        upper_inclusive BOOLEAN DEFAULT FALSE,
+        hash_buckets INTEGER DEFAULT 0,
+        last_poll_timestamp TIMESTAMP,
+        last_key BIGINT,
+        rows_loaded BIGINT DEFAULT 0,
+        status VARCHAR(20) DEFAULT 'pending',
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (backfill_id, table_name, range_no)
+    );
+    """
+    )
+
+
+def get_created_bounds(table):
+    # Oldest and newest CREATEDDATE currently in the source table
+    with bot_poller.db2_pool.connection() as conn:
+        stmt = ibm_db.exec_immediate(
+            conn,
+            f"SELECT MIN(CREATEDDATE), MAX(CREATEDDATE) FROM {keyset.SCHEMA}.{table}"
+        )
+        row = ibm_db.fetch_tuple(stmt)
+        ibm_db.free_result(stmt)
+    if not row or row[0] is None:
+        return None, None
+    return row[0], row[1]
+
+
+def plan_ranges(backfill_id, table, ranges, split):
+    # Record the ranges of a new backfill; an existing plan is kept as-is for resume
+    cursor = bot_poller.pg_cursor
+    cursor.execute(
+        "SELECT COUNT(*) FROM poller_backfill_ranges WHERE backfill_id = %s AND table_name = %s",
+        (backfill_id, table)
+    )
+    if cursor.fetchone()[0]:
+        logger.info(f"Resuming backfill {backfill_id} for {table}")
+        return
+
+    lower, upper = get_created_bounds(table)
+    if lower is None:
+        logger.info(f"{table} is empty, nothing to backfill")
+        return
+
+    rows = []
+    if split == "hash":
+        # Same time span for every bucket; MOD(row key) spreads skewed data evenly
+        for n in range(ranges):
+            rows.append((n, lower, upper, True, ranges))
+    else:
+        step = (upper - lower) / ranges
+        for n in range(ranges):
+            range_lower = lower + step * n
+            last = n == ranges - 1
+            range_upper = upper if last else lower + step * (n + 1)
+            rows.append((n, range_lower, range_upper, last, 0))
+
+    for range_no, range_lower, range_upper, inclusive, buckets in rows:
+        cursor.execute(
+            """
+            INSERT INTO poller_backfill_ranges
+                (backfill_id, table_name, range_no, lower_bound, upper_bound,
+                 upper_inclusive, hash_buckets)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """,
+            (backfill_id, table, range_no, range_lower, range_upper, inclusive, buckets)
+        )
+    bot_poller.pg_conn.commit()
+    logger.info(f"Planned {len(rows)} {split} ranges for {table} ({lower} .. {upper})")
+
+
+def load_range_state(backfill_id, table, range_no):
+    bot_poller.pg_cursor.execute(
+        """
+        SELECT lower_bound, upper_bound, upper_inclusive, hash_buckets,
+               last_poll_timestamp, last_key, rows_loaded, status
+        FROM poller_backfill_ranges
+        WHERE backfill_id = %s AND table_name = %s AND range_no = %s
+        """,
+        (backfill_id, table, range_no)
+    )
+    return bot_poller.pg_cursor.fetchone()
+
+
+def save_range_checkpoint(backfill_id, table, range_no, cursor, rows_loaded, status):
+    # Commits the pending page together with the range cursor
+    bot_poller.pg_cursor.execute(
+        """
+        UPDATE poller_backfill_ranges
+        SET last_poll_timestamp = %s, last_key = %s, rows_loaded = %s,
+            status = %s, updated_at = CURRENT_TIMESTAMP
+        WHERE backfill_id = %s AND table_name = %s AND range_no = %s
+        """,
+        (datetime.strptime(cursor.created, keyset.DB2_TIMESTAMP_FORMAT), cursor.key,
+         rows_loaded, status, backfill_id, table, range_no)
+    )
+    bot_poller.pg_conn.commit()
+
+
+def init_worker():
+    # Each worker process holds its own DB2 and PostgreSQL connections.
+    # Pool workers are daemonic and cannot start a transform pool of their
+    # own; --workers already spreads the transform across processes.
+    bot_poller.transform_workers = 0
+    bot_poller.open_connections()
+
+
+def run_range(task):
+    backfill_id, table, range_no = task
+    target_table, poll_fn, _ = bot_poller.POLL_TABLES[table]
+
+    state = load_range_state(backfill_id, table, range_no)
+    lower, upper, inclusive, buckets, last_ts, last_key, rows_loaded, status = state
+    if status == "done":
+        return range_no, 0
+
+    if last_ts is not None:
+        cursor = keyset.KeysetCursor(last_ts.strftime(keyset.DB2_TIMESTAMP_FORMAT), last_key)
+    else:
+        # Row keys are non-negative, so -1 includes every row at the lower bound
+        cursor = keyset.KeysetCursor(lower.strftime(keyset.DB2_TIMESTAMP_FORMAT), -1)
+    bounds = keyset.RangeBounds(
+        upper=upper.strftime(keyset.DB2_TIMESTAMP_FORMAT),
+        upper_inclusive=inclusive,
+        buckets=buckets,
+        bucket=range_no if buckets else 0,
+    )
+
+    loaded = 0
+    try:
+        for rows, next_cursor in poll_fn(cursor, bounds):
+            if not bot_poller.insert_to_pg(target_table, rows, commit=False,
+                                           batch_id=bot_poller.page_id(table, next_cursor)):
+                raise RuntimeError(f"Insert failed for {table} range {range_no}")
+            loaded += len(rows)
+            cursor = next_cursor
+            save_range_checkpoint(backfill_id, table, range_no, cursor, rows_loaded + loaded, "running")
+    except Exception:
+        # Only a stream that ran out is done; a failed range resumes from its
+        # last committed page, and blocks advance_poller_tracking until then
+        bot_poller.pg_conn.rollback()
+        save_range_checkpoint(backfill_id, table, range_no, cursor, rows_loaded + loaded, "failed")
+        raise
+
+    save_range_checkpoint(backfill_id, table, range_no, cursor, rows_loaded + loaded, "done")
+    logger.info(f"{table} range {range_no} done ({rows_loaded + loaded} rows)")
+    return range_no, loaded
+
+
+def advance_poller_tracking(backfill_id, table):
+    # Once every range is done, start incremental polling after the backfilled span
+    cursor = bot_poller.pg_cursor
+    cursor.execute(
+        """
+        SELECT COUNT(*) FILTER (WHERE status <> 'done'), MAX(upper_bound)
+        FROM poller_backfill_ranges
+        WHERE backfill_id = %s AND table_name = %s
+        """,
+        (backfill_id, table)
+    )
+    pending, upper = cursor.fetchone()
+    if pending or upper is None:
+        logger.warning(f"Backfill {backfill_id} for {table} has {pending} unfinished ranges")
+        return False
+
+    current = bot_poller.get_last_poll_cursor(table)
+    if current.created >= upper.strftime(keyset.DB2_TIMESTAMP_FORMAT):
+        return True
+    bot_poller.update_poller_tracking(
+        table, keyset.KeysetCursor(upper.strftime(keyset.DB2_TIMESTAMP_FORMAT), keyset.MAX_KEY)
+    )
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parallel range-partitioned backfill")
+    parser.add_argument("--table", required=True, choices=sorted(bot_poller.POLL_TABLES))
+    parser.add_argument("--workers", type=int, default=4, help="concurrent DB2 connections")
+    parser.add_argument("--ranges", type=int, default=16, help="number of ranges to split into")
+    parser.add_argument("--split", choices=("time", "hash"), default="time",
+                        help="CREATEDDATE ranges or row-key hash buckets")
+    parser.add_argument("--backfill-id", default=None,
+                        help="re-use an existing id to resume; defaults to a new timestamped id")
+    parser.add_argument("--no-advance", action="store_true",
+                        help="leave the incremental poller checkpoint untouched")
+    args = parser.parse_args(argv)
+
+    backfill_id = args.backfill_id or f"{args.table.lower()}-{datetime.now():%Y%m%d%H%M%S}"
+
+    bot_poller.open_connections()
+    bot_poller.ensure_pg_tables()
+    ensure_backfill_table(bot_poller.pg_cursor)
+    bot_poller.pg_conn.commit()
+    plan_ranges(backfill_id, args.table, args.ranges, args.split)
+
+    bot_poller.pg_cursor.execute(
+        """
+        SELECT range_no FROM poller_backfill_ranges
+        WHERE backfill_id = %s AND table_name = %s AND status <> 'done'
+        ORDER BY range_no
+        """,
+        (backfill_id, args.table)
+    )
+    tasks = [(backfill_id, args.table, row[0]) for row in bot_poller.pg_cursor.fetchall()]
+    logger.info(f"Backfill {backfill_id}: {len(tasks)} ranges over {args.workers} workers")
+
+    started = time.time()
+    total = 0
+    failed = 0
+    # Spawned (not forked) workers so no process inherits another's DB sockets
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(args.workers, initializer=init_worker) as pool:
+        results = pool.imap_unordered(run_range, tasks)
+        while True:
+            try:
+                range_no, loaded = next(results)
+            except StopIteration:
+                break
+            except Exception as e:
+                failed += 1
+                logger.error(f"Backfill range failed: {e}")
+                continue
+            total += loaded
+
+    elapsed = time.time() - started
+    rate = total / elapsed if elapsed > 0 else 0
+    logger.info(f"Backfill {backfill_id} loaded {total} rows in {elapsed:.1f}s ({rate:.0f} rows/s)")
+
+    if failed:
+        logger.error(f"{failed} ranges failed; re-run with --backfill-id {backfill_id} to resume")
+        return 1
+    if not args.no_advance:
+        advance_poller_tracking(backfill_id, args.table)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
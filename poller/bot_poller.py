@@ -4,10 +4,22 @@ import json
 import time
 import os
 import logging
+import multiprocessing
 from datetime import datetime
 import sys
+from contextlib import contextmanager
 from typing import Optional, Dict, Any, List
 
+from pipeline import cdc, db2_fetch, dead_letter, isolation, keyset, mappings, money, multi_fetch, pg_copy, reference
+from pipeline.db2_governor import LoadGovernor, SharedThrottle
+from pipeline.db2_pool import DB2ConnectionPool
+from pipeline.parallel import TransformPool
+from pipeline.records import RecordBatch, concat
+from pipeline.reference import ReferenceCache
+from pipeline.scheduler import PollScheduler
+from pipeline.validation import BatchValidator, metrics_reporter
+from monitoring.metrics_collector import MCBMetricsCollector
+
 
 # Configure logging
 logging.basicConfig(
@@ -40,7 +52,7 @@ def connect_with_retry(connection_func, max_retries=10, initial_delay=5):
 
 # DB2 connection with retry
 def connect_db2():
-    DB2_CONN_STR = f"DATABASE={os.getenv('DB2_DBNAME')};HOSTNAME={os.getenv('DB2_HOST')};PORT={os.getenv('DB2_PORT')};PROTOCOL=TCPIP;UID={os.getenv('DB2_USER')};PWD={os.getenv('DB2_PASSWORD')};"
+    DB2_CONN_STR = f"DATABASE={os.getenv('DB2_DBNAME')};HOSTNAME={os.getenv('DB2_HOST')};PORT={os.getenv('DB2_PORT')};PROTOCOL=TCPIP;UID={os.getenv('DB2_USER')};PWD={os.getenv('DB2_PASSWORD')};{db2_fetch.block_fetch_keywords()}"
     logger.info(f"Connecting to DB2 at {os.getenv('DB2_HOST')}:{os.getenv('DB2_PORT')}")
     return ibm_db.connect(DB2_CONN_STR, "", "")
 
@@ -58,555 +70,845 @@ def connect_postgres():
     return conn
 
 
-print("Connecting to databases...")
-db2_conn = connect_with_retry(connect_db2)
-print("DB2 connection established!")
+# Connections are per process; worker processes open their own
+db2_pool = None
+db2_governor = None
+pg_conn = None
+pg_cursor = None
+reference_cache = None
+
+# Prometheus endpoint of this process; table workers listen on consecutive
+# ports from POLLER_METRICS_PORT. 0 leaves metrics to the log only.
+metrics_port = int(os.getenv("POLLER_METRICS_PORT", "0"))
+metrics_collector = None
+
+
+# Throttle level and page query slots shared by the table workers, and this worker's slot
+governor_throttle = None
+governor_slot = 0
 
-pg_conn = connect_with_retry(connect_postgres)
-if pg_conn is None:
-    logger.error("Failed to establish PostgreSQL connection")
-    sys.exit(1)
 
-pg_cursor = pg_conn.cursor()
-print("PostgreSQL connection established!")
+def start_metrics(offset=0):
+    global metrics_collector
+    if metrics_port and metrics_collector is None:
+        metrics_collector = MCBMetricsCollector(metrics_port + offset)
+
+
+def open_connections():
+    global db2_pool, db2_governor, pg_conn, pg_cursor, reference_cache
+    logger.info("Connecting to databases...")
+    # Page size and query pacing adapt to DB2 latency within DB2_GOVERNOR_WINDOWS
+    # (together with the other table workers when run under supervise_table_workers)
+    db2_governor = LoadGovernor.from_env(
+        chunk_max_rows, on_change=record_throttle_level, shared=governor_throttle, slot=governor_slot
+    )
+    # Warm DB2 connections are reused across polls instead of reconnecting
+    db2_pool = DB2ConnectionPool(
+        connect_db2,
+        min_size=db2_pool_min_size,
+        max_size=db2_pool_max_size,
+        max_idle=db2_pool_max_idle,
+        on_wait=record_pool_wait,
+        on_statement=record_statement_lookup,
+        name="bot_poller",
+    )
+    db2_pool.open()
+    connect_with_retry(check_db2_pool)
+    check_source_columns()
+    if poll_fetch == "procedure":
+        if poll_workers == "single" and poll_mode == "keyset":
+            install_poll_procedure()
+        else:
+            logger.warning("POLL_FETCH=procedure needs POLL_WORKERS=single and POLL_MODE=keyset, ignoring")
+    logger.info("DB2 connection established!")
+
+    pg_conn = connect_with_retry(connect_postgres)
+    if pg_conn is None:
+        logger.error("Failed to establish PostgreSQL connection")
+        sys.exit(1)
+
+    pg_cursor = pg_conn.cursor()
+    logger.info("PostgreSQL connection established!")
+
+    # Lookup tables are loaded in bulk and shared with the other poller
+    # processes through the REFERENCE_CACHE_PATH snapshot
+    # Rejected rows per rule go to mcb_validation_errors_total as well as the log
+    if metrics_collector is not None:
+        for table, validator in validators.items():
+            validator.on_reject = metrics_reporter(metrics_collector, "bot_poller", table)
+
+    reference_cache = ReferenceCache.from_env(
+        load_reference_rows, reference_version,
+        **(reference.metrics_callbacks(metrics_collector) if metrics_collector is not None else {})
+    )
+
 
-# Create PostgreSQL tables for the two main tables only
-pg_cursor.execute(
+def record_throttle_level(level):
+    if metrics_collector is not None:
+        metrics_collector.record_db2_throttle_level("bot_poller", level)
+
+
+# DB2 pool checkout waits with pool occupancy, and statement cache hits and misses
+def record_pool_wait(seconds):
+    if metrics_collector is not None:
+        metrics_collector.record_db2_pool_wait("bot_poller", seconds, db2_pool.stats())
+
+
+def record_statement_lookup(hit):
+    if metrics_collector is not None:
+        metrics_collector.record_db2_statement_lookup("bot_poller", hit)
+
+
+# Check out a pooled DB2 connection and run the (cached) test query on it
+def check_db2_pool():
+    with db2_pool.connection() as conn:
+        stmt = db2_pool.statements(conn).execute("SELECT 1 FROM SYSIBM.SYSDUMMY1")
+        ibm_db.free_result(stmt)
+
+
+# Create the PostgreSQL target and tracking tables
+def ensure_pg_tables():
+    # Create PostgreSQL tables for the two main tables only
+    pg_cursor.execute(
+        """
+    CREATE TABLE IF NOT EXISTS bot_personal_data_individuals (
+        reportingDate TIMESTAMP,
+        customerIdentificationNumber VARCHAR(50),
+        firstName VARCHAR(100),
+        middleNames VARCHAR(100),
+        surname VARCHAR(100),
+        gender VARCHAR(50),
+        dateOfBirth VARCHAR(12),
+        maritalStatus VARCHAR(50),
+        numberOfDependants INTEGER,
+        disabilityStatus VARCHAR(50),
+        disabilityType VARCHAR(50),
+        citizenship VARCHAR(50),
+        nationality VARCHAR(50),
+        residence VARCHAR(50),
+        residenceStatus VARCHAR(50),
+        employmentStatus VARCHAR(50),
+        occupation VARCHAR(50),
+        employerName VARCHAR(100),
+        employerAddress VARCHAR(200),
+        sectorEmployer VARCHAR(50),
+        incomeRange VARCHAR(50),
+        educationLevel VARCHAR(50),
+        identificationType VARCHAR(50),
+        identificationNumber VARCHAR(50),
+        issuingCountry VARCHAR(50),
+        issuingAuthority VARCHAR(100),
+        issueDate VARCHAR(12),
+        expiryDate VARCHAR(12),
+        mobileNumber VARCHAR(50),
+        altMobileNumber VARCHAR(50),
+        emailAddress VARCHAR(100),
+        altEmailAddress VARCHAR(100),
+        postalAddress VARCHAR(200),
+        physicalAddress VARCHAR(200),
+        region VARCHAR(50),
+        district VARCHAR(50),
+        ward VARCHAR(50),
+        street VARCHAR(100),
+        houseNumber VARCHAR(50),
+        postalCode VARCHAR(50),
+        country VARCHAR(50),
+        gpsCoordinates VARCHAR(50),
+        nextOfKinName VARCHAR(100),
+        nextOfKinRelationship VARCHAR(50),
+        nextOfKinMobileNumber VARCHAR(50),
+        nextOfKinEmailAddress VARCHAR(100),
+        nextOfKinAddress VARCHAR(200),
+        nextOfKinRegion VARCHAR(50),
+        nextOfKinDistrict VARCHAR(50),
+        nextOfKinWard VARCHAR(50),
+        nextOfKinStreet VARCHAR(100),
+        nextOfKinHouseNumber VARCHAR(50),
+        nextOfKinPostalCode VARCHAR(50),
+        nextOfKinCountry VARCHAR(50),
+        nextOfKinGpsCoordinates VARCHAR(50),
+        kycStatus VARCHAR(50),
+        kycDate VARCHAR(12),
+        kycExpiryDate VARCHAR(12),
+        riskRating VARCHAR(50),
+        riskRatingDate VARCHAR(12),
+        pepStatus VARCHAR(50),
+        pepClassification VARCHAR(50),
+        pepPosition VARCHAR(100),
+        pepCountry VARCHAR(50),
+        pepRelationship VARCHAR(50),
+        sanctionsStatus BOOLEAN,
+        sanctionsList VARCHAR(100),
+        sanctionsDate VARCHAR(12),
+        sanctionsCountry VARCHAR(50),
+        village VARCHAR(50)
+    );
     """
-CREATE TABLE IF NOT EXISTS bot_personal_data_individuals (
-    reportingDate TIMESTAMP,
-    customerIdentificationNumber VARCHAR(50),
-    firstName VARCHAR(100),
-    middleNames VARCHAR(100),
-    surname VARCHAR(100),
-    gender VARCHAR(50),
-    dateOfBirth VARCHAR(12),
-    maritalStatus VARCHAR(50),
-    numberOfDependants INTEGER,
-    disabilityStatus VARCHAR(50),
-    disabilityType VARCHAR(50),
-    citizenship VARCHAR(50),
-    nationality VARCHAR(50),
-    residence VARCHAR(50),
-    residenceStatus VARCHAR(50),
-    employmentStatus VARCHAR(50),
-    occupation VARCHAR(50),
-    employerName VARCHAR(100),
-    employerAddress VARCHAR(200),
-    sectorEmployer VARCHAR(50),
-    incomeRange VARCHAR(50),
-    educationLevel VARCHAR(50),
-    identificationType VARCHAR(50),
-    identificationNumber VARCHAR(50),
-    issuingCountry VARCHAR(50),
-    issuingAuthority VARCHAR(100),
-    issueDate VARCHAR(12),
-    expiryDate VARCHAR(12),
-    mobileNumber VARCHAR(50),
-    altMobileNumber VARCHAR(50),
-    emailAddress VARCHAR(100),
-    altEmailAddress VARCHAR(100),
-    postalAddress VARCHAR(200),
-    physicalAddress VARCHAR(200),
-    region VARCHAR(50),
-    district VARCHAR(50),
-    ward VARCHAR(50),
-    street VARCHAR(100),
-    houseNumber VARCHAR(50),
-    postalCode VARCHAR(50),
-    country VARCHAR(50),
-    gpsCoordinates VARCHAR(50),
-    nextOfKinName VARCHAR(100),
-    nextOfKinRelationship VARCHAR(50),
-    nextOfKinMobileNumber VARCHAR(50),
-    nextOfKinEmailAddress VARCHAR(100),
-    nextOfKinAddress VARCHAR(200),
-    nextOfKinRegion VARCHAR(50),
-    nextOfKinDistrict VARCHAR(50),
-    nextOfKinWard VARCHAR(50),
-    nextOfKinStreet VARCHAR(100),
-    nextOfKinHouseNumber VARCHAR(50),
-    nextOfKinPostalCode VARCHAR(50),
-    nextOfKinCountry VARCHAR(50),
-    nextOfKinGpsCoordinates VARCHAR(50),
-    kycStatus VARCHAR(50),
-    kycDate VARCHAR(12),
-    kycExpiryDate VARCHAR(12),
-    riskRating VARCHAR(50),
-    riskRatingDate VARCHAR(12),
-    pepStatus VARCHAR(50),
-    pepClassification VARCHAR(50),
-    pepPosition VARCHAR(100),
-    pepCountry VARCHAR(50),
-    pepRelationship VARCHAR(50),
-    sanctionsStatus BOOLEAN,
-    sanctionsList VARCHAR(100),
-    sanctionsDate VARCHAR(12),
-    sanctionsCountry VARCHAR(50),
-    village VARCHAR(50)
-);
-"""
-)
-pg_cursor.execute(
+    )
+    pg_cursor.execute(
+        """
+    CREATE TABLE IF NOT EXISTS bot_asset_owned_or_acquired (
+        reportingDate TIMESTAMP,
+        assetCategory VARCHAR(50),
+        assetType VARCHAR(50),
+        acquisitionDate TIMESTAMP,
+        currency VARCHAR(50),
+        orgCostValue NUMERIC,
+        usdCostValue NUMERIC,
+        tzsCostValue NUMERIC,
+        allowanceProbableLoss NUMERIC,
+        botProvision NUMERIC
+    );
     """
-CREATE TABLE IF NOT EXISTS bot_asset_owned_or_acquired (
-    reportingDate TIMESTAMP,
-    assetCategory VARCHAR(50),
-    assetType VARCHAR(50),
-    acquisitionDate TIMESTAMP,
-    currency VARCHAR(50),
-    orgCostValue NUMERIC,
-    usdCostValue NUMERIC,
-    tzsCostValue NUMERIC,
-    allowanceProbableLoss NUMERIC,
-    botProvision NUMERIC
-);
-"""
-)
+    )
 
-# Create a table to track when data was last pulled from DB2
-pg_cursor.execute(
+    # Create a table to track when data was last pulled from DB2
+    pg_cursor.execute(
+        """
+    CREATE TABLE IF NOT EXISTS poller_tracking (
+        id SERIAL PRIMARY KEY,
+        last_poll_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        poll_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
     """
-CREATE TABLE IF NOT EXISTS poller_tracking (
-    id SERIAL PRIMARY KEY,
-    last_poll_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    poll_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
-"""
-)
+    )
+    # Checkpoints are keyset cursors kept per source table so each stream advances independently
+    pg_cursor.execute(
+        "ALTER TABLE poller_tracking ADD COLUMN IF NOT EXISTS table_name VARCHAR(100)"
+    )
+    pg_cursor.execute(
+        "ALTER TABLE poller_tracking ADD COLUMN IF NOT EXISTS last_key BIGINT"
+    )
+    # Deleted source rows seen in CDC mode (targets are append-only)
+    pg_cursor.execute(
+        """
+    CREATE TABLE IF NOT EXISTS poller_cdc_deletes (
+        id SERIAL PRIMARY KEY,
+        table_name VARCHAR(100) NOT NULL,
+        change_seq BIGINT NOT NULL,
+        changed_at TIMESTAMP,
+        row_image JSONB,
+        recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    """
+    )
 
-pg_conn.commit()
+    # Lookup tables for enrichment (currency, country, region, category)
+    pg_cursor.execute(reference.TABLE_DDL)
 
+    # Rows that failed transform, validation or load, kept for replay
+    pg_cursor.execute(dead_letter.TABLE_DDL)
 
-# Simplified validation functions for the two main tables
+    # Adaptive scheduler state per table, read by the monitoring API
+    pg_cursor.execute(
+        """
+    CREATE TABLE IF NOT EXISTS poller_schedule (
+        table_name VARCHAR(100) PRIMARY KEY,
+        interval_seconds DOUBLE PRECISION,
+        change_rate DOUBLE PRECISION,
+        lag_seconds DOUBLE PRECISION,
+        errors INTEGER DEFAULT 0,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    """
+    )
 
+    pg_conn.commit()
 
-def validate_personal_individual(payload):
-    # Simplified validation - just check if customeridentificationnumber exists
-    if not payload.get("customeridentificationnumber"):
-        print(f"Invalid Personal Data Individuals: Missing customeridentificationnumber")
-        return False
-    return True
 
+# Mapped keys the poller loads per table; reportingdate is stamped at poll time instead
+POLLED_KEYS = {
+    table: mapping.keys(exclude=("reportingDate",)) for table, mapping in mappings.TABLES.items()
+}
 
-def validate_asset_owned_or_acquired(payload):
-    # Simplified validation - just check if assetcategory exists
-    if not payload.get("assetcategory"):
-        print(f"Invalid Asset Owned or Acquired: Missing assetcategory")
-        return False
-    return True
+# Mapped source columns per table; only these are selected from DB2
+SOURCE_COLUMNS = {
+    table: mappings.TABLES[table].source_columns(keys) for table, keys in POLLED_KEYS.items()
+}
+
+# SELECT lists checked against the DB2 catalog by check_source_columns()
+source_projections = {}
+
+
+# Build each table's projection from its mapping, dropping columns DB2 doesn't have
+def check_source_columns():
+    with db2_pool.connection() as conn:
+        for table, mapping in SOURCE_COLUMNS.items():
+            present = db2_fetch.check_mapping(conn, keyset.SCHEMA, table, mapping)
+            source_projections[table] = db2_fetch.select_list(present)
+            logger.info(f"Selecting {len(present)} of {len(mapping)} mapped columns from {table}")
+
+
+# Tables served by the multi-table poll procedure (POLL_FETCH=procedure), in parameter order
+procedure_tables = []
 
+# First page per table from the last procedure call: table -> (start cursor, page)
+prefetched_pages = {}
 
-# Helper function to safely convert to float
-def safe_float(value):
-    if value is None:
-        return 0.0
+
+# Create the poll procedure over every table's projection; falls back to per-table queries
+def install_poll_procedure():
+    global procedure_tables
+    tables = list(POLL_TABLES)
+    columns = [source_projections.get(t) or db2_fetch.select_list(SOURCE_COLUMNS[t]) for t in tables]
+    with db2_pool.connection() as conn:
+        if multi_fetch.install_procedure(conn, list(zip(tables, columns)), chunk_max_rows):
+            procedure_tables = tables
+        else:
+            logger.warning("Poll procedure unavailable, fetching each table separately")
+
+
+# Fetch the first page of every due table in one DB2 round trip
+def prefetch_first_pages(tables):
+    prefetched_pages.clear()
+    if not procedure_tables or len(tables) < 2:
+        return
+    cursors = {t: get_last_poll_cursor(t) for t in procedure_tables}
     try:
-        return float(value)
-    except (ValueError, TypeError):
-        return 0.0
+        with db2_pool.connection() as conn, db2_governor.query():
+            pages = multi_fetch.fetch_first_pages(
+                conn, procedure_tables, cursors, chunk_max_rows, chunk_max_bytes
+            )
+    except Exception as e:
+        logger.error(f"Poll procedure call failed, fetching tables separately: {e}")
+        return
+    for table in tables:
+        prefetched_pages[table] = (cursors[table], pages[table])
 
 
-# Helper function to safely convert to int
-def safe_int(value):
-    if value is None:
-        return 0
+# Stream a CBS_SCHEMA table in keyset pages of raw row tuples
+def stream_db2_table(table, cursor, bounds=None):
+    # Rows after the (CREATEDDATE, row key) cursor, oldest first; every page is a
+    # bounded index range scan so a large backlog drains at constant cost per page.
+    # bounds optionally restricts the scan to one backfill range.
+    if poll_mode == "cdc" and bounds is None:
+        yield from stream_change_journal(table, cursor)
+        return
+    prefetched = prefetched_pages.pop(table, None)
+    if prefetched is not None and bounds is None and prefetched[0] == cursor:
+        # Page already delivered by the poll procedure; page on from there only if it was full
+        positions, rows, cursor, more = prefetched[1]
+        if rows:
+            yield positions, rows, cursor
+        if not more:
+            return
+    logger.info(f"Polling {table} from cursor {cursor.encode()}")
     try:
-        return int(value)
-    except (ValueError, TypeError):
-        return 0
+        # The pooled connection stays checked out until the stream is drained
+        with db2_pool.connection() as conn:
+            columns = source_projections.get(table) or db2_fetch.select_list(SOURCE_COLUMNS[table])
+            yield from keyset.iter_pages(
+                conn, table, columns, cursor, chunk_max_rows, chunk_max_bytes, bounds,
+                statements=db2_pool.statements(conn), governor=db2_governor
+            )
+    except RuntimeError as e:
+        # Raised so the caller neither checkpoints past the failure nor counts it a success
+        logger.error(f"Failed to poll {table}: {e}")
+        raise
 
 
-# Helper function to convert DDMMYYYYHHMM format to timestamp
-def convert_ddmmyyyyhhmm_to_timestamp(date_str):
-    if not date_str or len(date_str) != 12:
-        return None
+# Stream a table's change journal (POLL_MODE=cdc) in pages of raw row tuples
+def stream_change_journal(table, cursor):
+    # Inserts and updates are yielded for transformation; deletes are recorded
+    # in poller_cdc_deletes with the same transaction as the page checkpoint.
+    # The cursor key is the journal sequence number.
+    logger.info(f"Reading {cdc.journal_table(table)} after sequence {cursor.key}")
     try:
-        # Parse DDMMYYYYHHMM format
-        day = int(date_str[0:2])
-        month = int(date_str[2:4])
-        year = int(date_str[4:8])
-        hour = int(date_str[8:10])
-        minute = int(date_str[10:12])
-        return datetime(year, month, day, hour, minute)
-    except (ValueError, TypeError):
-        return None
-
-
-# Polling and transformation for Personal Data Individuals
-def poll_and_transform_personal_individuals(last_timestamp):
-    if db2_conn is None:
-        logger.error("DB2 connection is None")
-        return []
-        
-    # Query records from DB2 that were created after the last poll timestamp
-    # Use a direct comparison without the TIMESTAMP function
-    query = "SELECT * FROM CBS_SCHEMA.PERSONAL_DATA_INDIVIDUALS WHERE CREATEDDATE > ?"
-    stmt = ibm_db.prepare(db2_conn, query)
-    
-    if stmt is False:
-        logger.error("Failed to prepare statement for PERSONAL_DATA_INDIVIDUALS")
-        return []
-    
-    # Properly handle the statement object
-    if stmt and stmt is not True and stmt is not False:
-        ibm_db.bind_param(stmt, 1, last_timestamp)
-        result = ibm_db.execute(stmt)
-        
-        if result is False:
-            logger.error("Failed to execute query for PERSONAL_DATA_INDIVIDUALS")
-            return []
-        
-        rows = []
-        while True:
-            try:
-                # Try to fetch row - ibm_db.fetch_row returns True on success, False on end of data
-                fetch_result = ibm_db.fetch_row(stmt)
-                if fetch_result is False:
-                    break  # No more rows
-                    
-                # Safely get results with error handling
-                def safe_result(col_name):
-                    try:
-                        return ibm_db.result(stmt, col_name)
-                    except Exception:
-                        return None
-
-                row = {
-                    "customerIdentificationNumber": safe_result("CUSTOMERIDENTIFICATIONNUMBER"),
-                    "firstName": safe_result("FIRSTNAME"),
-                    "middleNames": safe_result("MIDDLENAMES"),
-                    "surname": safe_result("SURNAME"),
-                    "gender": safe_result("GENDER"),
-                    "dateOfBirth": safe_result("DATEOFBIRTH"),
-                    "maritalStatus": safe_result("MARITALSTATUS"),
-                    "numberOfDependants": safe_result("NUMBEROFDEPENDANTS"),
-                    "disabilityStatus": safe_result("DISABILITYSTATUS"),
-                    "disabilityType": safe_result("DISABILITYTYPE"),
-                    "citizenship": safe_result("CITIZENSHIP"),
-                    "nationality": safe_result("NATIONALITY"),
-                    "residence": safe_result("RESIDENCE"),
-                    "residenceStatus": safe_result("RESIDENCESTATUS"),
-                    "employmentStatus": safe_result("EMPLOYMENTSTATUS"),
-                    "occupation": safe_result("OCCUPATION"),
-                    "employerName": safe_result("EMPLOYERNAME"),
-                    "employerAddress": safe_result("EMPLOYERADDRESS"),
-                    "sectorEmployer": safe_result("SECTOREMPLOYER"),
-                    "incomeRange": safe_result("INCOMERANGE"),
-                    "educationLevel": safe_result("EDUCATIONLEVEL"),
-                    "identificationType": safe_result("IDENTIFICATIONTYPE"),
-                    "identificationNumber": safe_result("IDENTIFICATIONNUMBER"),
-                    "issuingCountry": safe_result("ISSUINGCOUNTRY"),
-                    "issuingAuthority": safe_result("ISSUINGAUTHORITY"),
-                    "issueDate": safe_result("ISSUEDATE"),
-                    "expiryDate": safe_result("EXPIRYDATE"),
-                    "mobileNumber": safe_result("MOBILENUMBER"),
-                    "altMobileNumber": safe_result("ALTMOBILENUMBER"),
-                    "emailAddress": safe_result("EMAILADDRESS"),
-                    "altEmailAddress": safe_result("ALTEMAILADDRESS"),
-                    "postalAddress": safe_result("POSTALADDRESS"),
-                    "physicalAddress": safe_result("PHYSICALADDRESS"),
-                    "region": safe_result("REGION"),
-                    "district": safe_result("DISTRICT"),
-                    "ward": safe_result("WARD"),
-                    "street": safe_result("STREET"),
-                    "houseNumber": safe_result("HOUSENUMBER"),
-                    "postalCode": safe_result("POSTALCODE"),
-                    "country": safe_result("COUNTRY"),
-                    "gpsCoordinates": safe_result("GPSCOORDINATES"),
-                    "nextOfKinName": safe_result("NEXTOFKINNAME"),
-                    "nextOfKinRelationship": safe_result("NEXTOFKINRELATIONSHIP"),
-                    "nextOfKinMobileNumber": safe_result("NEXTOFKINMOBILENUMBER"),
-                    "nextOfKinEmailAddress": safe_result("NEXTOFKINEMAILADDRESS"),
-                    "nextOfKinAddress": safe_result("NEXTOFKINADDRESS"),
-                    "nextOfKinRegion": safe_result("NEXTOFKINREGION"),
-                    "nextOfKinDistrict": safe_result("NEXTOFKINDISTRICT"),
-                    "nextOfKinWard": safe_result("NEXTOFKINWARD"),
-                    "nextOfKinStreet": safe_result("NEXTOFKINSTREET"),
-                    "nextOfKinHouseNumber": safe_result("NEXTOFKINHOUSENUMBER"),
-                    "nextOfKinPostalCode": safe_result("NEXTOFKINPOSTALCODE"),
-                    "nextOfKinCountry": safe_result("NEXTOFKINCOUNTRY"),
-                    "nextOfKinGpsCoordinates": safe_result("NEXTOFKINGPSCOORDINATES"),
-                    "kycStatus": safe_result("KYCSTATUS"),
-                    "kycDate": safe_result("KYCDATE"),
-                    "kycExpiryDate": safe_result("KYCEXPIRYDATE"),
-                    "riskRating": safe_result("RISKRATING"),
-                    "riskRatingDate": safe_result("RISKRATINGDATE"),
-                    "pepStatus": safe_result("PEPSTATUS"),
-                    "pepClassification": safe_result("PEPCLASSIFICATION"),
-                    "pepPosition": safe_result("PEPPOSITION"),
-                    "pepCountry": safe_result("PEPCOUNTRY"),
-                    "pepRelationship": safe_result("PEPRELATIONSHIP"),
-                    "sanctionsStatus": safe_result("SANCTIONSSTATUS"),
-                    "sanctionsList": safe_result("SANCTIONSLIST"),
-                    "sanctionsDate": safe_result("SANCTIONSDATE"),
-                    "sanctionsCountry": safe_result("SANCTIONSCOUNTRY"),
-                    "village": safe_result("VILLAGE"),
-                }
-                # Simplified enriched data without lookups
-                enriched = {
-                    "reportingdate": datetime.now(),
-                    "customeridentificationnumber": row["customerIdentificationNumber"],
-                    "firstname": row["firstName"],
-                    "middlenames": row["middleNames"],
-                    "surname": row["surname"],
-                    "gender": row["gender"],
-                    "dateofbirth": convert_ddmmyyyyhhmm_to_timestamp(row["dateOfBirth"]),
-                    "maritalstatus": row["maritalStatus"],
-                    "numberofdependants": row["numberOfDependants"],
-                    "disabilitystatus": row["disabilityStatus"],
-                    "disabilitytype": row["disabilityType"],
-                    "citizenship": row["citizenship"],
-                    "nationality": row["nationality"],
-                    "residence": row["residence"],
-                    "residencestatus": row["residenceStatus"],
-                    "employmentstatus": row["employmentStatus"],
-                    "occupation": row["occupation"],
-                    "employername": row["employerName"],
-                    "employeraddress": row["employerAddress"],
-                    "sectoremployer": row["sectorEmployer"],
-                    "incomerange": row["incomeRange"],
-                    "educationlevel": row["educationLevel"],
-                    "identificationtype": row["identificationType"],
-                    "identificationnumber": row["identificationNumber"],
-                    "issuingcountry": row["issuingCountry"],
-                    "issuingauthority": row["issuingAuthority"],
-                    "issuedate": convert_ddmmyyyyhhmm_to_timestamp(row["issueDate"]),
-                    "expirydate": convert_ddmmyyyyhhmm_to_timestamp(row["expiryDate"]),
-                    "mobilenumber": row["mobileNumber"],
-                    "altmobilenumber": row["altMobileNumber"],
-                    "emailaddress": row["emailAddress"],
-                    "altemailaddress": row["altEmailAddress"],
-                    "postaladdress": row["postalAddress"],
-                    "physicaladdress": row["physicalAddress"],
-                    "region": row["region"],
-                    "district": row["district"],
-                    "ward": row["ward"],
-                    "street": row["street"],
-                    "housenumber": row["houseNumber"],
-                    "postalcode": row["postalCode"],
-                    "country": row["country"],
-                    "gpscoordinates": row["gpsCoordinates"],
-                    "nextofkinname": row["nextOfKinName"],
-                    "nextofkinrelationship": row["nextOfKinRelationship"],
-                    "nextofkinmobilenumber": row["nextOfKinMobileNumber"],
-                    "nextofkinemailaddress": row["nextOfKinEmailAddress"],
-                    "nextofkinaddress": row["nextOfKinAddress"],
-                    "nextofkinregion": row["nextOfKinRegion"],
-                    "nextofkindistrict": row["nextOfKinDistrict"],
-                    "nextofkinward": row["nextOfKinWard"],
-                    "nextofkinstreet": row["nextOfKinStreet"],
-                    "nextofkinhousenumber": row["nextOfKinHouseNumber"],
-                    "nextofkinpostalcode": row["nextOfKinPostalCode"],
-                    "nextofkincountry": row["nextOfKinCountry"],
-                    "nextofkingpscoordinates": row["nextOfKinGpsCoordinates"],
-                    "kycstatus": row["kycStatus"],
-                    "kycdate": convert_ddmmyyyyhhmm_to_timestamp(row["kycDate"]),
-                    "kycexpirydate": convert_ddmmyyyyhhmm_to_timestamp(row["kycExpiryDate"]),
-                    "riskrating": row["riskRating"],
-                    "riskratingdate": convert_ddmmyyyyhhmm_to_timestamp(row["riskRatingDate"]),
-                    "pepstatus": row["pepStatus"],
-                    "pepclassification": row["pepClassification"],
-                    "pepposition": row["pepPosition"],
-                    "pepcountry": row["pepCountry"],
-                    "peprelationship": row["pepRelationship"],
-                    "sanctionsstatus": (
-                        row["sanctionsStatus"] == "Y" if row["sanctionsStatus"] else False
-                    ),
-                    "sanctionslist": row["sanctionsList"],
-                    "sanctionsdate": convert_ddmmyyyyhhmm_to_timestamp(row["sanctionsDate"]),
-                    "sanctionscountry": row["sanctionsCountry"],
-                    "village": row["village"],
-                }
-                if validate_personal_individual(enriched):
-                    rows.append(enriched)
-                else:
-                    print(f"Skipped invalid Personal Data Individuals row: {json.dumps(row)}")
-            except Exception as e:
-                logger.error(f"Error processing PERSONAL_DATA_INDIVIDUALS row: {e}")
-                break
-        return rows
-    return []
+        with db2_pool.connection() as conn:
+            journal = cdc.DB2ChangeJournal(conn, db2_pool.statements(conn))
+            columns = source_projections.get(table) or db2_fetch.select_list(SOURCE_COLUMNS[table])
+            read_image = None
+            for positions, chunk, next_cursor in cdc.iter_changes(
+                journal, table, columns, cursor, chunk_max_rows, chunk_max_bytes, db2_governor
+            ):
+                op = positions[cdc.OP_COLUMN]
+                deletes = [raw for raw in chunk if raw[op] == "D"]
+                if deletes:
+                    if read_image is None:
+                        read_image = db2_fetch.row_reader(positions, SOURCE_COLUMNS[table])
+                    record_cdc_deletes(table, positions, deletes, read_image)
+                yield positions, [raw for raw in chunk if raw[op] != "D"], next_cursor
+    except RuntimeError as e:
+        logger.error(f"Failed to read change journal for {table}: {e}")
+        raise
 
 
-# Polling and transformation for Asset Owned or Acquired
-def poll_and_transform_asset_owned_or_acquired(last_timestamp):
-    if db2_conn is None:
-        logger.error("DB2 connection is None")
-        return []
-        
-    # Query records from DB2 that were created after the last poll timestamp
-    query = "SELECT * FROM CBS_SCHEMA.ASSET_OWNED_OR_ACQUIRED WHERE CREATEDDATE > ?"
-    logger.info(f"Executing query: {query} with timestamp: {last_timestamp}")
-    stmt = ibm_db.prepare(db2_conn, query)
-    
-    if stmt is False:
-        logger.error("Failed to prepare statement for ASSET_OWNED_OR_ACQUIRED")
-        return []
-    
-    # Properly handle the statement object
-    if stmt and stmt is not True and stmt is not False:
-        ibm_db.bind_param(stmt, 1, last_timestamp)
-        result = ibm_db.execute(stmt)
-        logger.info(f"Query execution result: {result}")
-        
-        if result is False:
-            logger.error("Failed to execute query for ASSET_OWNED_OR_ACQUIRED")
-            return []
-        
-        rows = []
-        while True:
-            try:
-                # Try to fetch row - ibm_db.fetch_row returns True on success, False on end of data
-                fetch_result = ibm_db.fetch_row(stmt)
-                logger.info(f"Fetch row result: {fetch_result}")
-                if fetch_result is False:
-                    break  # No more rows
-                
-                # Helper function to safely convert to float
-                def safe_float(value):
-                    if value is None:
-                        return 0.0
-                    try:
-                        return float(value)
-                    except (ValueError, TypeError):
-                        return 0.0
+# Record deleted source rows; committed by the following checkpoint update
+def record_cdc_deletes(table, positions, rows, read_image):
+    seq = positions[cdc.SEQ_COLUMN]
+    changed_at = positions[cdc.AT_COLUMN]
+    pg_cursor.executemany(
+        "INSERT INTO poller_cdc_deletes (table_name, change_seq, changed_at, row_image) "
+        "VALUES (%s, %s, %s, %s)",
+        [(table, raw[seq], raw[changed_at], json.dumps(read_image(raw), default=str)) for raw in rows]
+    )
+    logger.info(f"Recorded {len(rows)} deleted {table} rows")
 
-                # Safely get results with error handling
-                def safe_result(col_name):
-                    try:
-                        return ibm_db.result(stmt, col_name)
-                    except Exception:
-                        return None
-
-                row = {
-                    "assetCategory": safe_result("ASSETCATEGORY"),
-                    "assetType": safe_result("ASSETTYPE"),
-                    "acquisitionDate": safe_result("ACQUISITIONDATE"),
-                    "currency": safe_result("CURRENCY"),
-                    "orgCostValue": safe_float(safe_result("ORGCOSTVALUE")),
-                    "usdCostValue": safe_float(safe_result("USDCOSTVALUE")),
-                    "tzsCostValue": safe_float(safe_result("TZSCOSTVALUE")),
-                    "allowanceProbableLoss": safe_float(
-                        safe_result("ALLOWANCEPROBABLELOSS")
-                    ),
-                    "botProvision": safe_float(safe_result("BOTPROVISION")),
-                }
-                logger.info(f"Processing row: {row}")
-                # Complete enriched data with all fields
-                enriched = {
-                    "reportingdate": datetime.now(),
-                    "assetcategory": row["assetCategory"],
-                    "assettype": row["assetType"],
-                    "acquisitiondate": convert_ddmmyyyyhhmm_to_timestamp(row["acquisitionDate"]),
-                    "currency": row["currency"],
-                    "orgcostvalue": row["orgCostValue"],
-                    "usdcostvalue": row["usdCostValue"],
-                    "tzscostvalue": row["tzsCostValue"],
-                    "allowanceprobableloss": row["allowanceProbableLoss"],
-                    "botprovision": row["botProvision"],
-                }
-                if validate_asset_owned_or_acquired(enriched):
-                    rows.append(enriched)
-                    logger.info(f"Added valid row to results: {enriched}")
-                else:
-                    logger.info(f"Skipped invalid row: {json.dumps(row)}")
-            except Exception as e:
-                logger.error(f"Error processing ASSET_OWNED_OR_ACQUIRED row: {e}")
-                break
-        logger.info(f"Total rows found: {len(rows)}")
-        return rows
-    return []
 
+# Batch validator per table, built from the validators declared on its mapping
+validators = {
+    table: BatchValidator.from_mapping(mapping, POLLED_KEYS[table], name=mappings.lower_key)
+    for table, mapping in mappings.TABLES.items()
+}
 
-# Function to insert into PostgreSQL with batch processing
-def insert_to_pg(table, data):
-    if not data or pg_conn is None or pg_cursor is None:
+# Lookup columns per table ({column: reference domain}), normalised after the transform
+LOOKUPS = {
+    table: mapping.lookups(POLLED_KEYS[table], name=mappings.lower_key)
+    for table, mapping in mappings.TABLES.items()
+}
+
+
+# Amount columns whose USD/TZS equivalents are derived from cached FX rates when empty
+CONVERTED = {
+    table: mapping.converted_columns(name=mappings.lower_key)
+    for table, mapping in mappings.TABLES.items()
+}
+
+
+# Bulk reads for the reference cache. They run between pages, after the
+# previous page committed, so a failure can be rolled back without losing work.
+def load_reference_rows():
+    try:
+        with pg_conn.cursor() as cur:
+            cur.execute(reference.LOAD_QUERY)
+            return cur.fetchall()
+    except Exception:
+        pg_conn.rollback()
+        raise
+
+
+def reference_version():
+    try:
+        with pg_conn.cursor() as cur:
+            cur.execute(reference.VERSION_QUERY)
+            return tuple(cur.fetchone())
+    except Exception:
+        pg_conn.rollback()
+        raise
+
+
+# Normalise a batch's lookup columns and fill empty USD/TZS amounts from FX rates;
+# the cache reloads only when its data changed
+def enrich(table, batch):
+    if reference_cache is None or not (LOOKUPS[table] or CONVERTED[table]):
+        return batch
+    reference_cache.refresh()
+    reference_cache.enrich(batch, LOOKUPS[table])
+    if CONVERTED[table] is not None:
+        money.derive_converted(batch, CONVERTED[table], reference_cache.fx_rates())
+    return batch
+
+
+# Worker processes for the transform stage; 0 transforms in the polling process.
+# Pages are split into TRANSFORM_CHUNK_ROWS-row chunks across the workers.
+transform_workers = int(os.getenv("TRANSFORM_WORKERS", "0"))
+transform_chunk_rows = int(os.getenv("TRANSFORM_CHUNK_ROWS", "1000"))
+transform_pool = None
+
+
+# Polling and transformation for a mapped table, one compiled transform per statement.
+# Yields (rows, cursor) per page; cursor points after the page's last source row.
+# Read and transform errors are raised after the last good page.
+def poll_and_transform(table, cursor, bounds=None):
+    if db2_pool is None:
+        raise RuntimeError("DB2 connection pool is None")
+
+    if transform_workers > 0:
+        yield from poll_and_transform_parallel(table, cursor, bounds)
         return
-        
-    columns = ", ".join(data[0].keys())
-    placeholders = ", ".join(["%s" for _ in data[0]])
-    insert_query = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
-    
-    # Process in batches of 100 for better performance
-    batch_size = 100
-    total_inserted = 0
-    
+
+    mapping = mappings.TABLES[table]
+    keys = POLLED_KEYS[table]
+    transform = None
+    for positions, chunk, next_cursor in stream_db2_table(table, cursor, bounds):
+        if transform is None:
+            transform = mapping.compile_batch(
+                positions, keys, name=mappings.lower_key, extra=("reportingdate",)
+            )
+        batch_id = page_id(table, next_cursor)
+        try:
+            batch = transform_page(table, transform, positions, chunk, batch_id)
+            rows, result = enrich_and_validate(table, batch, batch_id)
+        except Exception as e:
+            # Stop the stream so the checkpoint never moves past an unprocessed row
+            logger.error(f"Error processing {table} row: {e}")
+            raise
+        log_rejects(table, result.failures, result.rejected)
+        logger.info(f"Chunk rows found: {len(rows)}")
+        yield rows, next_cursor
+
+
+# Dead-letter id of a page: its table and the cursor after its last row, shared by
+# the page's validation and load failures
+def page_id(table, cursor):
+    return f"{table}@{cursor.encode()}"
+
+
+# Transform a page; if the page fails, transform row by row and dead-letter the
+# rows that still fail with their raw source values
+def transform_page(table, transform, positions, chunk, batch_id):
+    now = datetime.now()
     try:
-        # Don't change autocommit mode, just use explicit transactions
-        for i in range(0, len(data), batch_size):
-            batch = data[i:i+batch_size]
-            batch_values = [tuple(row.values()) for row in batch]
-            
-            try:
-                pg_cursor.executemany(insert_query, batch_values)
-                total_inserted += len(batch)
-                logger.info(f"Batch inserted {len(batch)} rows into {table}")
-            except Exception as e:
-                logger.error(f"Batch insert error for {table}: {e}")
-                
-                # Fall back to individual inserts if batch fails
-                for row in batch:
-                    try:
-                        pg_cursor.execute(insert_query, tuple(row.values()))
-                        total_inserted += 1
-                    except Exception as row_error:
-                        logger.error(f"Row insert error for {table}: {row_error}")
-        
-        # Commit the transaction
-        pg_conn.commit()
-        logger.info(f"Successfully inserted {total_inserted} rows into {table}")
-        
+        return transform(chunk, now)
+    except Exception as e:
+        logger.warning(f"Transform of {len(chunk)} {table} rows failed, retrying row by row: {e}")
+    parts, failed, errors = [], [], []
+    for row in chunk:
+        try:
+            parts.append(transform([row], now))
+        except Exception as e:
+            failed.append(row)
+            errors.append(e)
+    source_keys = sorted(positions, key=positions.get)
+    dead_letter.write(
+        pg_cursor, table, "transform", batch_id, source_keys, failed, list(map(dead_letter.describe, errors))
+    )
+    logger.error(f"Dead-lettered {len(failed)} {table} rows that failed to transform")
+    return concat(parts) or transform([], now)
+
+
+# Enrich a transformed page, then validate it and dead-letter the rejects.
+# Both transform paths go through here, so a row is judged the same either way.
+def enrich_and_validate(table, batch, batch_id):
+    batch = enrich(table, batch)
+    result = validators[table].validate(batch)
+    if result.failures:
+        dead_letter_rejects(table, batch.where([not ok for ok in result.mask]), batch_id)
+    return batch.where(result.mask), result
+
+
+# Dead-letter the rows a validator rejected, naming the rules each row failed.
+# Rejects are rare, so re-checking them per row costs little.
+def dead_letter_rejects(table, rejected, batch_id):
+    rules = validators[table].rules
+    errors = [
+        ("ValidationFailed", ", ".join(rule.name for rule in rules if not rule.check(record.get(rule.column))))
+        for record in rejected.records()
+    ]
+    dead_letter.write(pg_cursor, table, "validate", batch_id, rejected.keys, list(rejected.rows()), errors)
+
+
+# Same as poll_and_transform, with pages transformed in the TRANSFORM_WORKERS process pool
+def poll_and_transform_parallel(table, cursor, bounds=None):
+    global transform_pool
+    if transform_pool is None:
+        transform_pool = TransformPool(transform_workers, transform_chunk_rows)
+
+    source_keys = []
+
+    # Column names of the raw rows, taken from the page as it passes to the pool
+    def source_pages():
+        for positions, chunk, next_cursor in stream_db2_table(table, cursor, bounds):
+            source_keys[:] = sorted(positions, key=positions.get)
+            yield positions, chunk, next_cursor
+
+    # A change journal purges a page when the next one is read, so never read
+    # ahead of the checkpoint there
+    pages = transform_pool.transform_pages(
+        table, POLLED_KEYS[table], mappings.lower_key, source_pages(),
+        extra=("reportingdate",), values=lambda: (datetime.now(),),
+        max_pages=1 if poll_mode == "cdc" and bounds is None else None,
+    )
+    while True:
+        try:
+            batch, untransformed, next_cursor = next(pages)
+            batch_id = page_id(table, next_cursor)
+            if untransformed:
+                # Same as transform_page: the failing rows are kept with their raw source values
+                dead_letter.write(
+                    pg_cursor, table, "transform", batch_id, source_keys,
+                    [row for row, _ in untransformed], [error for _, error in untransformed],
+                )
+                logger.error(f"Dead-lettered {len(untransformed)} {table} rows that failed to transform")
+            rows, result = enrich_and_validate(table, batch, batch_id)
+        except StopIteration:
+            return
+        except Exception as e:
+            # Stop the stream so the checkpoint never moves past an unprocessed row
+            logger.error(f"Error processing {table} row: {e}")
+            raise
+        log_rejects(table, result.failures, result.rejected)
+        logger.info(f"Chunk rows found: {len(rows)}")
+        yield rows, next_cursor
+
+
+# One summary line per page with rejected rows; no per-row logging
+def log_rejects(table, failures, rejected):
+    if failures:
+        failed = ", ".join(f"{rule}={count}" for rule, count in failures.items())
+        logger.warning(f"Skipped {rejected} invalid {table} rows ({failed})")
+
+
+def poll_and_transform_personal_individuals(cursor, bounds=None):
+    return poll_and_transform("PERSONAL_DATA_INDIVIDUALS", cursor, bounds)
+
+
+def poll_and_transform_asset_owned_or_acquired(cursor, bounds=None):
+    return poll_and_transform("ASSET_OWNED_OR_ACQUIRED", cursor, bounds)
+
+
+# "copy" streams each page with one COPY statement; "insert" uses batched INSERTs
+pg_load_method = os.getenv("PG_LOAD_METHOD", "copy").lower()
+
+
+# Source table of each bot_* target, to file dead letters under the source table
+SOURCE_TABLES = {mapping.target_table: table for table, mapping in mappings.TABLES.items()}
+
+# Errors meaning the connection is gone, not that a row is bad
+PG_FATAL_ERRORS = (psycopg2.OperationalError, psycopg2.InterfaceError)
+
+
+# Run a block under a savepoint, rolling back to it if the block raises
+@contextmanager
+def pg_savepoint():
+    pg_cursor.execute("SAVEPOINT load_rows")
+    try:
+        yield
+    except Exception:
+        pg_cursor.execute("ROLLBACK TO SAVEPOINT load_rows")
+        raise
+    pg_cursor.execute("RELEASE SAVEPOINT load_rows")
+
+
+# Function to insert into PostgreSQL with batch processing.
+# data is a RecordBatch or a list of row dicts sharing the same keys.
+# With commit=False the caller commits, so a page and its checkpoint land together.
+# A failing page is bisected under savepoints: good rows still load in bulk and
+# only the offending rows are dead-lettered, under batch_id when given.
+def insert_to_pg(table, data, commit=True, batch_id=None):
+    if not data or pg_conn is None or pg_cursor is None:
+        return True
+
+    if isinstance(data, RecordBatch):
+        keys = data.keys
+        columns = data.columns
+    else:
+        keys = list(data[0].keys())
+        columns = [[row.get(key) for row in data] for key in keys]
+
+    if pg_load_method == "copy":
+        def load_columns(cols):
+            pg_copy.copy_columns(pg_cursor, table, keys, cols)
+
+        def load_rows(rows):
+            load_columns([list(col) for col in zip(*rows)])
+    else:
+        insert_query = f"INSERT INTO {table} ({', '.join(keys)}) VALUES ({', '.join(['%s'] * len(keys))})"
+
+        def load_rows(rows):
+            pg_cursor.executemany(insert_query, rows)
+
+        def load_columns(cols):
+            load_rows(list(zip(*cols)))
+
+    total = len(columns[0]) if columns else 0
+    try:
+        try:
+            # Under a savepoint so work already pending for the page (e.g. its
+            # dead-lettered rejects) survives a failed load
+            with pg_savepoint():
+                load_columns(columns)
+            loaded = total
+        except PG_FATAL_ERRORS:
+            raise
+        except Exception as e:
+            logger.warning(f"Loading {total} rows into {table} failed, isolating bad rows: {e}")
+            result = isolation.isolate(
+                list(zip(*columns)), load_rows, pg_savepoint, fatal=PG_FATAL_ERRORS, known_bad=True
+            )
+            logger.error(result.summary(table))
+            loaded = result.loaded
+            dead_letter.write(
+                pg_cursor, SOURCE_TABLES.get(table, table), "load", batch_id or dead_letter.new_batch_id(),
+                keys, [row for row, _ in result.failed],
+                [dead_letter.describe(error) for _, error in result.failed],
+            )
+
+        if commit:
+            pg_conn.commit()
+        logger.info(f"Successfully inserted {loaded} rows into {table}")
+        return True
+
     except Exception as e:
         logger.error(f"Transaction error for {table}: {e}")
         pg_conn.rollback()
-    finally:
-        pass  # Don't change autocommit mode
+        return False
 
 
-# Function to update poller tracking
-def update_poller_tracking():
+# Function to update poller tracking; commits the pending page together with its cursor
+def update_poller_tracking(table_name, cursor):
     try:
         pg_cursor.execute(
-            "INSERT INTO poller_tracking DEFAULT VALUES"
+            "INSERT INTO poller_tracking (table_name, last_poll_timestamp, last_key) VALUES (%s, %s, %s)",
+            (table_name, datetime.strptime(cursor.created, keyset.DB2_TIMESTAMP_FORMAT), cursor.key)
         )
         if pg_conn is not None:
             pg_conn.commit()
-        logger.info("Updated poller tracking with current timestamp")
+        logger.info(f"Updated poller tracking for {table_name} to {cursor.encode()}")
+        return True
     except Exception as e:
         logger.error(f"Error updating poller tracking: {e}")
+        pg_conn.rollback()
+        return False
 
 
-# Function to get the last poll timestamp
-def get_last_poll_timestamp():
+# Function to get the keyset cursor to resume a source table from
+def get_last_poll_cursor(table_name, legacy=True):
     try:
-        # Get the last poll timestamp
+        # Latest checkpoint for the table, else the latest pre-chunking (untagged) poll;
+        # change journal checkpoints never fall back to untagged rows
         pg_cursor.execute(
-            "SELECT COALESCE(MAX(last_poll_timestamp), '1900-01-01 00:00:00.000000') FROM poller_tracking"
+            """
+            SELECT last_poll_timestamp, last_key FROM poller_tracking
+            WHERE table_name = %s OR (table_name IS NULL AND %s)
+            ORDER BY table_name IS NULL, id DESC
+            LIMIT 1
+            """,
+            (table_name, legacy)
         )
         result = pg_cursor.fetchone()
         
         if result and result[0]:
             # Format the timestamp for DB2 (DB2 uses a specific format for timestamp literals)
             # DB2 format: 'YYYY-MM-DD-HH.MM.SS.FFFFFF'
-            db2_timestamp = result[0].strftime('%Y-%m-%d-%H.%M.%S.%f')
-            return db2_timestamp
+            db2_timestamp = result[0].strftime(keyset.DB2_TIMESTAMP_FORMAT)
+            # Untagged polls carry no key: resume strictly after that instant
+            key = result[1] if result[1] is not None else keyset.MAX_KEY
+            return keyset.KeysetCursor(db2_timestamp, key)
         else:
-            # Return a default timestamp if no previous polls
-            return "1900-01-01-00.00.00.000000"
+            # Start from the beginning if no previous polls
+            return keyset.KeysetCursor()
+    except Exception as e:
+        logger.error(f"Error getting last poll cursor: {e}")
+        # Start from the beginning if error
+        return keyset.KeysetCursor()
+
+
+# Drain a table page by page: load, checkpoint and commit each before fetching the next.
+# Returns (rows loaded, lag of the newest loaded row in seconds, completed without error,
+# last page came back full).
+def stream_table_to_pg(source_table, target_table, poll_fn, metrics_key):
+    # CDC mode checkpoints the journal sequence separately from the keyset cursor
+    tracking_name = cdc.journal_table(source_table) if poll_mode == "cdc" else source_table
+    cursor = get_last_poll_cursor(tracking_name, legacy=poll_mode != "cdc")
+    logger.info(f"Last poll cursor for {tracking_name}: {cursor.encode()}")
+
+    total = 0
+    lag = 0.0
+    ok = True
+    full = False
+    try:
+        for rows, next_cursor in poll_fn(cursor):
+            full = len(rows) >= db2_governor.page_size()
+            if not insert_to_pg(target_table, rows, commit=False, batch_id=page_id(source_table, next_cursor)):
+                logger.error(f"Stopping {source_table} stream; cursor stays at last committed page")
+                ok = False
+                break
+            if not update_poller_tracking(tracking_name, next_cursor):
+                ok = False
+                break
+            total += len(rows)
+            poll_metrics["records_processed"][metrics_key] += len(rows)
+            # Age of the newest committed source row
+            lag = (datetime.now() - datetime.strptime(next_cursor.created, keyset.DB2_TIMESTAMP_FORMAT)).total_seconds()
+    except PG_FATAL_ERRORS:
+        raise
+    except Exception as e:
+        # DB2 read or transform failure: drop the unfinished page so the
+        # cursor stays at the last committed one, and report the drain as failed
+        logger.error(f"Stopping {source_table} stream; cursor stays at last committed page: {e}")
+        pg_conn.rollback()
+        ok = False
+
+    if total:
+        logger.info(f"Found {total} new {metrics_key} records")
+    return total, max(lag, 0.0), ok, full
+
+
+# Rows waiting for replay per "table/stage"; read between pages, so nothing is pending
+def dead_letter_depth():
+    try:
+        depth = dead_letter.depth(pg_cursor)
+        pg_conn.commit()
+        return {f"{table}/{stage}": count for (table, stage), count in depth.items()}
+    except Exception as e:
+        logger.error(f"Error reading dead-letter depth: {e}")
+        pg_conn.rollback()
+        return {}
+
+
+# Publish the scheduler's per-table interval, change rate and lag
+def record_schedule(schedule):
+    poll_metrics["schedule"] = schedule
+    if metrics_collector is not None:
+        metrics_collector.record_poll_schedule(schedule)
+    try:
+        for table_name, state in schedule.items():
+            pg_cursor.execute(
+                """
+                INSERT INTO poller_schedule
+                    (table_name, interval_seconds, change_rate, lag_seconds, errors, updated_at)
+                VALUES (%s, %s, %s, %s, %s, CURRENT_TIMESTAMP)
+                ON CONFLICT (table_name) DO UPDATE SET
+                    interval_seconds = EXCLUDED.interval_seconds,
+                    change_rate = EXCLUDED.change_rate,
+                    lag_seconds = EXCLUDED.lag_seconds,
+                    errors = EXCLUDED.errors,
+                    updated_at = EXCLUDED.updated_at
+                """,
+                (table_name, state["interval_seconds"], state["change_rate"],
+                 state["lag_seconds"], state["errors"])
+            )
+        pg_conn.commit()
     except Exception as e:
-        logger.error(f"Error getting last poll timestamp: {e}")
-        # Return a default timestamp if error
-        return "1900-01-01-00.00.00.000000"
+        logger.error(f"Error recording poll schedule: {e}")
+        pg_conn.rollback()
+
+
+# Source table -> (target table, poll function, metrics key)
+POLL_TABLES = {
+    "PERSONAL_DATA_INDIVIDUALS": (
+        "bot_personal_data_individuals",
+        poll_and_transform_personal_individuals,
+        "personal_data_individuals",
+    ),
+    "ASSET_OWNED_OR_ACQUIRED": (
+        "bot_asset_owned_or_acquired",
+        poll_and_transform_asset_owned_or_acquired,
+        "asset_owned_or_acquired",
+    ),
+}
 
 
 # Main polling loop - optimized for the two required tables
-poll_interval = 30  # Poll every 30 seconds
-max_batch_size = 1000  # Limit batch size for better performance
+poll_interval = 30  # Initial interval; the scheduler adapts it per table
+max_batch_size = 1000  # Rows per poll the scheduler aims for; a full batch re-polls at once
 
-logger.info(
-    "Starting optimized poller for PERSONAL_DATA_INDIVIDUALS and ASSET_OWNED_OR_ACQUIRED..."
-)
+# "procedure" fetches the first page of every due table with one stored
+# procedure call (one round trip per cycle, POLL_WORKERS=single); "statement"
+# runs one page query per table
+poll_fetch = os.getenv("POLL_FETCH", "statement").lower()
+
+# "table" runs each source table in its own worker process; "single" polls
+# all tables from one loop
+poll_workers = os.getenv("POLL_WORKERS", "table").lower()
+
+# Bounds on the adaptive per-table interval
+min_poll_interval = float(os.getenv("POLL_MIN_INTERVAL", "1"))
+max_poll_interval = float(os.getenv("POLL_MAX_INTERVAL", "300"))
+
+# "keyset" scans CREATEDDATE; "cdc" reads the trigger-fed change journals
+# (create_cdc_journal.sql), which also capture updates and deletes
+poll_mode = os.getenv("POLL_MODE", "keyset").lower()
+
+# Memory budget per keyset page: whichever of the row or byte limit is hit first
+chunk_max_rows = int(os.getenv("POLL_CHUNK_ROWS", "5000"))
+chunk_max_bytes = int(os.getenv("POLL_CHUNK_BYTES", str(32 * 1024 * 1024)))
+
+# DB2 connection pool: warm spares, upper bound, and idle time before eviction
+db2_pool_min_size = int(os.getenv("DB2_POOL_MIN_SIZE", "1"))
+db2_pool_max_size = int(os.getenv("DB2_POOL_MAX_SIZE", "4"))
+db2_pool_max_idle = float(os.getenv("DB2_POOL_MAX_IDLE", "300"))
 
 # Track metrics for monitoring
 poll_metrics = {
@@ -615,112 +917,199 @@ poll_metrics = {
     "records_processed": {
         "personal_data_individuals": 0,
         "asset_owned_or_acquired": 0
-    }
+    },
+    "db2_pool": {},
+    "db2_governor": {},
+    "validation": {},
+    "reference": {},
+    "dead_letters": {},
+    "schedule": {}
 }
 
-while True:
-    try:
-        logger.info("Polling cycle started")
-        
-        # Get the last poll timestamp
-        last_timestamp = get_last_poll_timestamp()
-        logger.info(f"Last poll timestamp: {last_timestamp}")
+
+# Poll source tables (all of POLL_TABLES by default) until the process is stopped
+def run_poll_loop(tables=None):
+    global pg_conn, pg_cursor
+
+    tables = list(tables or POLL_TABLES)
+    logger.info(f"Starting optimized poller for {', '.join(tables)}...")
+
+    scheduler = PollScheduler.for_tables(
+        tables,
+        min_interval=min_poll_interval,
+        max_interval=max_poll_interval,
+        target_rows=max_batch_size,
+        interval=poll_interval,
+    )
+
+    while True:
+        try:
+            logger.info("Polling cycle started")
         
-        # Test DB2 connection before polling
-        if db2_conn is not None:
-            test_query = "SELECT 1 FROM SYSIBM.SYSDUMMY1"
-            test_stmt = ibm_db.prepare(db2_conn, test_query)
-            if test_stmt is False:
-                logger.error("Failed to prepare DB2 test statement")
-            elif test_stmt is not True and test_stmt is not False:
-                test_result = ibm_db.execute(test_stmt)
-                if test_result is False:
-                    logger.error("DB2 connection test failed, reconnecting...")
-                    ibm_db.close(db2_conn)
-                    db2_conn = connect_with_retry(connect_db2)
-        else:
-            logger.error("DB2 connection is None, reconnecting...")
-            db2_conn = connect_with_retry(connect_db2)
+            # DB2 connections are validated by the pool on checkout after sitting
+            # idle, so a cycle needs no separate test query round trip
         
-        # Test PostgreSQL connection before inserting
-        try:
-            if pg_cursor is not None:
-                pg_cursor.execute("SELECT 1")
-            else:
-                logger.error("PostgreSQL cursor is None, reconnecting...")
+            # Test PostgreSQL connection before inserting
+            try:
+                if pg_cursor is not None:
+                    pg_cursor.execute("SELECT 1")
+                else:
+                    logger.error("PostgreSQL cursor is None, reconnecting...")
+                    pg_conn = connect_with_retry(connect_postgres)
+                    if pg_conn is not None:
+                        pg_cursor = pg_conn.cursor()
+            except Exception:
+                logger.error("PostgreSQL connection lost, reconnecting...")
+                if pg_conn is not None:
+                    try:
+                        pg_cursor.close()
+                        pg_conn.close()
+                    except:
+                        pass
                 pg_conn = connect_with_retry(connect_postgres)
                 if pg_conn is not None:
                     pg_cursor = pg_conn.cursor()
-        except Exception:
-            logger.error("PostgreSQL connection lost, reconnecting...")
-            if pg_conn is not None:
+
+            # Stream the tables that are due; each page commits with its own checkpoint
+            found = 0
+            due = scheduler.due()
+            prefetch_first_pages(due)
+            for source_table in due:
+                target_table, poll_fn, metrics_key = POLL_TABLES[source_table]
+                schedule = scheduler.tables[source_table]
                 try:
-                    pg_cursor.close()
-                    pg_conn.close()
-                except:
-                    pass
-            pg_conn = connect_with_retry(connect_postgres)
-            if pg_conn is not None:
-                pg_cursor = pg_conn.cursor()
-
-        # Poll the two required tables with transaction support
-        personal_individuals_rows = poll_and_transform_personal_individuals(last_timestamp)
-        if personal_individuals_rows:
-            logger.info(f"Found {len(personal_individuals_rows)} new personal_data_individuals records")
-            insert_to_pg("bot_personal_data_individuals", personal_individuals_rows)
-            poll_metrics["records_processed"]["personal_data_individuals"] += len(personal_individuals_rows)
-
-        asset_owned_rows = poll_and_transform_asset_owned_or_acquired(last_timestamp)
-        if asset_owned_rows:
-            logger.info(f"Found {len(asset_owned_rows)} new asset_owned_or_acquired records")
-            insert_to_pg("bot_asset_owned_or_acquired", asset_owned_rows)
-            poll_metrics["records_processed"]["asset_owned_or_acquired"] += len(asset_owned_rows)
-
-        # Update poller tracking if we found new data
-        if personal_individuals_rows or asset_owned_rows:
-            update_poller_tracking()
-            logger.info("Data found and processed, updated poller tracking")
-        else:
-            logger.info("No new data found")
+                    total, lag, ok, full = stream_table_to_pg(source_table, target_table, poll_fn, metrics_key)
+                except Exception:
+                    schedule.record_error()
+                    raise
+                if ok:
+                    delay = schedule.record_success(total, lag, full=full)
+                else:
+                    delay = schedule.record_error()
+                logger.info(f"Next {source_table} poll in {delay:.1f}s")
+                found += total
+            record_schedule(scheduler.snapshot())
+
+            if not found:
+                logger.info("No new data found")
         
-        poll_metrics["successful_polls"] += 1
+            poll_metrics["successful_polls"] += 1
         
-        # Log metrics every 10 successful polls
-        if poll_metrics["successful_polls"] % 10 == 0:
-            logger.info(f"Polling metrics: {json.dumps(poll_metrics)}")
+            # Log metrics every 10 successful polls
+            if poll_metrics["successful_polls"] % 10 == 0:
+                poll_metrics["db2_pool"] = db2_pool.stats()
+                poll_metrics["db2_governor"] = db2_governor.stats()
+                poll_metrics["validation"] = {t: v.stats() for t, v in validators.items()}
+                poll_metrics["reference"] = reference_cache.stats()
+                poll_metrics["dead_letters"] = dead_letter_depth()
+                if metrics_collector is not None:
+                    metrics_collector.record_dead_letter_depth({
+                        key: count for key, count in poll_metrics["dead_letters"].items()
+                        if key.partition("/")[0] in tables
+                    })
+                logger.info(f"Polling metrics: {json.dumps(poll_metrics)}")
             
-        time.sleep(poll_interval)
-    except Exception as e:
-        poll_metrics["failed_polls"] += 1
-        logger.error(f"Polling error: {e}", exc_info=True)
+            time.sleep(scheduler.time_until_next())
+        except Exception as e:
+            poll_metrics["failed_polls"] += 1
+            logger.error(f"Polling error: {e}", exc_info=True)
         
-        # Attempt to reconnect to both databases if there's an error
-        try:
-            if db2_conn is not None:
-                ibm_db.close(db2_conn)
-            db2_conn = connect_with_retry(connect_db2)
+            # Attempt to reconnect to both databases if there's an error
+            try:
+                db2_pool.reset()
+                connect_with_retry(check_db2_pool)
             
-            if pg_cursor is not None:
-                pg_cursor.close()
-            if pg_conn is not None:
-                pg_conn.close()
-            pg_conn = connect_with_retry(connect_postgres)
-            if pg_conn is not None:
-                pg_cursor = pg_conn.cursor()
+                if pg_cursor is not None:
+                    pg_cursor.close()
+                if pg_conn is not None:
+                    pg_conn.close()
+                pg_conn = connect_with_retry(connect_postgres)
+                if pg_conn is not None:
+                    pg_cursor = pg_conn.cursor()
             
-            logger.info("Successfully reconnected to databases after error")
-        except Exception as reconnect_error:
-            logger.error(f"Failed to reconnect: {reconnect_error}", exc_info=True)
+                logger.info("Successfully reconnected to databases after error")
+            except Exception as reconnect_error:
+                logger.error(f"Failed to reconnect: {reconnect_error}", exc_info=True)
             
-        time.sleep(poll_interval * 2)  # Wait longer after an error
-
-# Close connections (handled on shutdown)
-try:
-    if db2_conn is not None:
-        ibm_db.close(db2_conn)
-    if pg_cursor is not None:
-        pg_cursor.close()
-    if pg_conn is not None:
-        pg_conn.close()
-except Exception as e:
-    logger.error(f"Error closing connections: {e}")
\ No newline at end of file
+            # The failed table is already backed off; others keep their schedule
+            time.sleep(max(scheduler.time_until_next(), min_poll_interval))
+
+    # Close connections (handled on shutdown)
+    close_connections()
+
+
+def close_connections():
+    global transform_pool
+    try:
+        if transform_pool is not None:
+            transform_pool.close()
+            transform_pool = None
+        if db2_pool is not None:
+            db2_pool.close()
+        if pg_cursor is not None:
+            pg_cursor.close()
+        if pg_conn is not None:
+            pg_conn.close()
+    except Exception as e:
+        logger.error(f"Error closing connections: {e}")
+
+
+# One table per worker process: its own DB2 pool, PostgreSQL connection,
+# checkpoint and schedule, so a slow or failing table never stalls the others
+def run_table_worker(source_table, throttle=None):
+    global governor_throttle, governor_slot
+    slot = list(POLL_TABLES).index(source_table)
+    governor_throttle, governor_slot = throttle, slot
+    start_metrics(slot)
+    open_connections()
+    run_poll_loop([source_table])
+
+
+# Start a worker per table and restart any that exits
+def supervise_table_workers():
+    context = multiprocessing.get_context("spawn")
+    # One DB2 throttle for all workers, so they back off together and share
+    # DB2_GOVERNOR_MAX_CONCURRENCY instead of each using all of it
+    throttle = SharedThrottle.create(context, len(POLL_TABLES))
+    workers = {}
+    try:
+        while True:
+            for source_table in POLL_TABLES:
+                worker = workers.get(source_table)
+                if worker is not None and worker.is_alive():
+                    continue
+                if worker is not None:
+                    logger.error(f"{source_table} worker exited with code {worker.exitcode}, restarting")
+                    # Frees any page query slot the dead worker still held
+                    throttle.release(list(POLL_TABLES).index(source_table))
+                worker = context.Process(
+                    target=run_table_worker, args=(source_table, throttle), name=f"poller-{source_table}"
+                )
+                worker.start()
+                workers[source_table] = worker
+                logger.info(f"Started {source_table} worker (pid {worker.pid})")
+            time.sleep(poll_interval)
+    finally:
+        for worker in workers.values():
+            if worker.is_alive():
+                worker.terminate()
+        for worker in workers.values():
+            worker.join(timeout=10)
+
+
+def main():
+    table_workers = poll_workers == "table" and len(POLL_TABLES) > 1
+    if not table_workers:
+        start_metrics()
+    open_connections()
+    ensure_pg_tables()
+    if table_workers:
+        # Workers open their own connections; the setup ones are no longer needed
+        close_connections()
+        supervise_table_workers()
+    else:
+        run_poll_loop()
+
+
+if __name__ == "__main__":
+    main()
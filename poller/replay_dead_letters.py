@@ -0,0 +1,116 @@
+"""
+Bulk replay of dead-lettered rows.
+
+Selects rows from poller_dead_letters that have not been replayed, runs each
+one through the remaining pipeline stages again, and loads it the same way
+the poller does:
+- transform rows are re-transformed from their raw source values;
+- validate rows are re-validated;
+- load rows are loaded again.
+
+Rows are processed one page at a time. Each page is committed together with
+the replayed mark on its dead letters. Rows that fail again are dead-lettered
+under a new batch id, so the cause can be fixed and the replay re-run.
+
+    python poller/replay_dead_letters.py --table ASSET_OWNED_OR_ACQUIRED --stage load
+"""
+
+import argparse
+import logging
+import sys
+from datetime import datetime
+
+import bot_poller
+from pipeline import dead_letter, mappings
+
+logger = logging.getLogger('replay_dead_letters')
+
+
+def retransform(table, payloads, batch_id):
+    # Transform-stage payloads hold the raw source row, keyed by DB2 column
+    source_keys = list(dict.fromkeys(key for data in payloads for key in data))
+    positions = {key: i for i, key in enumerate(source_keys)}
+    transform = mappings.TABLES[table].compile_batch(
+        positions, bot_poller.POLLED_KEYS[table], name=mappings.lower_key, extra=("reportingdate",)
+    )
+    rows = [tuple(data.get(key) for key in source_keys) for data in payloads]
+    return bot_poller.enrich(table, bot_poller.transform_page(table, transform, positions, rows, batch_id))
+
+
+def revalidate(table, batch, batch_id):
+    result = bot_poller.validators[table].validate(batch)
+    if result.failures:
+        bot_poller.dead_letter_rejects(table, batch.where([not ok for ok in result.mask]), batch_id)
+        bot_poller.log_rejects(table, result.failures, result.rejected)
+    return batch.where(result.mask)
+
+
+def replay_page(table, stage, entries, replay_id):
+    ids = [row_id for row_id, _ in entries]
+    payloads = [data for _, data in entries]
+    target_table = bot_poller.POLL_TABLES[table][0]
+
+    if stage == "transform":
+        batch = revalidate(table, retransform(table, payloads, replay_id), replay_id)
+    else:
+        batch = dead_letter.to_batch(table, payloads)
+        if stage == "validate":
+            batch = revalidate(table, batch, replay_id)
+
+    if not bot_poller.insert_to_pg(target_table, batch, commit=False, batch_id=replay_id):
+        # Left pending, with nothing from the page dead-lettered again
+        bot_poller.pg_conn.rollback()
+        return None
+    dead_letter.mark_replayed(bot_poller.pg_cursor, ids, replay_id)
+    bot_poller.pg_conn.commit()
+    return len(batch)
+
+
+def replay(table, stages, batch_id=None, error_class=None, limit=None, page_size=5000):
+    replay_id = f"replay-{datetime.now():%Y%m%d%H%M%S}-{dead_letter.new_batch_id()[:8]}"
+    replayed = loaded = failed = 0
+    for stage in stages:
+        after_id = 0
+        while limit is None or replayed < limit:
+            size = page_size if limit is None else min(page_size, limit - replayed)
+            entries = dead_letter.select_pending(
+                bot_poller.pg_cursor, table, stage, batch_id, error_class, after_id, size
+            )
+            if not entries:
+                break
+            after_id = entries[-1][0]
+            page_loaded = replay_page(table, stage, entries, replay_id)
+            if page_loaded is None:
+                failed += len(entries)
+                logger.error(f"Replay of {len(entries)} {table} {stage} dead letters failed; left pending")
+                continue
+            replayed += len(entries)
+            loaded += page_loaded
+            logger.info(f"Replayed {len(entries)} {table} {stage} dead letters, loaded {page_loaded}")
+    logger.info(f"Replay {replay_id}: {replayed} dead letters, {loaded} rows loaded, {failed} left pending")
+    return replayed, loaded, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay dead-lettered rows")
+    parser.add_argument("--table", required=True, choices=sorted(bot_poller.POLL_TABLES))
+    parser.add_argument("--stage", choices=dead_letter.STAGES, action="append",
+                        help="stage(s) to replay; defaults to all")
+    parser.add_argument("--batch-id", default=None, help="only rows from this batch")
+    parser.add_argument("--error-class", default=None, help="only rows that failed with this error")
+    parser.add_argument("--limit", type=int, default=None, help="replay at most this many rows")
+    parser.add_argument("--page-size", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    bot_poller.open_connections()
+    bot_poller.ensure_pg_tables()
+    try:
+        _, _, failed = replay(args.table, args.stage or dead_letter.STAGES, args.batch_id,
+                              args.error_class, args.limit, args.page_size)
+    finally:
+        bot_poller.close_connections()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -95,6 +95,10 @@ CREATE TABLE CBS_SCHEMA.ASSET_OWNED_OR_ACQUIRED (
     CREATEDDATE TIMESTAMP NOT NULL WITH DEFAULT CURRENT TIMESTAMP
 );
 
+-- Keyset pagination scans these in (CREATEDDATE, row id) order
+CREATE INDEX CBS_SCHEMA.IDX_PDI_CREATEDDATE ON CBS_SCHEMA.PERSONAL_DATA_INDIVIDUALS (CREATEDDATE);
+CREATE INDEX CBS_SCHEMA.IDX_AOA_CREATEDDATE ON CBS_SCHEMA.ASSET_OWNED_OR_ACQUIRED (CREATEDDATE);
+
 -- Import the backed up data
 IMPORT FROM /tmp/personal_data.del OF DEL INSERT INTO CBS_SCHEMA.PERSONAL_DATA_INDIVIDUALS;
 IMPORT FROM /tmp/asset_data.del OF DEL INSERT INTO CBS_SCHEMA.ASSET_OWNED_OR_ACQUIRED;